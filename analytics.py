@@ -2,6 +2,8 @@
 Analytics API Blueprint
 """
 from flask import Blueprint, jsonify, request
+from backend.services.scheduler_service import ScenarioPending, SchedulerService, UnknownProductError
+from backend.api.scenarios import pending_response
 
 analytics_bp = Blueprint('analytics', __name__, url_prefix='/api')
 
@@ -10,4 +12,59 @@ def test():
     """Test endpoint for analytics"""
     return jsonify({'message': 'analytics API is working'})
 
-# TODO: Implement actual endpoints
+
+@analytics_bp.route('/simulate', methods=['POST'])
+@analytics_bp.route('/simulate_priority', methods=['POST'])
+def simulate_priority():
+    """
+    What-if of prioritizing a product. JSON body: scenario (default baseline),
+    product, level (high, critical, exclusive), days (rolling horizon, default 30).
+    Cached per scenario version, product, level and days.
+    """
+    body = request.get_json(silent=True) or {}
+    product = body.get('product')
+    if not product:
+        return jsonify({'success': False, 'error': 'product is required'}), 400
+
+    try:
+        days = int(body.get('days', 30))
+        service = SchedulerService.get_instance()
+        result = service.simulate_priority(body.get('scenario') or 'baseline', product,
+                                           body.get('level') or 'high', days)
+        if result is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+        return jsonify({'success': True, **result})
+    except UnknownProductError:
+        return jsonify({'success': False, 'error': f'Unknown product: {product}'}), 404
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except ScenarioPending as e:
+        return pending_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@analytics_bp.route('/late_parts_impact/<scenario_id>')
+def late_parts_impact(scenario_id):
+    """
+    Impact of each late part on product completion, from counterfactual reschedules
+    without its on-dock date. Cached per scenario version.
+    """
+    try:
+        service = SchedulerService.get_instance()
+        result = service.get_late_parts_impact(scenario_id)
+        if result is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+        return jsonify({'success': True, **result})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+    except ScenarioPending as e:
+        return pending_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -47,6 +47,46 @@ class APIClient {
         return this.request(`/api/scenario/${scenarioId}`);
     }
 
+    async getScenarioDelta(scenarioId, sinceVersion) {
+        return this.request(`/api/scenario/${scenarioId}/delta?since=${sinceVersion}`);
+    }
+
+    // Load a scenario, fetching only what changed when a previous copy is given
+    async loadScenario(scenarioId, previous = null) {
+        if (!previous || previous.version === undefined || !previous.data) {
+            return this.getScenarioData(scenarioId);
+        }
+
+        const delta = await this.getScenarioDelta(scenarioId, previous.version);
+        if (!delta.success) {
+            return delta;
+        }
+        if (delta.full) {
+            return { ...previous, version: delta.version, data: delta.changed, count: delta.changed.length, summary: delta.summary };
+        }
+        if (delta.count === 0) {
+            return { ...previous, version: delta.version, summary: delta.summary };
+        }
+
+        const removed = new Set(delta.removed);
+        const changed = new Map(delta.changed.map(task => [task.taskId, task]));
+        const data = previous.data
+            .filter(task => !removed.has(task.taskId))
+            .map(task => {
+                const update = changed.get(task.taskId);
+                changed.delete(task.taskId);
+                return update || task;
+            });
+        // Whatever is left was added in the new version
+        data.push(...changed.values());
+        return { ...previous, version: delta.version, data, count: data.length, summary: delta.summary };
+    }
+
+    async queryScenarioTasks(scenarioId, query = {}) {
+        const params = new URLSearchParams(query);
+        return this.request(`/api/scenario/${scenarioId}/tasks?${params}`);
+    }
+
     // Team APIs
     async getTeamTasks(teamName, filters = {}) {
         const params = new URLSearchParams(filters);
@@ -68,18 +108,89 @@ class APIClient {
         });
     }
 
+    // Many assignments in one request: [{taskId, mechanicId}] or [{taskId, mechanics: [...]}].
+    // Resolves to {applied, failed, results}; an atomic batch with an invalid item is not applied.
+    async assignTasks(scenario, assignments, atomic = true) {
+        const response = await fetch('/api/assignments', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ scenario, assignments, atomic })
+        });
+        const data = await response.json();
+        if (!response.ok && response.status !== 409) {
+            throw new Error(data.error || `HTTP ${response.status}`);
+        }
+        return data;
+    }
+
     // Analytics APIs
     async getLatePartsImpact(scenarioId) {
         return this.request(`/api/late_parts_impact/${scenarioId}`);
     }
 
     async simulatePriority(data) {
-        return this.request('/api/simulate_priority', {
+        return this.request('/api/simulate', {
             method: 'POST',
             body: JSON.stringify(data)
         });
     }
 
+    // Background job APIs
+    async submitScenarioJob(scenarioId, parameters = {}) {
+        return this.request('/api/jobs', {
+            method: 'POST',
+            body: JSON.stringify({ scenario: scenarioId, parameters })
+        });
+    }
+
+    async getJob(jobId) {
+        return this.request(`/api/jobs/${jobId}`);
+    }
+
+    async getJobResult(jobId) {
+        return this.request(`/api/jobs/${jobId}/result`);
+    }
+
+    async cancelJob(jobId) {
+        return this.request(`/api/jobs/${jobId}/cancel`, { method: 'POST' });
+    }
+
+    // Progress streams (Server-Sent Events); call close() on the returned EventSource when done
+    streamProgress(channel, onEvent) {
+        const params = channel ? `?channel=${encodeURIComponent(channel)}` : '';
+        return this._openStream(`${this.baseURL}/api/events${params}`, onEvent, false);
+    }
+
+    streamJob(jobId, onEvent) {
+        return this._openStream(`${this.baseURL}/api/jobs/${jobId}/events`, onEvent, true);
+    }
+
+    // Resolves with a job's final status once it has finished
+    waitForJob(jobId) {
+        return new Promise(resolve => {
+            this.streamJob(jobId, (type, data) => {
+                if (type === 'complete') {
+                    resolve(data);
+                }
+            });
+        });
+    }
+
+    _openStream(url, onEvent, closeOnComplete) {
+        const source = new EventSource(url);
+        ['progress', 'incumbent', 'complete'].forEach(type => {
+            source.addEventListener(type, event => {
+                const data = JSON.parse(event.data);
+                onEvent(type, data);
+                // Job streams end after completion; don't let the browser reconnect
+                if (type === 'complete' && closeOnComplete) {
+                    source.close();
+                }
+            });
+        });
+        return source;
+    }
+
     // Export API
     async exportScenario(scenarioId) {
         window.location.href = `/api/export/${scenarioId}`;
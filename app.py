@@ -5,11 +5,12 @@ from flask import Flask, render_template, jsonify
 from flask_cors import CORS
 import config
 from backend.api import scenarios, teams, tasks, analytics, assignments
-from backend.services.scheduler_service import SchedulerService
+from backend.services.scheduler_service import ScenarioPending, SchedulerService
 import logging
 from datetime import datetime
 import os
 import sys
+import threading
 
 # Force the correct path
 FORCE_DIR = r"C:\Users\jared\PycharmProjects\PythonProject2-Aurora2.0-Modular"
@@ -73,16 +74,36 @@ CORS(app)
 
 # Initialize scheduler service (one-time initialization)
 initialized = False
+_init_lock = threading.Lock()
 
 def initialize_app():
     """Initialize the scheduler service"""
     global initialized
-    if not initialized:
-        logger.info("Initializing scheduler service...")
-        SchedulerService.initialize()
-        SchedulerService.get_instance().clear_all_scenarios()  # Clear old cached results
-        logger.info("Scheduler service initialized successfully")
-        initialized = True
+    with _init_lock:
+        if not initialized:
+            logger.info("Initializing scheduler service...")
+            SchedulerService.initialize()
+            SchedulerService.get_instance().clear_all_scenarios()  # Clear old cached results
+            SchedulerService.get_instance().start_file_watcher()  # Hot reload scheduling_data.csv
+            if config.SCHEDULER_CONFIG.get('warmup_scenarios') and not _is_reloader_parent():
+                # Precompute the scenarios however the app is served (WSGI servers never run __main__)
+                SchedulerService.get_instance().start_warmup()
+            logger.info("Scheduler service initialized successfully")
+            initialized = True
+
+_init_thread = None
+
+def start_background_warmup():
+    """Initialize the app (loading the model and starting the warm-up) in a background thread"""
+    global _init_thread
+    if initialized or (_init_thread and _init_thread.is_alive()):
+        return
+    _init_thread = threading.Thread(target=initialize_app, name='app-warmup', daemon=True)
+    _init_thread.start()
+
+def _is_reloader_parent():
+    """True in the debug reloader's watcher process, which never serves requests"""
+    return __name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
 
 # Register blueprints
 app.register_blueprint(scenarios.scenarios_bp)
@@ -104,62 +125,83 @@ def health_check():
         'timestamp': datetime.now().isoformat()
     })
 
-# Direct routes for Gantt chart - ALWAYS FRESH
+@app.route('/ready')
+def readiness_check():
+    """Readiness endpoint: 200 once the model is loaded and the startup warm-up finished, 503 before"""
+    # The first probe starts the initialization when no request has yet
+    start_background_warmup()
+    status = SchedulerService.get_instance().warmup_status()
+    status['initialized'] = initialized
+    return jsonify(status), 200 if status['ready'] else 503
+
+# Direct routes for Gantt chart - served from the scenario cache (see SchedulerService)
 @app.route('/baseline')
 def get_baseline():
-    """Direct baseline route for Gantt chart - always generates fresh schedule"""
+    """Direct baseline route for Gantt chart"""
     if not initialized:
         initialize_app()
 
-    print("\n[APP] Baseline route called - generating fresh schedule")
+    print("\n[APP] Baseline route called")
     service = SchedulerService.get_instance()
-    data = service.get_scenario_data('baseline')
-
-    print(f"[APP] Generated {len(data)} tasks for baseline")
-    if data and len(data) > 0:
-        first_task = data[0]
-        print(f"[APP] First task starts at: {first_task.get('startTime', 'unknown')}")
+    published = service.get_published('baseline')
+    if published is None:
+        return jsonify({'data': [], 'tasks': [], 'summary': None})
 
-    return jsonify({'data': data, 'tasks': data})
+    print(f"[APP] Serving {len(published.tasks)} tasks for baseline (version {published.version})")
+    return scenarios.published_response(published, 'gantt')
 
 @app.route('/scenario1')
 def get_scenario1():
-    """Direct scenario1 route for Gantt chart - always generates fresh schedule"""
+    """Direct scenario1 route for Gantt chart"""
     if not initialized:
         initialize_app()
 
-    print("\n[APP] Scenario1 route called - generating fresh schedule")
+    print("\n[APP] Scenario1 route called")
     service = SchedulerService.get_instance()
-    data = service.get_scenario_data('scenario1')
+    published = service.get_published('scenario1')
+    if published is None:
+        return jsonify({'data': [], 'tasks': [], 'summary': None})
 
-    print(f"[APP] Generated {len(data)} tasks for scenario1")
-    return jsonify({'data': data, 'tasks': data})
+    print(f"[APP] Serving {len(published.tasks)} tasks for scenario1 (version {published.version})")
+    return scenarios.published_response(published, 'gantt')
 
 @app.route('/scenario2')
 def get_scenario2():
-    """Direct scenario2 route for Gantt chart - always generates fresh schedule"""
+    """Direct scenario2 route for Gantt chart"""
     if not initialized:
         initialize_app()
 
-    print("\n[APP] Scenario2 route called - generating fresh schedule")
+    print("\n[APP] Scenario2 route called")
     service = SchedulerService.get_instance()
-    data = service.get_scenario_data('scenario2')
+    try:
+        published = service.get_published('scenario2')
+    except ScenarioPending as e:
+        # The optimizer runs as a background job; the response names it
+        return scenarios.pending_response(e)
+    if published is None:
+        return jsonify({'data': [], 'tasks': [], 'summary': None})
 
-    print(f"[APP] Generated {len(data)} tasks for scenario2")
-    return jsonify({'data': data, 'tasks': data})
+    print(f"[APP] Serving {len(published.tasks)} tasks for scenario2 (version {published.version})")
+    return scenarios.published_response(published, 'gantt')
 
 @app.route('/scenario3')
 def get_scenario3():
-    """Direct scenario3 route for Gantt chart - always generates fresh schedule"""
+    """Direct scenario3 route for Gantt chart"""
     if not initialized:
         initialize_app()
 
-    print("\n[APP] Scenario3 route called - generating fresh schedule")
+    print("\n[APP] Scenario3 route called")
     service = SchedulerService.get_instance()
-    data = service.get_scenario_data('scenario3')
+    try:
+        published = service.get_published('scenario3')
+    except ScenarioPending as e:
+        # The optimizer runs as a background job; the response names it
+        return scenarios.pending_response(e)
+    if published is None:
+        return jsonify({'data': [], 'tasks': [], 'summary': None})
 
-    print(f"[APP] Generated {len(data)} tasks for scenario3")
-    return jsonify({'data': data, 'tasks': data})
+    print(f"[APP] Serving {len(published.tasks)} tasks for scenario3 (version {published.version})")
+    return scenarios.published_response(published, 'gantt')
 
 # Debug routes
 @app.route('/debug/paths')
@@ -300,33 +342,38 @@ def debug_static_test():
 
 @app.route('/debug/fresh')
 def debug_fresh_generation():
-    """Debug endpoint to verify fresh generation is working"""
+    """Debug endpoint to verify regeneration and the scenario cache"""
     if not initialized:
         initialize_app()
 
     service = SchedulerService.get_instance()
 
-    # Generate baseline twice and compare
+    # Regenerate baseline, then read it again from the cache
     print("\n[DEBUG] Testing fresh generation...")
 
-    data1 = service.get_scenario_data('baseline')
+    service.invalidate('baseline')
+    first = service.get_published('baseline')
+    data1 = list(first.tasks) if first else []
     print(f"[DEBUG] First generation: {len(data1)} tasks")
 
-    data2 = service.get_scenario_data('baseline')
-    print(f"[DEBUG] Second generation: {len(data2)} tasks")
+    second = service.get_published('baseline')
+    data2 = list(second.tasks) if second else []
+    print(f"[DEBUG] Second request: {len(data2)} tasks")
 
-    # Check if they're different instances (they should be)
-    same_object = data1 is data2
+    # The second request should get the same published version
+    same_object = first is second
     same_content = data1 == data2
 
     return jsonify({
         'message': 'Fresh generation test',
         'first_generation_count': len(data1),
         'second_generation_count': len(data2),
-        'are_same_object': same_object,  # Should be False
-        'have_same_content': same_content,  # Might be True if deterministic
+        'are_same_object': same_object,  # True when served from the published version
+        'have_same_content': same_content,
+        'published_version': first.version if first else None,
         'first_task_time': data1[0].get('startTime') if data1 else None,
-        'caching_status': 'DISABLED - Always generates fresh schedules'
+        'caching_status': f"ENABLED - TTL {service.cache.ttl}s, refresh with POST /api/scenario/<id>/refresh",
+        'cache': service.cache.stats()
     })
 
 @app.route('/debug/schedule')
@@ -394,6 +441,10 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
+    # Importing the app (tests, worker processes, WSGI tooling) starts nothing; the server warms up here,
+    # a WSGI server on the first request or readiness probe
+    if not _is_reloader_parent():
+        start_background_warmup()
     initialize_app()
 
     # Force a test call to see debug output
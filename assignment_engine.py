@@ -0,0 +1,175 @@
+"""
+Assignment Engine - individual mechanic assignments for a team's scheduled tasks on one day
+"""
+import heapq
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Shift working hours used when the input data doesn't define a shift
+DEFAULT_SHIFT_HOURS = {
+    '1st': {'start': '6:00 AM', 'end': '2:30 PM'},
+    '2nd': {'start': '2:30 PM', 'end': '11:00 PM'},
+    '3rd': {'start': '11:00 PM', 'end': '6:00 AM'},
+}
+
+# Tasks with less slack than this are flagged critical (same threshold as team-lead.js)
+CRITICAL_SLACK_HOURS = 24
+
+
+def _clock_minutes(value: str) -> int:
+    """Minutes after midnight of a working-hours time ('6:00 AM', '14:30')"""
+    value = value.strip().upper()
+    for fmt in ('%I:%M %p', '%H:%M'):
+        try:
+            parsed = datetime.strptime(value, fmt)
+            return parsed.hour * 60 + parsed.minute
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid shift time: {value}")
+
+
+def shift_window(day: date, hours: Dict[str, str]) -> Tuple[datetime, datetime]:
+    """[start, end) of a shift starting on a day; a shift ending at or before its start ends the next day"""
+    start_minutes = _clock_minutes(hours['start'])
+    end_minutes = _clock_minutes(hours['end'])
+    start = datetime.combine(day, datetime.min.time()) + timedelta(minutes=start_minutes)
+    end = datetime.combine(day, datetime.min.time()) + timedelta(minutes=end_minutes)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def split_crew(mechanics: Sequence[str], demand: Dict[str, float],
+               fixed: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+    """
+    Mechanics working each shift.
+
+    Mechanics listed in fixed keep their shift; the others are shared out in
+    proportion to each shift's demand (mechanic-minutes of work), largest
+    remainder first, in the order given.
+    """
+    fixed = fixed or {}
+    crews = {shift: [] for shift in demand}
+    free = []
+    for name in mechanics:
+        shift = fixed.get(name)
+        if shift in crews:
+            crews[shift].append(name)
+        else:
+            free.append(name)
+
+    if not crews or not free:
+        return crews
+
+    total = sum(demand.values())
+    if total <= 0:
+        shares = {shift: len(free) / len(crews) for shift in crews}
+    else:
+        shares = {shift: len(free) * minutes / total for shift, minutes in demand.items()}
+    counts = {shift: int(share) for shift, share in shares.items()}
+    by_remainder = sorted(crews, key=lambda shift: shares[shift] - counts[shift], reverse=True)
+    for shift in by_remainder[:len(free) - sum(counts.values())]:
+        counts[shift] += 1
+
+    offset = 0
+    for shift in crews:
+        crews[shift].extend(free[offset:offset + counts[shift]])
+        offset += counts[shift]
+    return crews
+
+
+def assign_shift(tasks: Sequence[Dict], crew: Sequence[str], window_end: datetime) -> Tuple[Dict, List[Dict]]:
+    """
+    Assign a shift's tasks to its crew in one sweep over start times.
+
+    Each task gets its mechanics_required mechanics among those free at its start
+    (no mechanic works two overlapping tasks), taking the least loaded ones first
+    so the work is spread evenly. O(tasks x mechanics_required x log crew).
+
+    Args:
+        tasks: Task dicts with start, end, duration and mechanics_required, in start order
+        crew: Mechanics working the shift
+        window_end: End of the shift; work after it counts as overtime
+
+    Returns:
+        (mechanic -> {'tasks', 'workMinutes', 'overtimeMinutes'}, unassigned tasks with a reason)
+    """
+    assignments = {name: {'tasks': [], 'workMinutes': 0, 'overtimeMinutes': 0} for name in crew}
+    # Free mechanics by (minutes assigned, crew order); busy mechanics by the time they are free again
+    available = [(0, order, name) for order, name in enumerate(crew)]
+    busy = []
+    unassigned = []
+
+    for task in tasks:
+        while busy and busy[0][0] <= task['start']:
+            _, load, order, name = heapq.heappop(busy)
+            heapq.heappush(available, (load, order, name))
+
+        required = task['mechanics_required']
+        if required > len(crew):
+            unassigned.append({**task, 'reason': f"Needs {required} mechanic(s), {len(crew)} on shift"})
+            continue
+        if required > len(available):
+            unassigned.append({**task, 'reason': f"Needs {required} mechanic(s), {len(available)} free at start"})
+            continue
+
+        chosen = [heapq.heappop(available) for _ in range(required)]
+        names = [name for _, _, name in chosen]
+        overtime = max(0, int((task['end'] - window_end).total_seconds() // 60))
+        for load, order, name in chosen:
+            record = assignments[name]
+            record['tasks'].append({**task, 'assignedWith': [other for other in names if other != name]})
+            record['workMinutes'] += task['duration']
+            record['overtimeMinutes'] += overtime
+            heapq.heappush(busy, (task['end'], load + task['duration'], order, name))
+
+    return assignments, unassigned
+
+
+def generate_assignments(tasks_by_shift: Dict[str, Sequence[Dict]], windows: Dict[str, Tuple[datetime, datetime]],
+                         mechanics: Sequence[str], mechanic_shifts: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Individual assignments for a team's day.
+
+    Args:
+        tasks_by_shift: Shift -> task dicts in start order (see assign_shift)
+        windows: Shift -> [start, end) of the shift on the day
+        mechanics: Mechanics present
+        mechanic_shifts: Optional mechanic -> shift; other mechanics are split by demand
+
+    Returns:
+        mechanicAssignments, unassignedTasks, crews and teamStats
+    """
+    demand = {shift: sum(task['duration'] * task['mechanics_required'] for task in tasks)
+              for shift, tasks in tasks_by_shift.items()}
+    crews = split_crew(mechanics, demand, mechanic_shifts)
+
+    mechanic_assignments = {}
+    unassigned = []
+    available_minutes = 0
+    for shift, tasks in tasks_by_shift.items():
+        window_start, window_end = windows[shift]
+        shift_minutes = (window_end - window_start).total_seconds() / 60
+        available_minutes += shift_minutes * len(crews[shift])
+
+        assignments, shift_unassigned = assign_shift(tasks, crews[shift], window_end)
+        unassigned.extend(shift_unassigned)
+        for name, record in assignments.items():
+            record['shift'] = shift
+            record['utilizationPercent'] = round(100 * record['workMinutes'] / shift_minutes, 1) if shift_minutes else 0
+            mechanic_assignments[name] = record
+
+    work_minutes = sum(record['workMinutes'] for record in mechanic_assignments.values())
+    total_tasks = sum(len(tasks) for tasks in tasks_by_shift.values())
+    return {
+        'mechanicAssignments': mechanic_assignments,
+        'unassignedTasks': unassigned,
+        'crews': crews,
+        'teamStats': {
+            'presentMechanics': len(mechanics),
+            'totalTasks': total_tasks,
+            'assignedTasks': total_tasks - len(unassigned),
+            'teamUtilization': round(100 * work_minutes / available_minutes, 1) if available_minutes else 0,
+            'totalOvertimeMinutes': sum(record['overtimeMinutes'] for record in mechanic_assignments.values())
+        }
+    }
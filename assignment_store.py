@@ -0,0 +1,81 @@
+"""
+Assignment Store - SQLite persistence of task -> mechanic assignments per scenario
+"""
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_assignments (
+    scenario_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    mechanic_id TEXT NOT NULL,
+    schedule_version INTEGER,
+    assigned_at TEXT,
+    PRIMARY KEY (scenario_id, task_id, mechanic_id)
+);
+CREATE INDEX IF NOT EXISTS idx_task_assignments_mechanic ON task_assignments (scenario_id, mechanic_id);
+"""
+
+
+class AssignmentStore:
+    """
+    Embedded SQLite store of the mechanics assigned to each scheduled task.
+
+    A batch of assignments is written in one transaction, so it is applied
+    completely or not at all. WAL mode lets web workers read while one writes;
+    each thread gets its own connection.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, scenario_id: str, mechanic_id: Optional[str] = None) -> Dict[str, List[str]]:
+        """Task id -> assigned mechanic ids of a scenario, optionally only a mechanic's tasks"""
+        sql = "SELECT task_id, mechanic_id FROM task_assignments WHERE scenario_id = ?"
+        params = [scenario_id]
+        if mechanic_id:
+            sql += " AND mechanic_id = ?"
+            params.append(mechanic_id)
+        sql += " ORDER BY task_id, mechanic_id"
+
+        assignments = {}
+        for row in self._connect().execute(sql, params):
+            assignments.setdefault(row['task_id'], []).append(row['mechanic_id'])
+        return assignments
+
+    def replace(self, scenario_id: str, assignments: Dict[str, List[str]], schedule_version: Optional[int] = None):
+        """Set the mechanics of each task in assignments (an empty list unassigns it) in one transaction"""
+        assigned_at = datetime.now().isoformat()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "DELETE FROM task_assignments WHERE scenario_id = ? AND task_id = ?",
+                [(scenario_id, task_id) for task_id in assignments])
+            conn.executemany(
+                "INSERT INTO task_assignments VALUES (?, ?, ?, ?, ?)",
+                [(scenario_id, task_id, mechanic_id, schedule_version, assigned_at)
+                 for task_id, mechanics in assignments.items() for mechanic_id in mechanics])
+        logger.info(f"Stored assignments of {len(assignments)} {scenario_id} task(s)")
@@ -1,7 +1,11 @@
 """
 Assignments API Blueprint
 """
+from datetime import date
+
 from flask import Blueprint, jsonify, request
+from backend.services.scheduler_service import ScenarioPending, SchedulerService, UnknownTeamError
+from backend.api.scenarios import pending_response
 
 assignments_bp = Blueprint('assignments', __name__, url_prefix='/api')
 
@@ -10,4 +14,118 @@ def test():
     """Test endpoint for assignments"""
     return jsonify({'message': 'assignments API is working'})
 
-# TODO: Implement actual endpoints
+
+@assignments_bp.route('/assignments')
+def get_assignments():
+    """Current task -> mechanics assignments; query arguments: scenario (default baseline), mechanic"""
+    try:
+        service = SchedulerService.get_instance()
+        scenario_id = request.args.get('scenario', 'baseline')
+        assignments = service.get_assignments(scenario_id, request.args.get('mechanic') or None)
+        return jsonify({'success': True, 'scenario': scenario_id, 'count': len(assignments),
+                        'assignments': assignments})
+    except ScenarioPending as e:
+        return pending_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@assignments_bp.route('/assignments', methods=['POST'])
+def assign_tasks():
+    """
+    Assign mechanics to many tasks in one request.
+
+    JSON body: scenario (default baseline), assignments ([{taskId, mechanicId} or
+    {taskId, mechanics: [...]}]), atomic (default true: any invalid item rejects the
+    batch). Returns one result per item; 409 if an atomic batch was rejected.
+    """
+    body = request.get_json(silent=True) or {}
+    items = body.get('assignments')
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'error': 'assignments must be a non-empty list'}), 400
+
+    try:
+        service = SchedulerService.get_instance()
+        atomic = body.get('atomic', True) is not False
+        result = service.assign_tasks(body.get('scenario') or 'baseline', items, atomic=atomic)
+        if result is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+
+        failed = sum(1 for item in result['results'] if item['error'])
+        status = 409 if atomic and failed else 200
+        return jsonify({'success': not failed, 'applied': result['applied'], 'failed': failed,
+                        'results': result['results']}), status
+    except ScenarioPending as e:
+        return pending_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@assignments_bp.route('/assign_task', methods=['POST'])
+def assign_task():
+    """Assign one task (JSON body: taskId, mechanicId, scenario); see POST /assignments"""
+    body = request.get_json(silent=True) or {}
+    try:
+        service = SchedulerService.get_instance()
+        result = service.assign_tasks(body.get('scenario') or 'baseline',
+                                      [{'taskId': body.get('taskId'), 'mechanicId': body.get('mechanicId')}])
+        if result is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+
+        item = result['results'][0]
+        if item['error']:
+            return jsonify({'success': False, 'error': item['error']}), 409
+        return jsonify({'success': True, **item})
+    except ScenarioPending as e:
+        return pending_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@assignments_bp.route('/team/<team_name>/generate_assignments', methods=['POST'])
+def generate_assignments(team_name):
+    """
+    Assign the mechanics present to a team's tasks on a day.
+
+    JSON body: scenario (default baseline), presentMechanics (names), date (ISO;
+    default today), mechanicShifts (optional mechanic -> shift)
+    """
+    body = request.get_json(silent=True) or {}
+    try:
+        value = body.get('date')
+        day = date.fromisoformat(str(value)[:10]) if value else date.today()
+        mechanics = body.get('presentMechanics') or []
+        if not isinstance(mechanics, list):
+            raise ValueError("presentMechanics must be a list")
+
+        service = SchedulerService.get_instance()
+        result = service.generate_team_assignments(
+            body.get('scenario') or 'baseline',
+            team_name,
+            [str(name) for name in mechanics],
+            day,
+            mechanic_shifts=body.get('mechanicShifts') or None
+        )
+        if result is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+        return jsonify({'success': True, **result})
+    except UnknownTeamError:
+        return jsonify({'success': False, 'error': f'Unknown team: {team_name}'}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except ScenarioPending as e:
+        return pending_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
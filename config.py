@@ -9,6 +9,8 @@ BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 EXPORT_DIR = BASE_DIR / "exports"
 LOG_DIR = BASE_DIR / "logs"
+SNAPSHOT_DIR = DATA_DIR / "snapshots"
+RESULT_DIR = DATA_DIR / "results"
 
 # Flask configuration
 DEBUG = True
@@ -18,18 +20,72 @@ PORT = 5000
 
 # Scheduler configuration
 SCHEDULER_CONFIG = {
-    'csv_file': 'scheduling_data.csv',
+    'csv_file': 'scheduling_data.csv',  # Or a dict of site name -> file to load several sites into one model
+    'load_workers': None,  # Worker processes for multi-site loading (None: one per site, up to the CPU count)
     'late_part_delay_days': 1.0,
-    'debug_mode': False
+    'debug_mode': False,
+    'snapshot_dir': SNAPSHOT_DIR,  # Compiled model snapshots; None to always parse the CSV
+    'result_dir': RESULT_DIR,  # Scenario engine results per data version; None to recompute after restarts
+    'scenario_parameters': {  # Engine parameters of the served scenarios (see SCENARIO_PARAMETERS)
+        'scenario2': {},
+        'scenario3': {}
+    },
+    'reload_interval': 0.5,  # Seconds between checks of the CSV for hot reload
+    'warmup_scenarios': ['baseline', 'scenario1', 'scenario2', 'scenario3'],  # Precomputed at startup; [] disables
+    'inline_scenarios': ['baseline', 'scenario1'],  # Generated on the request path; the others as background jobs
+    'warmup_workers': None  # Worker processes for the warm-up (None: one per scenario, up to the CPU count)
+}
+
+# Optional SQLite persistence of the compiled model and every generated schedule
+STORE_CONFIG = {
+    'enabled': False,
+    'db_path': DATA_DIR / 'scheduler.db'
+}
+
+# Counterfactual late part impact analysis (/api/late_parts_impact)
+LATE_PART_CONFIG = {
+    'near_critical_hours': 168,  # Late parts with at most this much float get a full reschedule
+    'binding_hours': 24,  # ...if their task starts within this many hours of the part being available
+    'workers': None,  # Reschedule processes; None for one per CPU
+    'cache_size': 16  # Analyses kept (one per scenario version)
+}
+
+# Product priority what-if simulations (/api/simulate)
+SIMULATION_CONFIG = {
+    'max_days': 365,  # Longest rolling horizon a simulation may cover
+    'cache_size': 128  # Simulations kept (per scenario version, product, level and horizon)
+}
+
+# Task -> mechanic assignments made by team leads
+ASSIGNMENT_CONFIG = {
+    'db_path': DATA_DIR / 'assignments.db'
+}
+
+# Background scenario jobs (optimizer runs)
+JOB_CONFIG = {
+    'max_workers': 2,  # Jobs running at once
+    'max_queued': 8,  # Jobs waiting for a worker before new submissions are rejected
+    'retention': 3600  # Seconds finished jobs and their results are kept
+}
+
+# Progress events streamed to the browser (Server-Sent Events)
+PROGRESS_CONFIG = {
+    'interval': 0.25,  # Minimum seconds between progress events of one run
+    'max_queued': 256,  # Events buffered per client before the oldest are dropped
+    'heartbeat': 15  # Seconds between keep-alive comments on idle streams
 }
 
 # API configuration
 API_CONFIG = {
     'timeout': 30,
     'max_retries': 3,
-    'cache_ttl': 300  # 5 minutes
+    'cache_ttl': 300,  # 5 minutes
+    'page_size': 500,  # Default page size of schedule queries
+    'max_page_size': 5000,
+    'history_versions': 8,  # Published versions kept per scenario for deltas
+    'delta_cache_size': 64  # Cached version-to-version deltas
 }
 
 # Ensure directories exist
-for directory in [DATA_DIR, EXPORT_DIR, LOG_DIR]:
+for directory in [DATA_DIR, EXPORT_DIR, LOG_DIR, SNAPSHOT_DIR]:
     directory.mkdir(exist_ok=True)
@@ -0,0 +1,192 @@
+"""
+Job Manager - background execution of long scenario runs with progress, queue limits and cancellation
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from scheduler import SchedulingCancelled
+
+logger = logging.getLogger(__name__)
+
+# Job states: queued -> running -> succeeded | failed | cancelled
+FINISHED_STATES = ('succeeded', 'failed', 'cancelled')
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at its limit"""
+
+
+class Job:
+    """One submitted run. Progress fields are updated by the worker, everything else by the manager."""
+
+    def __init__(self, kind: str, parameters: Optional[Dict] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.parameters = parameters or {}
+        self.state = 'queued'
+        self.stage = None
+        self.progress = 0.0
+        self.message = None
+        self.error = None
+        self.result = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.incumbent = None
+        # listener(event, data) receives every report (see JobManager broker)
+        self.listener = None
+
+    def report(self, stage: Optional[str], progress: Optional[float] = None, message: Optional[str] = None,
+               event: str = 'progress', data: Optional[Dict] = None):
+        """Progress callback handed to the scheduler (see ProductionScheduler.progress_callback)"""
+        if stage is not None:
+            self.stage = stage
+        if progress is not None:
+            self.progress = max(self.progress, min(1.0, float(progress)))
+        if message is not None:
+            self.message = message
+        if event == 'incumbent':
+            self.incumbent = data
+        if self.listener is not None:
+            self.listener(event, {**self.to_dict(), 'detail': data})
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def to_dict(self) -> Dict:
+        """Status of the job (without its result)"""
+        elapsed = None
+        if self.started_at:
+            elapsed = ((self.finished_at or datetime.now()) - self.started_at).total_seconds()
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'parameters': self.parameters,
+            'state': self.state,
+            'stage': self.stage,
+            'progress': round(self.progress, 3),
+            'message': self.message,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'elapsed_seconds': round(elapsed, 3) if elapsed is not None else None,
+            'cancel_requested': self.cancel_event.is_set(),
+            'incumbent': self.incumbent
+        }
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded thread pool.
+
+    At most max_workers jobs run at once and at most max_queued wait for a worker;
+    further submissions are rejected with JobQueueFull. Finished jobs are kept for
+    `retention` seconds so their results can be fetched.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queued: int = 8, retention: float = 3600, broker=None):
+        """
+        Args:
+            broker: Optional ProgressBroker receiving each job's progress, incumbent and
+                completion events on a channel named after the job id
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.retention = retention
+        self.broker = broker
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scenario-job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, target: Callable[[Job], Any], parameters: Optional[Dict] = None) -> Job:
+        """
+        Queue target(job) for execution.
+
+        target receives the Job, should hand job.cancel_event and job.report to the
+        scheduler it runs, and returns the job result.
+        """
+        job = Job(kind, parameters)
+        if self.broker is not None:
+            job.listener = lambda event, data: self.broker.publish(job.id, event, data)
+        with self._lock:
+            self._expire_finished()
+            queued = sum(1 for existing in self._jobs.values() if existing.state == 'queued')
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"Job queue is full ({queued} jobs waiting)")
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, target)
+        logger.info(f"Queued job {job.id} ({kind})")
+        return job
+
+    def _run(self, job: Job, target: Callable[[Job], Any]):
+        if job.cancel_event.is_set():
+            self._finish(job, 'cancelled')
+            return
+
+        job.state = 'running'
+        job.started_at = datetime.now()
+        job.report('started', 0.0)
+        started = time.perf_counter()
+        try:
+            job.result = target(job)
+        except SchedulingCancelled:
+            self._finish(job, 'cancelled')
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+            job.error = str(e)
+            self._finish(job, 'failed')
+        else:
+            job.report('done', 1.0)
+            self._finish(job, 'succeeded')
+        logger.info(f"Job {job.id} ({job.kind}) {job.state} after {time.perf_counter() - started:.2f}s")
+
+    @staticmethod
+    def _finish(job: Job, state: str):
+        job.finished_at = datetime.now()
+        job.state = state
+        if job.listener is not None:
+            job.listener('complete', job.to_dict())
+
+    def _expire_finished(self):
+        """Forget finished jobs older than the retention period (caller holds the lock)"""
+        now = datetime.now()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and (now - job.finished_at).total_seconds() > self.retention]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        """All known jobs, newest first"""
+        with self._lock:
+            self._expire_finished()
+            return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Request cancellation. A queued job never starts; a running job stops at the
+        scheduler's next progress or cancellation check.
+        """
+        job = self.get(job_id)
+        if job is not None and not job.finished:
+            job.cancel_event.set()
+        return job
+
+    def shutdown(self, wait: bool = False):
+        """Cancel everything and stop the pool"""
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel_event.set()
+        self._executor.shutdown(wait=wait)
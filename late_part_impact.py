@@ -0,0 +1,206 @@
+"""
+Late Part Impact - counterfactual effect of each late part on product completion
+"""
+import logging
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pickle import PicklingError
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from scheduler import ProductionScheduler, worker_pool_context
+from backend.services.schedule_index import RELATIONSHIP_TIMES
+
+logger = logging.getLogger(__name__)
+
+# Counterfactual run labels besides the late part task ids
+CONTROL_RUN = '__control__'
+ALL_RELAXED_RUN = '__all__'
+
+
+class InputChanged(RuntimeError):
+    """Raised when the input file no longer matches the model being analyzed"""
+
+
+def schedule_float(constraints: Sequence[Dict], times: Dict[str, Tuple[datetime, datetime]],
+                   products: Dict[str, str]) -> Dict[str, float]:
+    """
+    Hours each scheduled task can slip before its product completes later.
+
+    Float runs backwards through the dependency graph: a task's float is the
+    smallest gap to a successor plus that successor's float, or the gap to its
+    product's completion. Tasks on the critical chain have zero float. Resources
+    are not considered, so this is a screening measure.
+
+    Args:
+        constraints: Dependency constraints (see ProductionScheduler.build_dynamic_dependencies)
+        times: Task id -> (start, end) in the committed schedule
+        products: Task id -> product line
+    """
+    completion = {}
+    for task_id, (_, end) in times.items():
+        product = products.get(task_id)
+        if product is not None and (product not in completion or end > completion[product]):
+            completion[product] = end
+
+    successors = defaultdict(list)
+    remaining = defaultdict(int)
+    for constraint in constraints:
+        first, second = constraint['First'], constraint['Second']
+        if first in times and second in times:
+            successors[first].append((second, constraint.get('Relationship', 'Finish <= Start')))
+            remaining[first] += 1
+
+    # Reverse topological order: a task is done once all its successors are
+    ready = deque(task_id for task_id in times if remaining[task_id] == 0)
+    predecessors = defaultdict(list)
+    for first, edges in successors.items():
+        for second, _ in edges:
+            predecessors[second].append(first)
+
+    floats = {}
+    while ready:
+        task_id = ready.popleft()
+        own = times[task_id]
+        product = products.get(task_id)
+        best = (completion[product] - own[1]).total_seconds() / 3600 if product in completion else float('inf')
+        for successor, relationship in successors.get(task_id, ()):
+            before, after = RELATIONSHIP_TIMES.get(relationship, (1, 0))
+            gap = max(0.0, (times[successor][after] - own[before]).total_seconds() / 3600)
+            best = min(best, gap + floats[successor])
+        floats[task_id] = best
+        for predecessor in predecessors.get(task_id, ()):
+            remaining[predecessor] -= 1
+            if remaining[predecessor] == 0:
+                ready.append(predecessor)
+    return floats
+
+
+def screen_late_parts(scheduler, times: Dict[str, Tuple[datetime, datetime]], products: Dict[str, str],
+                      near_critical_hours: float, binding_hours: float) -> List[Dict]:
+    """
+    The late parts of a committed schedule, each flagged whether it needs a counterfactual run.
+
+    A late part is a candidate if its on-dock date held its task back (the task
+    starts within binding_hours of the part being available) and the task is on
+    or near the critical chain (float at most near_critical_hours). Relaxing any
+    other late part can't bring its product's completion forward by itself.
+    """
+    floats = schedule_float(scheduler.build_dynamic_dependencies(), times, products)
+    schedule_start = min((start for start, _ in times.values()), default=None)
+
+    late_parts = []
+    for constraint in scheduler.late_part_constraints:
+        task_id = constraint['First']
+        if task_id not in times:
+            continue
+        start, end = times[task_id]
+        available = scheduler.get_earliest_start_for_late_part(task_id)
+        waited = (start - available).total_seconds() / 3600
+        task_float = floats.get(task_id, float('inf'))
+
+        if schedule_start is not None and available <= schedule_start:
+            reason = 'available_at_start'
+        elif waited > binding_hours:
+            reason = 'not_binding'
+        elif task_float > near_critical_hours:
+            reason = 'off_critical_chain'
+        else:
+            reason = None
+
+        late_parts.append({
+            'task_id': task_id,
+            'successor': constraint['Second'],
+            'product': products.get(task_id) or constraint.get('Product_Line'),
+            'on_dock_date': constraint.get('On_Dock_Date'),
+            'available': available,
+            'scheduled_start': start,
+            'scheduled_end': end,
+            'float_hours': task_float,
+            'candidate': reason is None,
+            'screened': reason
+        })
+    return late_parts
+
+
+def run_counterfactuals(scheduler, capacities: Tuple[Dict, Dict],
+                        runs: Sequence[Tuple[str, Tuple[str, ...]]]) -> Dict[str, Dict[str, datetime]]:
+    """
+    Reschedule with some late parts' on-dock dates removed.
+
+    Args:
+        capacities: (mechanic team, quality team) capacities of the scenario
+        runs: (label, late part task ids to relax) pairs
+
+    Returns:
+        label -> product -> completion time
+    """
+    completions = {}
+    for label, relaxed in runs:
+        worker = scheduler.clone()
+        worker.auto_export = False
+        worker.team_capacity = dict(capacities[0])
+        worker.quality_team_capacity = dict(capacities[1])
+        # clone() shares the on-dock dates; give the worker its own relaxed copy
+        worker.on_dock_dates = {task_id: date for task_id, date in scheduler.on_dock_dates.items()
+                                if task_id not in relaxed}
+        worker.schedule_tasks(allow_late_delivery=True, silent_mode=True)
+
+        finished = {}
+        for schedule in worker.task_schedule.values():
+            product = schedule.get('product_line')
+            if product is not None and (product not in finished or schedule['end_time'] > finished[product]):
+                finished[product] = schedule['end_time']
+        completions[label] = finished
+    return completions
+
+
+def _counterfactual_worker(source, late_part_delay_days: float, snapshot_dir, fingerprint: Optional[str],
+                           capacities: Tuple[Dict, Dict], runs: Sequence[Tuple[str, Tuple[str, ...]]]):
+    """
+    Process pool worker: load the model (normally from its snapshot) and run a share of the counterfactuals.
+
+    Returns None if the input no longer matches the fingerprint of the model being served.
+    """
+    scheduler = ProductionScheduler(source, debug=False, late_part_delay_days=late_part_delay_days,
+                                    snapshot_dir=snapshot_dir, max_workers=1)
+    scheduler.load_data_from_csv()
+    if scheduler.data_fingerprint != fingerprint:
+        return None
+    return run_counterfactuals(scheduler, capacities, runs)
+
+
+def run_counterfactuals_parallel(scheduler, capacities: Tuple[Dict, Dict],
+                                 runs: Sequence[Tuple[str, Tuple[str, ...]]],
+                                 workers: Optional[int] = None) -> Dict[str, Dict[str, datetime]]:
+    """
+    run_counterfactuals spread over worker processes, one model load per worker.
+
+    Falls back to running in this process with a single worker, or if the pool
+    can't be used.
+
+    Raises:
+        InputChanged: the input file changed since the scheduler loaded it
+    """
+    workers = min(workers or os.cpu_count() or 1, len(runs))
+    if workers > 1:
+        shares = [list(runs[i::workers]) for i in range(workers)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=worker_pool_context()) as pool:
+                futures = [pool.submit(_counterfactual_worker, scheduler.csv_path, scheduler.late_part_delay_days,
+                                       scheduler.snapshot_dir, scheduler.data_fingerprint, capacities, share)
+                           for share in shares]
+                results = [future.result() for future in futures]
+        except (BrokenProcessPool, OSError, PicklingError) as e:
+            logger.warning(f"Late part analysis pool unavailable, running in-process: {e}")
+        else:
+            if any(result is None for result in results):
+                raise InputChanged("input changed while the late part analysis was running")
+            completions = {}
+            for result in results:
+                completions.update(result)
+            return completions
+
+    return run_counterfactuals(scheduler, capacities, runs)
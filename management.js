@@ -142,14 +142,16 @@ class ManagementModule extends DashboardModule {
             const scenariosResponse = await fetch('/api/scenarios');
             const scenariosInfo = await scenariosResponse.json();
 
-            // Load each scenario
+            // Load each scenario (only the changes if it was loaded before)
             for (const scenario of scenariosInfo) {
-                const response = await fetch(`/api/scenario/${scenario}`);
-                const data = await response.json();
-
-                if (response.ok && data.success) {
-                    this.allScenarios[scenario] = data;
-                    console.log(`✓ Loaded ${scenario} for management view`);
+                try {
+                    const data = await this.api.loadScenario(scenario, this.allScenarios[scenario]);
+                    if (data.success) {
+                        this.allScenarios[scenario] = data;
+                        console.log(`✓ Loaded ${scenario} for management view`);
+                    }
+                } catch (error) {
+                    console.error(`✗ Failed to load ${scenario}:`, error);
                 }
             }
 
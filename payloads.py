@@ -0,0 +1,73 @@
+"""
+Payloads - JSON responses serialized and compressed once, with strong ETags
+"""
+import gzip
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Sequence
+
+# Gantt task fields sent as indexes into a per-payload dictionary in the columnar format
+DICTIONARY_FIELDS = ('task_type', 'team', 'product_line', 'shift')
+
+
+class EncodedPayload:
+    """
+    A JSON document encoded once: identity and gzip bytes plus a strong ETag for each.
+
+    Published schedules hold their responses as EncodedPayloads, so serving one is
+    a header check and a bytes write, with no per-task work.
+    """
+
+    __slots__ = ('body', 'gzipped', 'etag', 'gzip_etag')
+
+    def __init__(self, document: Any):
+        self.body = json.dumps(document, separators=(',', ':')).encode()
+        # mtime=0 keeps the compressed bytes identical for identical documents
+        self.gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        # Strong validators are per representation, so the encodings get distinct tags
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+
+    def __len__(self):
+        return len(self.body)
+
+
+def encode_columnar(tasks: Sequence[Dict]) -> Dict:
+    """
+    Columnar form of Gantt tasks: one array per field instead of one object per task.
+
+    Repeated strings (DICTIONARY_FIELDS) are sent once in 'dictionaries' and referenced
+    by index, and start/end are integer minutes from 'base'. project.js decodes it.
+    """
+    starts = [datetime.fromisoformat(task['startTime']) for task in tasks]
+    ends = [datetime.fromisoformat(task['endTime']) for task in tasks]
+    base = min(starts) if starts else None
+
+    dictionaries = {field: [] for field in DICTIONARY_FIELDS}
+    codes = {field: {} for field in DICTIONARY_FIELDS}
+    columns = {field: [] for field in DICTIONARY_FIELDS}
+    for task in tasks:
+        for field in DICTIONARY_FIELDS:
+            value = task.get(field)
+            code = codes[field].get(value)
+            if code is None:
+                code = codes[field][value] = len(dictionaries[field])
+                dictionaries[field].append(value)
+            columns[field].append(code)
+
+    columns.update({
+        'taskId': [task['taskId'] for task in tasks],
+        'display_name': [task['display_name'] for task in tasks],
+        'duration': [task['duration'] for task in tasks],
+        'start': [int((start - base).total_seconds() // 60) for start in starts],
+        'end': [int((end - base).total_seconds() // 60) for end in ends],
+    })
+    return {
+        'format': 'columnar',
+        'count': len(tasks),
+        'base': base.isoformat() if base else None,
+        'dictionaries': dictionaries,
+        'columns': columns
+    }
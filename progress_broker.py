@@ -0,0 +1,114 @@
+"""
+Progress Broker - fan-out of scheduling progress events to Server-Sent Events streams
+"""
+import itertools
+import json
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+
+class Subscription:
+    """One stream's bounded event queue; the oldest events are dropped when a slow client falls behind"""
+
+    def __init__(self, channel: Optional[str], max_queued: int):
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.dropped = 0
+
+    def offer(self, event: Dict):
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+
+class ProgressBroker:
+    """
+    Publishes progress events to every subscribed stream.
+
+    Events are published on a channel (a job id, or 'scenario:<id>' for scenario
+    generation). Subscribers see one channel or all of them. Publishing never
+    blocks, so it can be called from scheduler threads; rate limiting happens at the
+    source (ProductionScheduler.progress_interval).
+    """
+
+    def __init__(self, max_queued: int = 256, heartbeat: float = 15.0):
+        self.max_queued = max_queued
+        self.heartbeat = heartbeat
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def message(self, channel: str, event: str, data: Dict) -> Dict:
+        """A numbered event message (see publish; also used for the initial state of a stream)"""
+        return {'id': next(self._ids), 'channel': channel, 'event': event, 'time': time.time(), 'data': data}
+
+    def publish(self, channel: str, event: str, data: Dict):
+        """Send an event ('progress', 'incumbent' or 'complete') to the subscribers of a channel"""
+        message = self.message(channel, event, data)
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.channel is None or subscription.channel == channel:
+                subscription.offer(message)
+
+    def subscribe(self, channel: Optional[str] = None) -> Subscription:
+        subscription = Subscription(channel, self.max_queued)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    @staticmethod
+    def format_event(message: Dict) -> str:
+        """Server-Sent Events wire format of a message"""
+        payload = json.dumps({'channel': message['channel'], 'time': message['time'], **message['data']},
+                             default=str)
+        return f"id: {message['id']}\nevent: {message['event']}\ndata: {payload}\n\n"
+
+    def stream(self, subscription: Subscription, initial: Optional[List[Dict]] = None,
+               until_complete: bool = False) -> Iterator[str]:
+        """
+        SSE text for a subscription, with comment heartbeats while idle.
+
+        Args:
+            initial: Messages sent first (e.g. the current state of a job)
+            until_complete: End the stream after the first 'complete' event
+        """
+        try:
+            yield "retry: 2000\n\n"
+            for message in initial or []:
+                yield self.format_event(message)
+                if until_complete and message['event'] == 'complete':
+                    return
+
+            while True:
+                try:
+                    message = subscription.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield self.format_event(message)
+                if until_complete and message['event'] == 'complete':
+                    return
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'subscribers': len(self._subscriptions),
+                'dropped': sum(subscription.dropped for subscription in self._subscriptions)
+            }
@@ -39,16 +39,31 @@ class ProjectModule extends DashboardModule {
         this.showLoading('Loading fresh schedule data...');
         this.loadCount++;
 
+        // Show the engine's progress if the scenario has to be generated first
+        const progress = this.api.streamProgress(`scenario:${this.currentScenario}`, (type, data) => {
+            const label = this.container && this.container.querySelector('.module-loader div:last-child');
+            if (label && type !== 'complete') {
+                const percent = data.progress !== null && data.progress !== undefined ?
+                    ` (${Math.round(data.progress * 100)}%)` : '';
+                label.textContent = `Generating ${data.scenario_id}: ${data.message || data.stage || ''}${percent}`;
+            }
+        });
+
         try {
             console.log(`[Project] Loading data for ${this.currentScenario} (Load #${this.loadCount})`);
 
-            // Add timestamp to prevent any browser caching
-            const timestamp = Date.now();
-            const response = await fetch(`/${this.currentScenario}?_t=${timestamp}`);
+            // Revalidate with the server (ETag) instead of bypassing the browser cache
+            let response = await fetch(`/${this.currentScenario}?format=columnar`, { cache: 'no-cache' });
+            if (response.status === 202) {
+                // An optimizer with no schedule yet runs as a background job; load it once the job is done
+                const pending = await response.json();
+                await this.api.waitForJob(pending.job.job_id);
+                response = await fetch(`/${this.currentScenario}?format=columnar`, { cache: 'no-cache' });
+            }
             const result = await response.json();
 
             // Get tasks from response
-            const tasks = result.tasks || result.data || [];
+            const tasks = result.format === 'columnar' ? this.decodeColumnar(result) : (result.tasks || result.data || []);
             console.log(`[Project] Received ${tasks.length} tasks from server`);
 
             // Debug: Log first few tasks to see dates
@@ -98,10 +113,36 @@ class ProjectModule extends DashboardModule {
             this.showError(`Failed to load data: ${error.message}`);
             console.error('[Project] Error loading data:', error);
         } finally {
+            progress.close();
             this.hideLoading();
         }
     }
 
+    // Rebuild task objects from the columnar Gantt payload (?format=columnar)
+    decodeColumnar(payload) {
+        const columns = payload.columns;
+        const dictionaries = payload.dictionaries;
+        // Times are zone-less wall-clock times; do the arithmetic in UTC so DST can't shift them
+        const base = Date.parse(`${payload.base}Z`);
+        const toTime = minutes => new Date(base + minutes * 60000).toISOString().slice(0, 19);
+
+        const tasks = new Array(payload.count);
+        for (let i = 0; i < payload.count; i++) {
+            tasks[i] = {
+                taskId: columns.taskId[i],
+                display_name: columns.display_name[i],
+                task_type: dictionaries.task_type[columns.task_type[i]],
+                team: dictionaries.team[columns.team[i]],
+                product_line: dictionaries.product_line[columns.product_line[i]],
+                shift: dictionaries.shift[columns.shift[i]],
+                duration: columns.duration[i],
+                startTime: toTime(columns.start[i]),
+                endTime: toTime(columns.end[i])
+            };
+        }
+        return tasks;
+    }
+
     getTaskClass(task) {
         // Add visual distinction for task types
         const taskType = task.task_type || task.taskType || 'Production';
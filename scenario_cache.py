@@ -0,0 +1,170 @@
+"""
+Scenario Cache - generated scenario results keyed by scenario, capacity configuration and input data
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from backend.services.payloads import EncodedPayload, encode_columnar
+from backend.services.schedule_index import ScheduleIndex
+
+
+class PublishedSchedule:
+    """
+    One immutable, versioned result of a scenario.
+
+    Published schedules are shared by every request thread without locking, so
+    nothing in them is modified after construction: attributes can't be reassigned
+    and task lists are tuples. Task dicts are shared too and must be treated as
+    read-only by callers.
+    """
+
+    __slots__ = ('scenario_id', 'version', 'key', 'fingerprint', 'generated_at', 'published_at',
+                 'priority_list', 'tasks', 'summary', 'index', 'payloads')
+
+    def __init__(self, scenario_id: str, version: int, key: Hashable, fingerprint: Optional[str],
+                 priority_list: List[Dict], tasks: List[Dict], summary: Optional[Dict] = None,
+                 constraints: Optional[List[Dict]] = None):
+        values = {
+            'scenario_id': scenario_id,
+            'version': version,
+            'key': key,
+            'fingerprint': fingerprint,
+            'generated_at': datetime.now(),
+            'published_at': time.monotonic(),
+            'priority_list': tuple(priority_list),
+            'tasks': tuple(tasks),
+            'summary': summary or {},
+        }
+        values['index'] = ScheduleIndex(values['tasks'], constraints)
+        # Responses are encoded once per version (see payload_response in the scenarios API)
+        tasks = list(values['tasks'])
+        values['payloads'] = {
+            'gantt': EncodedPayload({'version': version, 'data': tasks, 'tasks': tasks,
+                                     'summary': values['summary']}),
+            'api': EncodedPayload({'success': True, 'version': version, 'data': tasks, 'count': len(tasks),
+                                   'summary': values['summary']}),
+            'columnar': EncodedPayload({'success': True, 'version': version, **encode_columnar(tasks),
+                                        'summary': values['summary']}),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"PublishedSchedule is immutable (tried to set '{name}')")
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return (f"PublishedSchedule({self.scenario_id!r}, version={self.version}, "
+                f"tasks={len(self.priority_list)})")
+
+
+class ScenarioCache:
+    """
+    Thread-safe result cache with a time-to-live and single-flight computation.
+
+    Concurrent requests for a key that is being computed wait for that computation
+    instead of starting their own. Entries are dropped when they expire or when
+    they are invalidated; a computation that was running during an invalidation
+    is returned to its callers but not cached.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            ttl: Seconds an entry stays valid (None or 0 keeps entries until invalidated)
+            max_entries: Drop the oldest entries beyond this many (None: unbounded)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}  # key -> (created, value)
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def expired(self, created: float) -> bool:
+        """Whether something created at time.monotonic() value `created` is past the TTL"""
+        return bool(self.ttl) and time.monotonic() - created > self.ttl
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value of a key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and not self.expired(entry[0]):
+                return entry[1]
+            return None
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value of key, computing it once if it is missing or expired"""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and not self.expired(entry[0]):
+                    self.hits += 1
+                    return entry[1]
+
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = self._inflight[key] = threading.Event()
+                    generation = self._generation
+                    self.misses += 1
+
+            if not leader:
+                # Another request is computing this key; use its result (or retry if it failed)
+                event.wait()
+                continue
+
+            try:
+                value = compute()
+                with self._lock:
+                    if generation == self._generation:
+                        self._entries[key] = (time.monotonic(), value)
+                        if self.max_entries:
+                            while len(self._entries) > self.max_entries:
+                                del self._entries[next(iter(self._entries))]
+                return value
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    def invalidate(self, scenario_id: Optional[str] = None) -> int:
+        """
+        Drop cached entries of one scenario (keys starting with scenario_id), or all of them.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            self._generation += 1
+            if scenario_id is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                stale = [key for key in self._entries
+                         if isinstance(key, tuple) and key and key[0] == scenario_id]
+                for key in stale:
+                    del self._entries[key]
+                dropped = len(stale)
+        return dropped
+
+    def stats(self) -> Dict:
+        """Entry count and hit/miss counters"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'inflight': len(self._inflight),
+                'hits': self.hits,
+                'misses': self.misses,
+                'ttl': self.ttl
+            }
@@ -0,0 +1,82 @@
+"""
+Scenario Results - scenario engine results persisted per data version
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the engines change what they produce for the same input, so stored results are recomputed
+RESULT_VERSION = 1
+
+
+class ScenarioResultStore:
+    """
+    Directory of pickled scenario engine results.
+
+    A result is stored under its cache key (scenario, capacity configuration, data
+    fingerprint, engine parameters), so each expensive engine run happens once per
+    version of the input and survives restarts. Files are written to a temporary
+    name and renamed into place, so worker processes never read a partial result.
+    """
+
+    def __init__(self, result_dir):
+        self.result_dir = Path(result_dir)
+
+    @staticmethod
+    def _digest(key: Hashable) -> str:
+        return hashlib.sha256(f"v{RESULT_VERSION}:{key!r}".encode()).hexdigest()[:16]
+
+    def path(self, stem: str, key: tuple) -> Path:
+        """Result file of a key; stem names the input (see ProductionScheduler._snapshot_stem)"""
+        scenario_id, fingerprint = key[0], key[2] or 'none'
+        return self.result_dir / f"{stem}-{scenario_id}-{fingerprint[:16]}-{self._digest(key)}.pkl"
+
+    def load(self, stem: str, key: tuple) -> Optional[Dict]:
+        """Stored result of a key, or None"""
+        path = self.path(stem, key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Ignoring unreadable scenario result {path}: {e}")
+            return None
+
+        if payload.get('result_version') != RESULT_VERSION or payload.get('key') != key:
+            return None
+        return payload['result']
+
+    def save(self, stem: str, key: tuple, result: Dict) -> Optional[Path]:
+        """Store the result of a key and drop results of older data versions of the same scenario"""
+        path = self.path(stem, key)
+        payload = {'result_version': RESULT_VERSION, 'key': key, 'result': result}
+        try:
+            self.result_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.result_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except OSError as e:
+            logger.warning(f"Could not write scenario result {path}: {e}")
+            return None
+
+        current = f"{stem}-{key[0]}-{(key[2] or 'none')[:16]}-"
+        for stale in self.result_dir.glob(f"{stem}-{key[0]}-*.pkl"):
+            if not stale.name.startswith(current):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+        return path
@@ -1,11 +1,82 @@
 """
 Scenarios API Blueprint
 """
-from flask import Blueprint, jsonify, request
-from backend.services.scheduler_service import SchedulerService
+from datetime import datetime
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from backend.services.scheduler_service import ScenarioPending, SchedulerService
+from backend.services.job_manager import JobQueueFull
+from backend.services.payloads import EncodedPayload
+from backend.services.schedule_index import INDEXED_FIELDS
 
 scenarios_bp = Blueprint('scenarios', __name__, url_prefix='/api')
 
+
+def _accepts_gzip(header: str) -> bool:
+    for coding in header.split(','):
+        name, _, params = coding.strip().partition(';')
+        if name.strip().lower() in ('gzip', '*'):
+            return params.replace(' ', '').lower() not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def payload_response(payload: EncodedPayload, status: int = 200) -> Response:
+    """
+    Response for an EncodedPayload in the current request.
+
+    Answers 304 when If-None-Match carries the payload's tag (either encoding),
+    and sends the gzip bytes to clients that accept them.
+    """
+    tags = set()
+    for tag in request.headers.get('If-None-Match', '').split(','):
+        tag = tag.strip()
+        tags.add(tag[2:] if tag.startswith('W/') else tag)
+    use_gzip = _accepts_gzip(request.headers.get('Accept-Encoding', ''))
+    etag = payload.gzip_etag if use_gzip else payload.etag
+
+    headers = {
+        'ETag': etag,
+        'Vary': 'Accept-Encoding',
+        # Cache, but check with the server before every reuse
+        'Cache-Control': 'no-cache'
+    }
+    if '*' in tags or payload.etag in tags or payload.gzip_etag in tags:
+        return Response(status=304, headers=headers)
+
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+        return Response(payload.gzipped, status=status, headers=headers, mimetype='application/json')
+    return Response(payload.body, status=status, headers=headers, mimetype='application/json')
+
+
+def schedule_payload(published, default: str) -> EncodedPayload:
+    """Payload of a published schedule in the requested ?format= (columnar, or the route's default)"""
+    if request.args.get('format') == 'columnar':
+        return published.payloads['columnar']
+    return published.payloads[default]
+
+
+def published_response(published, default: str) -> Response:
+    """
+    payload_response of a published schedule. A previous version, served while the
+    current one is generated in the background, is marked with X-Schedule-Stale.
+    """
+    response = payload_response(schedule_payload(published, default))
+    if SchedulerService.get_instance().is_stale(published):
+        response.headers['X-Schedule-Stale'] = 'true'
+    return response
+
+
+def pending_response(pending: ScenarioPending):
+    """202 for a scenario being generated by a background job; follow the job, then ask again"""
+    return jsonify({
+        'success': False,
+        'pending': True,
+        'scenario': pending.scenario_id,
+        'error': str(pending),
+        'job': pending.job.to_dict()
+    }), 202
+
+
 @scenarios_bp.route('/scenarios')
 def get_scenarios():
     """Get list of available scenarios"""
@@ -13,26 +84,161 @@ def get_scenarios():
 
 @scenarios_bp.route('/scenario/<scenario_id>')
 def get_scenario_data(scenario_id):
-    """Get scheduling data for a specific scenario"""
+    """Get scheduling data for a specific scenario (pre-serialized; supports If-None-Match and ?format=columnar)"""
     try:
         service = SchedulerService.get_instance()
-        data = service.get_scenario_data(scenario_id)
+        published = service.get_published(scenario_id)
+        if published is None:
+            return jsonify({'success': True, 'data': [], 'count': 0, 'summary': None})
+        return published_response(published, 'api')
+    except ScenarioPending as e:
+        return pending_response(e)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
-        # Convert datetime objects to strings for JSON serialization
-        serializable_data = []
-        for task in data:
-            task_copy = task.copy()
-            if 'scheduled_start' in task_copy and hasattr(task_copy['scheduled_start'], 'isoformat'):
-                task_copy['scheduled_start'] = task_copy['scheduled_start'].isoformat()
-            if 'scheduled_end' in task_copy and hasattr(task_copy['scheduled_end'], 'isoformat'):
-                task_copy['scheduled_end'] = task_copy['scheduled_end'].isoformat()
-            serializable_data.append(task_copy)
+def list_arg(name):
+    """Values of a query argument given repeatedly and/or comma-separated"""
+    values = []
+    for raw in request.args.getlist(name):
+        values.extend(value.strip() for value in raw.split(',') if value.strip())
+    return values
+
+
+def datetime_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date or datetime")
 
+
+@scenarios_bp.route('/scenario/<scenario_id>/tasks')
+def query_scenario_tasks(scenario_id):
+    """
+    Filtered, paginated schedule query.
+
+    Query arguments: team, product, task_type, shift (comma-separated or repeated),
+    start/end (ISO; tasks overlapping the window), fields (comma-separated projection),
+    limit, cursor (next_cursor of the previous page)
+    """
+    try:
+        service = SchedulerService.get_instance()
+        result = service.query_scenario(
+            scenario_id,
+            filters={name: list_arg(name) for name in INDEXED_FIELDS},
+            start=datetime_arg('start'),
+            end=datetime_arg('end'),
+            fields=list_arg('fields'),
+            limit=request.args.get('limit', type=int),
+            cursor=request.args.get('cursor')
+        )
+        if result is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+        return jsonify({'success': True, **result})
+    except ScenarioPending as e:
+        return pending_response(e)
+    except ValueError as e:
         return jsonify({
-            'success': True,
-            'data': serializable_data,
-            'count': len(serializable_data)
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@scenarios_bp.route('/scenario/<scenario_id>/delta')
+def get_scenario_delta(scenario_id):
+    """
+    Tasks added, moved or reassigned since ?since=<version>, and ids of removed tasks.
+
+    Without a known since version the whole schedule is returned with full=true.
+    """
+    try:
+        since = request.args.get('since')
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                raise ValueError("since must be a schedule version number")
+
+        service = SchedulerService.get_instance()
+        payload = service.get_delta(scenario_id, since)
+        if payload is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+        return payload_response(payload)
+    except ScenarioPending as e:
+        return pending_response(e)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@scenarios_bp.route('/scenario/<scenario_id>/versions')
+def list_scenario_versions(scenario_id):
+    """
+    Schedule versions of a scenario kept in the schedule store (STORE_CONFIG), newest first.
+
+    Query arguments: limit (default 50)
+    """
+    try:
+        service = SchedulerService.get_instance()
+        versions = service.list_versions(scenario_id, request.args.get('limit', 50, type=int))
+        if versions is None:
+            return jsonify({'success': False, 'error': 'Schedule store not enabled'}), 404
+        return jsonify({'success': True, 'data': versions, 'count': len(versions)})
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@scenarios_bp.route('/export/<scenario_id>')
+def export_scenario(scenario_id):
+    """
+    Download a scenario's priority list, streamed with chunked transfer.
+
+    Query arguments: format (csv, parquet or feather; default csv)
+    """
+    try:
+        service = SchedulerService.get_instance()
+        export = service.export_schedule(scenario_id, request.args.get('format', 'csv'))
+        if export is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+        filename, media_type, chunks = export
+        return Response(stream_with_context(chunks), mimetype=media_type, headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
         })
+    except ScenarioPending as e:
+        return pending_response(e)
+    except ImportError as e:
+        return jsonify({'success': False, 'error': str(e)}), 501
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -47,7 +253,7 @@ def test():
 
 @scenarios_bp.route('/scenario/<scenario_id>/refresh', methods=['POST'])
 def refresh_scenario(scenario_id):
-    """Force refresh a scenario"""
+    """Force refresh a scenario (202 with the job for the optimizers, which are regenerated in the background)"""
     try:
         service = SchedulerService.get_instance()
         data = service.regenerate_scenario(scenario_id, force=True)
@@ -68,8 +274,108 @@ def refresh_scenario(scenario_id):
             'data': serializable_data,
             'count': len(serializable_data)
         })
+    except ScenarioPending as e:
+        return pending_response(e)
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+# ========== Background jobs ==========
+@scenarios_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Run a scenario in the background.
+
+    Body: {"scenario": "scenario2", "parameters": {"min_mechanics": 1, "max_mechanics": 20, ...}}
+    Returns the job status (202); poll /api/jobs/<job_id> and fetch /api/jobs/<job_id>/result.
+    """
+    body = request.get_json(silent=True) or {}
+    try:
+        service = SchedulerService.get_instance()
+        job = service.submit_scenario_job(body.get('scenario'), body.get('parameters'))
+        return jsonify({'success': True, 'job': job.to_dict()}), 202
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except JobQueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@scenarios_bp.route('/jobs')
+def list_jobs():
+    """Status of all known jobs, newest first"""
+    service = SchedulerService.get_instance()
+    jobs = [job.to_dict() for job in service.jobs.list_jobs()]
+    return jsonify({'success': True, 'data': jobs, 'count': len(jobs)})
+
+
+@scenarios_bp.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Status and progress of a job"""
+    job = SchedulerService.get_instance().jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+
+@scenarios_bp.route('/jobs/<job_id>/result')
+def get_job_result(job_id):
+    """Result of a finished job (202 while it is still queued or running)"""
+    job = SchedulerService.get_instance().jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+    if not job.finished:
+        return jsonify({'success': False, 'job': job.to_dict()}), 202
+    if job.state != 'succeeded':
+        return jsonify({'success': False, 'job': job.to_dict(), 'error': job.error or f'Job {job.state}'}), 409
+    return jsonify({'success': True, 'job': job.to_dict(), 'data': job.result})
+
+
+def _event_stream(events) -> Response:
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@scenarios_bp.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events: progress, incumbent and complete events of one job"""
+    service = SchedulerService.get_instance()
+    # Subscribe before taking the snapshot so no event falls in between
+    subscription = service.progress.subscribe(job_id)
+    job = service.jobs.get(job_id)
+    if job is None:
+        service.progress.unsubscribe(subscription)
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+
+    event = 'complete' if job.finished else 'progress'
+    initial = [service.progress.message(job_id, event, job.to_dict())]
+    return _event_stream(service.progress.stream(subscription, initial, until_complete=True))
+
+
+@scenarios_bp.route('/events')
+def progress_events():
+    """
+    Server-Sent Events of every run, or of one channel (?channel=<job id> or
+    ?channel=scenario:<scenario id>)
+    """
+    service = SchedulerService.get_instance()
+    subscription = service.progress.subscribe(request.args.get('channel') or None)
+    return _event_stream(service.progress.stream(subscription))
+
+
+@scenarios_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    job = SchedulerService.get_instance().jobs.cancel(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
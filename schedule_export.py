@@ -0,0 +1,149 @@
+"""
+Schedule Export - published schedules streamed as CSV, Parquet or Feather files
+"""
+import csv
+import io
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence
+
+# Export format -> (file suffix, media type)
+EXPORT_FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'feather': ('feather', 'application/vnd.apache.arrow.file'),
+}
+
+# Rows per CSV chunk or columnar record batch
+CHUNK_ROWS = 2000
+
+
+class _ChunkSink:
+    """Write-only file object collecting what a writer produced since the last drain"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def export_columns(priority_list: Sequence[Dict]) -> List[str]:
+    """
+    Columns of an export: every field of any row, in order of first appearance,
+    as export_results (a DataFrame of the whole list) writes them.
+    """
+    columns = {}
+    for task in priority_list:
+        columns.update(dict.fromkeys(task))
+    return list(columns)
+
+
+def stream_csv(priority_list: Sequence[Dict]) -> Iterator[bytes]:
+    """
+    CSV of a priority list, one chunk of CHUNK_ROWS rows at a time.
+
+    Values are written like export_results writes them (datetimes as
+    'YYYY-MM-DD HH:MM:SS', None as an empty field), so only one chunk is held
+    in memory however long the schedule is.
+    """
+    columns = export_columns(priority_list)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    # The header goes out on its own so the download starts at once
+    yield buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    for offset in range(0, len(priority_list), CHUNK_ROWS):
+        for task in priority_list[offset:offset + CHUNK_ROWS]:
+            writer.writerow([task.get(column) for column in columns])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def stream_columnar(priority_list: Sequence[Dict], format: str = 'parquet') -> Iterator[bytes]:
+    """
+    Parquet or Feather (Arrow IPC file) of a priority list, written one record batch
+    of CHUNK_ROWS rows at a time, keeping datetimes and numbers typed.
+
+    Both writers only append to their output, so each batch is sent as soon as it
+    is written. Requires pyarrow.
+    """
+    import pyarrow as pa
+
+    columns = export_columns(priority_list)
+    schema = _arrow_schema(pa, priority_list, columns)
+    sink = _ChunkSink()
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+
+    try:
+        for offset in range(0, len(priority_list), CHUNK_ROWS):
+            rows = priority_list[offset:offset + CHUNK_ROWS]
+            batch = pa.RecordBatch.from_arrays(
+                [_arrow_column(pa, [task.get(column) for task in rows], schema.field(column).type)
+                 for column in columns], schema=schema)
+            if format == 'parquet':
+                writer.write_batch(batch, row_group_size=CHUNK_ROWS)
+            else:
+                writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _arrow_column(pa, values: List, kind):
+    """Arrow array of one column of a batch; text columns take any value as its string"""
+    if kind == pa.string():
+        values = [None if value is None else str(value) for value in values]
+    return pa.array(values, type=kind)
+
+
+def _arrow_schema(pa, priority_list: Sequence[Dict], columns: Sequence[str]):
+    """Arrow schema of the export columns, typed from the values of each (mixed numbers are floats)"""
+    kinds = {column: set() for column in columns}
+    for task in priority_list:
+        for column in columns:
+            value = task.get(column)
+            if value is not None:
+                kinds[column].add(type(value))
+
+    fields = []
+    for column in columns:
+        seen = kinds[column]
+        if seen and seen <= {bool}:
+            kind = pa.bool_()
+        elif seen and seen <= {int}:
+            kind = pa.int64()
+        elif seen and seen <= {int, float}:
+            kind = pa.float64()
+        elif seen and all(issubclass(value, datetime) for value in seen):
+            kind = pa.timestamp('us')
+        else:
+            kind = pa.string()
+        fields.append(pa.field(column, kind))
+    return pa.schema(fields)
@@ -0,0 +1,301 @@
+"""
+Schedule Index - lookup structures over a published schedule for filtered, paginated queries
+"""
+import base64
+import bisect
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Query filter name -> Gantt task field it matches
+INDEXED_FIELDS = {
+    'team': 'team',
+    'product': 'product_line',
+    'task_type': 'task_type',
+    'shift': 'shift',
+}
+
+# Gantt task fields compared by schedule deltas
+DELTA_FIELDS = ('startTime', 'endTime', 'team', 'shift')
+
+# Task status relative to a point in time (see ScheduleIndex.team_tasks)
+TASK_STATUSES = ('upcoming', 'in_progress', 'completed')
+
+# Constraint relationship -> (predecessor, successor) time compared, as (start, end) indexes
+RELATIONSHIP_TIMES = {
+    'Finish <= Start': (1, 0),
+    'Finish = Start': (1, 0),
+    'Start <= Start': (0, 0),
+    'Start = Start': (0, 0),
+    'Finish <= Finish': (1, 1),
+}
+
+
+class StartOrder:
+    """
+    Task positions sorted by start time, for time-window lookups by binary search.
+
+    Tasks overlapping [start, end) all start in [start - longest task, end), so a
+    window visits only those and not the rest of the run.
+    """
+
+    def __init__(self, positions: Iterable[int], starts: Sequence[datetime], ends: Sequence[datetime]):
+        self.positions = tuple(sorted(positions, key=lambda position: (starts[position], position)))
+        self.starts = [starts[position] for position in self.positions]
+        self.ends = [ends[position] for position in self.positions]
+        self.longest = max((self.ends[i] - self.starts[i] for i in range(len(self.positions))),
+                           default=timedelta(0))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def window(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[int]:
+        """Indexes into this run of the tasks overlapping [start, end), in start order"""
+        low = 0 if start is None else bisect.bisect_left(self.starts, start - self.longest)
+        high = len(self.positions) if end is None else bisect.bisect_left(self.starts, end)
+        if start is None:
+            return list(range(low, high))
+        return [i for i in range(low, high) if self.ends[i] > start]
+
+
+class ScheduleIndex:
+    """
+    Positions of a schedule's Gantt tasks by task id, team, product, task type, shift and day.
+
+    Built once when a schedule is published and never modified afterwards. Positions
+    refer to the published task tuple, so a query only visits tasks matching its
+    most selective filter, and results keep the published (priority) order.
+    """
+
+    def __init__(self, tasks: Sequence[Dict], constraints: Optional[Sequence[Dict]] = None):
+        self.size = len(tasks)
+        self.positions: Dict[str, int] = {}
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+        self.by_field: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+        self.by_day: Dict[str, Tuple[int, ...]] = {}
+        # Per product: completion time and task count by task type
+        self.completion: Dict[str, datetime] = {}
+        self.breakdown: Dict[str, Dict[str, int]] = {}
+
+        buckets = {name: {} for name in INDEXED_FIELDS}
+        days = {}
+        for position, task in enumerate(tasks):
+            self.positions[task['taskId']] = position
+            for name, field in INDEXED_FIELDS.items():
+                buckets[name].setdefault(task.get(field), []).append(position)
+
+            start = datetime.fromisoformat(task['startTime'])
+            end = datetime.fromisoformat(task['endTime'])
+            self.starts.append(start)
+            self.ends.append(end)
+
+            product = task.get('product_line')
+            if product not in self.completion or end > self.completion[product]:
+                self.completion[product] = end
+            counts = self.breakdown.setdefault(product, {})
+            counts[task['task_type']] = counts.get(task['task_type'], 0) + 1
+            # A task is listed under every day it touches
+            day = start.date()
+            while True:
+                days.setdefault(day.isoformat(), []).append(position)
+                day += timedelta(days=1)
+                if datetime.combine(day, datetime.min.time()) >= end:
+                    break
+
+        self.by_field = {name: {value: tuple(positions) for value, positions in values.items()}
+                         for name, values in buckets.items()}
+        self.by_day = {day: tuple(positions) for day, positions in days.items()}
+        # Days with tasks, in order, so a window only visits the days it covers
+        self.days = sorted(self.by_day)
+
+        # Per team, and per team and shift: tasks in start order
+        self.team_runs: Dict[Tuple[str, Optional[str]], StartOrder] = {}
+        for team, positions in self.by_field['team'].items():
+            self.team_runs[(team, None)] = StartOrder(positions, self.starts, self.ends)
+            by_shift = {}
+            for position in positions:
+                by_shift.setdefault(tasks[position].get('shift'), []).append(position)
+            for shift, shift_positions in by_shift.items():
+                self.team_runs[(team, shift)] = StartOrder(shift_positions, self.starts, self.ends)
+
+        # Per product: tasks in start order, and the positions of its critical chain
+        self.product_runs: Dict[str, StartOrder] = {product: StartOrder(positions, self.starts, self.ends)
+                                                    for product, positions in self.by_field['product'].items()}
+        self.critical_chains: Dict[str, Tuple[int, ...]] = (
+            self._critical_chains(constraints) if constraints is not None else {})
+
+    def _critical_chains(self, constraints: Sequence[Dict]) -> Dict[str, Tuple[int, ...]]:
+        """
+        Each product's critical chain, first task first.
+
+        The chain ends with the product's last task and walks back through driving
+        predecessors: the one whose linked time leaves the smallest gap (the latest
+        finish on ties). Delaying any task on it delays the product.
+        """
+        times = (self.starts, self.ends)
+        predecessors = {}
+        for constraint in constraints:
+            first = self.positions.get(constraint['First'])
+            second = self.positions.get(constraint['Second'])
+            if first is not None and second is not None:
+                linked = RELATIONSHIP_TIMES.get(constraint.get('Relationship', 'Finish <= Start'), (1, 0))
+                predecessors.setdefault(second, []).append((first, linked))
+
+        chains = {}
+        for product, completion in self.completion.items():
+            run = self.product_runs[product]
+            position = max((position for position in run.positions if self.ends[position] == completion),
+                           default=None)
+            chain = []
+            seen = set()
+            while position is not None and position not in seen:
+                chain.append(position)
+                seen.add(position)
+                driving = None
+                for first, (before, after) in predecessors.get(position, ()):
+                    gap = times[after][position] - times[before][first]
+                    key = (gap, -self.ends[first].timestamp())
+                    if driving is None or key < driving[0]:
+                        driving = (key, first)
+                position = driving[1] if driving else None
+            chains[product] = tuple(reversed(chain))
+        return chains
+
+    def product_tasks(self, product: str, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> List[int]:
+        """Positions of a product's tasks overlapping the [start, end) window, in start order"""
+        run = self.product_runs.get(product)
+        if run is None:
+            return []
+        return [run.positions[i] for i in run.window(start, end)]
+
+    def status(self, position: int, as_of: datetime) -> str:
+        """upcoming, in_progress or completed at as_of"""
+        if self.starts[position] > as_of:
+            return 'upcoming'
+        if self.ends[position] > as_of:
+            return 'in_progress'
+        return 'completed'
+
+    def team_tasks(self, team: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   shifts: Optional[Iterable[str]] = None, status: Optional[str] = None,
+                   as_of: Optional[datetime] = None) -> List[int]:
+        """
+        Positions of a team's tasks in start order.
+
+        Args:
+            start/end: Keep tasks overlapping the [start, end) window
+            shifts: Keep tasks of these shifts (default: all)
+            status: Keep tasks with this status (see TASK_STATUSES) at as_of
+        """
+        if status is not None:
+            # A status is a time window around as_of: narrow the lookup to it
+            if status == 'upcoming':
+                start = max(start, as_of + timedelta(microseconds=1)) if start else as_of + timedelta(microseconds=1)
+            elif status == 'in_progress':
+                start = max(start, as_of) if start else as_of
+                end = min(end, as_of + timedelta(microseconds=1)) if end else as_of + timedelta(microseconds=1)
+            elif status == 'completed':
+                end = min(end, as_of) if end else as_of
+
+        keys = [(team, shift) for shift in shifts] if shifts else [(team, None)]
+        selections = []
+        for key in keys:
+            run = self.team_runs.get(key)
+            if run is None:
+                continue
+            matches = [run.positions[i] for i in run.window(start, end)]
+            if status is not None:
+                matches = [position for position in matches if self.status(position, as_of) == status]
+            selections.append(matches)
+
+        if len(selections) == 1:
+            return selections[0]
+        return list(heapq.merge(*selections, key=lambda position: (self.starts[position], position)))
+
+    def values(self, name: str) -> List:
+        """Distinct values of an indexed filter"""
+        return sorted((value for value in self.by_field[name] if value is not None), key=str)
+
+    def _window_positions(self, start: Optional[datetime], end: Optional[datetime]) -> Optional[List[int]]:
+        """Positions of tasks overlapping [start, end), looked up through the day index"""
+        if start is None and end is None:
+            return None
+
+        # Only days that have tasks are visited, however wide the window
+        low = 0 if start is None else bisect.bisect_left(self.days, start.date().isoformat())
+        high = len(self.days) if end is None else bisect.bisect_right(self.days, end.date().isoformat())
+
+        candidates = set()
+        for day in self.days[low:high]:
+            candidates.update(self.by_day[day])
+        return sorted(position for position in candidates
+                      if (start is None or self.ends[position] > start) and
+                      (end is None or self.starts[position] < end))
+
+    def select(self, filters: Dict[str, Iterable[str]], start: Optional[datetime] = None,
+               end: Optional[datetime] = None) -> List[int]:
+        """
+        Positions of tasks matching every filter, in published order.
+
+        Args:
+            filters: Filter name (see INDEXED_FIELDS) -> accepted values; a task matches
+                a filter if its field has any of the values
+            start/end: Keep tasks overlapping the [start, end) window
+        """
+        selections = []
+        for name, accepted in filters.items():
+            lookup = self.by_field[name]
+            positions = set()
+            for value in accepted:
+                positions.update(lookup.get(value, ()))
+            selections.append(positions)
+
+        window = self._window_positions(start, end)
+        if window is not None:
+            selections.append(window)
+
+        if not selections:
+            return list(range(self.size))
+
+        # Walk the smallest selection and probe the others
+        selections.sort(key=len)
+        others = [selection if isinstance(selection, set) else set(selection) for selection in selections[1:]]
+        return sorted(position for position in selections[0]
+                      if all(position in other for other in others))
+
+
+def diff_tasks(previous: Optional[Sequence[Dict]], current: Sequence[Dict]) -> Tuple[List[Dict], List[str]]:
+    """
+    Changes between two versions of a schedule's Gantt tasks.
+
+    Returns:
+        (tasks added or whose DELTA_FIELDS changed, ids of removed tasks); without a
+        previous version every current task counts as changed
+    """
+    if previous is None:
+        return list(current), []
+
+    before = {task['taskId']: tuple(task.get(field) for field in DELTA_FIELDS) for task in previous}
+    changed = []
+    for task in current:
+        if before.pop(task['taskId'], None) != tuple(task.get(field) for field in DELTA_FIELDS):
+            changed.append(task)
+    # Whatever is left in before is gone from the current version
+    return changed, list(before)
+
+
+def encode_cursor(version: int, position: int) -> str:
+    """Opaque cursor continuing after a task position of one published version"""
+    return base64.urlsafe_b64encode(f"{version}:{position}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """(version, position) of a cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        version, position = base64.urlsafe_b64decode(padded.encode()).decode().split(':')
+        return int(version), int(position)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
@@ -0,0 +1,300 @@
+"""
+Schedule Store - optional SQLite persistence for the compiled model and generated schedules
+"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    fingerprint TEXT PRIMARY KEY,
+    source TEXT,
+    loaded_at TEXT,
+    task_count INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS model_tasks (
+    fingerprint TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    product_line TEXT,
+    task_type TEXT,
+    team TEXT,
+    duration INTEGER,
+    mechanics_required INTEGER,
+    is_quality INTEGER,
+    original_task_num INTEGER,
+    PRIMARY KEY (fingerprint, task_id)
+);
+CREATE INDEX IF NOT EXISTS idx_model_tasks_product ON model_tasks (fingerprint, product_line);
+CREATE INDEX IF NOT EXISTS idx_model_tasks_team ON model_tasks (fingerprint, team);
+CREATE INDEX IF NOT EXISTS idx_model_tasks_type ON model_tasks (fingerprint, task_type);
+
+CREATE TABLE IF NOT EXISTS model_constraints (
+    fingerprint TEXT NOT NULL,
+    first_task TEXT NOT NULL,
+    second_task TEXT NOT NULL,
+    relationship TEXT,
+    constraint_type TEXT,
+    product_line TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_model_constraints_first ON model_constraints (fingerprint, first_task);
+CREATE INDEX IF NOT EXISTS idx_model_constraints_second ON model_constraints (fingerprint, second_task);
+
+CREATE TABLE IF NOT EXISTS model_teams (
+    fingerprint TEXT NOT NULL,
+    team TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    capacity INTEGER,
+    shifts TEXT,
+    PRIMARY KEY (fingerprint, team)
+);
+
+CREATE TABLE IF NOT EXISTS schedule_versions (
+    version_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scenario_id TEXT NOT NULL,
+    fingerprint TEXT,
+    created_at TEXT,
+    task_count INTEGER,
+    parameters TEXT,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_schedule_versions_scenario ON schedule_versions (scenario_id, version_id);
+
+CREATE TABLE IF NOT EXISTS schedule_tasks (
+    version_id INTEGER NOT NULL,
+    task_id TEXT NOT NULL,
+    task_num INTEGER,
+    task_type TEXT,
+    display_name TEXT,
+    product_line TEXT,
+    team TEXT,
+    shift TEXT,
+    scheduled_start TEXT,
+    scheduled_end TEXT,
+    schedule_date TEXT,
+    duration_minutes INTEGER,
+    mechanics_required INTEGER,
+    slack_hours REAL,
+    priority_score REAL,
+    global_priority INTEGER,
+    PRIMARY KEY (version_id, task_id)
+);
+CREATE INDEX IF NOT EXISTS idx_schedule_tasks_product ON schedule_tasks (version_id, product_line, scheduled_start);
+CREATE INDEX IF NOT EXISTS idx_schedule_tasks_team ON schedule_tasks (version_id, team, scheduled_start);
+CREATE INDEX IF NOT EXISTS idx_schedule_tasks_date ON schedule_tasks (version_id, schedule_date);
+CREATE INDEX IF NOT EXISTS idx_schedule_tasks_type ON schedule_tasks (version_id, task_type);
+"""
+
+# Columns of schedule_tasks filled from a global priority list entry
+SCHEDULE_TASK_COLUMNS = (
+    'task_id', 'task_num', 'task_type', 'display_name', 'product_line', 'team', 'shift',
+    'scheduled_start', 'scheduled_end', 'schedule_date', 'duration_minutes', 'mechanics_required',
+    'slack_hours', 'priority_score', 'global_priority'
+)
+
+# Fields of a global priority list entry, in the order the scheduler builds them
+PRIORITY_LIST_FIELDS = (
+    'task_id', 'task_num', 'task_type', 'display_name', 'product_line', 'team', 'scheduled_start',
+    'scheduled_end', 'duration_minutes', 'mechanics_required', 'slack_hours', 'priority_score', 'shift',
+    'global_priority'
+)
+
+
+class ScheduleStore:
+    """
+    Embedded SQLite store holding the compiled model and every generated schedule version.
+
+    The database runs in WAL mode so several web workers can read while one writes.
+    Each thread gets its own connection.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(schedule_versions)")}
+        if 'summary' not in columns:
+            # Databases created before schedule summaries were stored
+            conn.execute("ALTER TABLE schedule_versions ADD COLUMN summary TEXT")
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ========== Model ==========
+    def has_model(self, fingerprint: str) -> bool:
+        """Check if a model version is already stored"""
+        row = self._connect().execute(
+            "SELECT 1 FROM models WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        return row is not None
+
+    def save_model(self, scheduler) -> bool:
+        """
+        Store the compiled model of a loaded ProductionScheduler under its data fingerprint.
+
+        Returns:
+            True if the model was written, False if that version was already stored
+        """
+        fingerprint = scheduler.data_fingerprint
+        if not fingerprint or self.has_model(fingerprint):
+            return False
+
+        constraints = []
+        for constraint in scheduler.build_dynamic_dependencies():
+            constraints.append((
+                fingerprint, constraint['First'], constraint['Second'],
+                constraint.get('Relationship', 'Finish <= Start'),
+                constraint.get('Type', 'Precedence'), constraint.get('Product_Line')
+            ))
+
+        teams = [(fingerprint, team, 'mechanic', capacity, json.dumps(scheduler.team_shifts.get(team, [])))
+                 for team, capacity in scheduler._original_team_capacity.items()]
+        teams += [(fingerprint, team, 'quality', capacity, json.dumps(scheduler.quality_team_shifts.get(team, [])))
+                  for team, capacity in scheduler._original_quality_capacity.items()]
+
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO models (fingerprint, source, loaded_at, task_count) VALUES (?, ?, ?, ?)",
+                (fingerprint, str(scheduler.csv_path), datetime.now().isoformat(), len(scheduler.tasks)))
+            conn.executemany(
+                "INSERT INTO model_tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(fingerprint, task_id, info.get('product_line'), info['task_type'], info.get('team'),
+                  int(info['duration']), int(info['mechanics_required']), int(bool(info['is_quality'])),
+                  info.get('original_task_num'))
+                 for task_id, info in scheduler.tasks.items()])
+            conn.executemany("INSERT INTO model_constraints VALUES (?, ?, ?, ?, ?, ?)", constraints)
+            conn.executemany("INSERT INTO model_teams VALUES (?, ?, ?, ?, ?)", teams)
+
+        logger.info(f"Stored model {fingerprint[:16]} ({len(scheduler.tasks)} tasks) in {self.db_path}")
+        return True
+
+    # ========== Schedules ==========
+    def save_schedule(self, scenario_id: str, fingerprint: Optional[str], priority_list: List[Dict],
+                      parameters: Optional[Dict] = None, summary: Optional[Dict] = None) -> int:
+        """
+        Store a generated schedule as a new version of a scenario.
+
+        Args:
+            summary: The engine's JSON-ready metrics of the schedule, if it should be
+                possible to publish the version again (see load_priority_list)
+
+        Returns:
+            The new version id
+        """
+        rows = []
+        for task in priority_list:
+            start = task['scheduled_start']
+            end = task['scheduled_end']
+            row = dict(task)
+            row['scheduled_start'] = start.isoformat()
+            row['scheduled_end'] = end.isoformat()
+            row['schedule_date'] = start.date().isoformat()
+            rows.append(tuple(row.get(column) for column in SCHEDULE_TASK_COLUMNS))
+
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO schedule_versions (scenario_id, fingerprint, created_at, task_count, parameters, summary) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (scenario_id, fingerprint, datetime.now().isoformat(), len(rows),
+                 json.dumps(parameters or {}, sort_keys=True),
+                 json.dumps(summary) if summary is not None else None))
+            version_id = cursor.lastrowid
+            conn.executemany(
+                f"INSERT INTO schedule_tasks (version_id, {', '.join(SCHEDULE_TASK_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' for _ in SCHEDULE_TASK_COLUMNS)})",
+                [(version_id,) + row for row in rows])
+
+        return version_id
+
+    def latest_version(self, scenario_id: str, fingerprint: Optional[str] = None,
+                       parameters: Optional[Dict] = None) -> Optional[Dict]:
+        """Most recent stored version of a scenario, optionally for a specific model version and engine parameters"""
+        sql = "SELECT * FROM schedule_versions WHERE scenario_id = ?"
+        params = [scenario_id]
+        if fingerprint:
+            sql += " AND fingerprint = ?"
+            params.append(fingerprint)
+        if parameters is not None:
+            sql += " AND parameters = ?"
+            params.append(json.dumps(parameters, sort_keys=True))
+        sql += " ORDER BY version_id DESC LIMIT 1"
+
+        row = self._connect().execute(sql, params).fetchone()
+        return dict(row) if row else None
+
+    def list_versions(self, scenario_id: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Stored schedule versions, newest first"""
+        sql = "SELECT * FROM schedule_versions"
+        params = []
+        if scenario_id:
+            sql += " WHERE scenario_id = ?"
+            params.append(scenario_id)
+        sql += " ORDER BY version_id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def query_tasks(self, version_id: int, product_line: Optional[str] = None, team: Optional[str] = None,
+                    task_type: Optional[str] = None, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Indexed lookup of the tasks of one schedule version.
+
+        start/end select tasks overlapping the [start, end) window.
+        """
+        sql = "SELECT * FROM schedule_tasks WHERE version_id = ?"
+        params = [version_id]
+        if product_line:
+            sql += " AND product_line = ?"
+            params.append(product_line)
+        if team:
+            sql += " AND team = ?"
+            params.append(team)
+        if task_type:
+            sql += " AND task_type = ?"
+            params.append(task_type)
+        if start:
+            sql += " AND scheduled_end > ?"
+            params.append(start.isoformat())
+        if end:
+            sql += " AND scheduled_start < ?"
+            params.append(end.isoformat())
+        sql += " ORDER BY scheduled_start, global_priority"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def load_priority_list(self, version_id: int) -> List[Dict]:
+        """
+        Priority list of a stored version with the fields, datetimes and order it was
+        generated with. Numbers come back as their columns hold them (priority scores
+        as floats).
+        """
+        priority_list = []
+        for row in self.query_tasks(version_id):
+            task = {field: row[field] for field in PRIORITY_LIST_FIELDS}
+            task['scheduled_start'] = datetime.fromisoformat(task['scheduled_start'])
+            task['scheduled_end'] = datetime.fromisoformat(task['scheduled_end'])
+            priority_list.append(task)
+        priority_list.sort(key=lambda task: task['global_priority'])
+        return priority_list
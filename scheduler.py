@@ -4,7 +4,8 @@ Enhanced Production Scheduler with Product-Task Instance Model
 Key Changes:
 1. Tasks are now templates that get instantiated per product
 2. Each product-task combination is a unique schedulable entity
-3. Task IDs are now formatted as "PRODUCT_TASKNUM" (e.g., "A_80", "E_25")
+3. Task IDs are now formatted as "PRODUCT_TASKNUM" (e.g., "A_80", "E_25"), or
+   "SITE/PRODUCT_TASKNUM" (e.g., "Plant 2/A_80") when several sites are loaded together
 4. Dependencies, late parts, and rework are product-specific
 
 Original functionality maintained:
@@ -22,9 +23,168 @@ import heapq
 from typing import Dict, List, Set, Tuple, Optional
 import warnings
 import copy
+import hashlib
+import mmap
+import multiprocessing
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
 warnings.filterwarnings('ignore')
 
+# Version of the loading pipeline. Bump whenever a _load_* step changes what ends up
+# in the compiled model so that existing snapshots are no longer used.
+LOADER_VERSION = 5
+
+# Task number offset of the quality inspection created for each rework task
+REWORK_QI_OFFSET = 10000
+
+# Columnar file suffixes accepted for per-section input and written by export_results
+COLUMNAR_FORMATS = {'.parquet': 'parquet', '.feather': 'feather', '.arrow': 'feather'}
+
+# Priority level -> multiplier of a product's task priority scores (lower scores schedule first)
+PRIORITY_LEVELS = {
+    'high': 0.5,
+    'critical': 0.25,
+    'exclusive': 0.1,
+}
+
+# Sections that only feed _load_resources. A change confined to these sections
+# leaves task instances, constraints and the dependency graph untouched.
+RESOURCE_SECTIONS = frozenset({
+    "MECHANIC TEAM WORKING CALENDARS",
+    "QUALITY TEAM WORKING CALENDARS",
+    "SHIFT WORKING HOURS",
+    "MECHANIC TEAM CAPACITY",
+    "QUALITY TEAM CAPACITY",
+    "PRODUCT LINE DELIVERY SCHEDULE",
+    "PRODUCT LINE HOLIDAY CALENDAR",
+})
+
+
+def worker_pool_context():
+    """
+    Multiprocessing context of every worker process pool.
+
+    Pools are created from a process that already runs request, warm-up and file
+    watcher threads. A forked child inherits any lock another thread held at the
+    time (e.g. a logging handler's) and can deadlock on it, so workers are started
+    by a forkserver instead, or spawned where there is none (Windows).
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+class SchedulingCancelled(BaseException):
+    """
+    Raised inside a scheduling run whose cancel_event was set.
+
+    Derives from BaseException, like KeyboardInterrupt, so the optimizers'
+    `except Exception` recovery handlers don't swallow it.
+    """
+
+
+class IdRegistry:
+    """
+    Interns products, task templates, teams and product-task instances as dense integers.
+
+    Ids are handed out in order of first use and never reused, so integer lookups are
+    list indexing and string lookups a single dict probe. Instance ids also keep the
+    (product, task number) they were parsed from, so parse_product_task_id is a
+    lookup instead of string splitting. The registry is built once per loaded model.
+
+    Clones of a scheduler share its registry and may intern new ids from several
+    threads, so assignments are serialized by a lock. Lookups don't lock: a new id
+    only becomes visible in the id dict after its values are stored.
+    """
+
+    KINDS = ('product', 'template', 'team', 'instance')
+
+    def __init__(self):
+        self._ids = {kind: {} for kind in self.KINDS}
+        self._values = {kind: [] for kind in self.KINDS}
+        # instance id -> product id / template id (None if the string didn't parse)
+        self.instance_product = []
+        self.instance_template = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def intern(self, kind, value):
+        """Integer id of a value, assigning the next free one on first use"""
+        ident = self._ids[kind].get(value)
+        if ident is None:
+            with self._lock:
+                ident = self._assign(kind, value)
+        return ident
+
+    def intern_instance(self, product_task_id, product, task_num):
+        """Intern a product-task instance together with its parsed components"""
+        ident = self._ids['instance'].get(product_task_id)
+        if ident is None:
+            with self._lock:
+                ident = self._ids['instance'].get(product_task_id)
+                if ident is None:
+                    self.instance_product.append(self._assign('product', product) if product else None)
+                    self.instance_template.append(
+                        self._assign('template', task_num) if task_num is not None else None)
+                    ident = self._assign('instance', product_task_id)
+        return ident
+
+    def copy(self):
+        """Independent registry with the same ids; interning into it leaves this one unchanged"""
+        twin = IdRegistry()
+        with self._lock:
+            twin._ids = {kind: dict(ids) for kind, ids in self._ids.items()}
+            twin._values = {kind: list(values) for kind, values in self._values.items()}
+            twin.instance_product = list(self.instance_product)
+            twin.instance_template = list(self.instance_template)
+        return twin
+
+    def _assign(self, kind, value):
+        """intern() with the lock held"""
+        ids = self._ids[kind]
+        ident = ids.get(value)
+        if ident is None:
+            ident = len(self._values[kind])
+            self._values[kind].append(value)
+            ids[value] = ident
+        return ident
+
+    def lookup(self, kind, value):
+        """Integer id of an interned value, or None"""
+        return self._ids[kind].get(value)
+
+    def value(self, kind, ident):
+        """Reverse lookup of an integer id"""
+        return self._values[kind][ident]
+
+    def parse(self, product_task_id):
+        """(product, task number) of an interned instance id, or None if it isn't interned"""
+        ident = self._ids['instance'].get(product_task_id)
+        if ident is None:
+            return None
+        product = self.instance_product[ident]
+        template = self.instance_template[ident]
+        if product is None or template is None:
+            return None, None
+        return self._values['product'][product], self._values['template'][template]
+
+    def size(self, kind):
+        return len(self._values[kind])
+
 
 class ProductionScheduler:
     """
@@ -40,18 +200,58 @@ class ProductionScheduler:
     - Task 1: Only needed by product E → creates E_1
     """
 
-    def __init__(self, csv_file_path='scheduling_data.csv', debug=False, late_part_delay_days=1.0):
+    # Everything load_data_from_csv compiles; this is what a model snapshot holds
+    MODEL_ATTRIBUTES = (
+        'task_templates', 'tasks', 'product_incomplete_tasks',
+        'precedence_constraints', 'late_part_constraints', 'rework_constraints',
+        'late_part_tasks', 'rework_tasks', 'on_dock_dates', 'task_to_product',
+        'quality_inspections', 'quality_requirements',
+        'team_shifts', 'team_capacity', 'quality_team_shifts', 'quality_team_capacity', 'shift_hours',
+        'delivery_dates', 'holidays', 'product_tasks',
+        '_original_team_capacity', '_original_quality_capacity',
+        '_dynamic_constraints_cache', 'section_fingerprints', 'id_registry',
+    )
+
+    # Subset of MODEL_ATTRIBUTES built from RESOURCE_SECTIONS
+    RESOURCE_ATTRIBUTES = (
+        'team_shifts', 'team_capacity', 'quality_team_shifts', 'quality_team_capacity', 'shift_hours',
+        'delivery_dates', 'holidays', '_original_team_capacity', '_original_quality_capacity',
+    )
+
+    # Keyed by team or shift name rather than product, so shared between sites in a multi-site model
+    SHARED_ATTRIBUTES = (
+        'team_shifts', 'team_capacity', 'quality_team_shifts', 'quality_team_capacity', 'shift_hours',
+        '_original_team_capacity', '_original_quality_capacity',
+    )
+
+    def __init__(self, csv_file_path='scheduling_data.csv', debug=False, late_part_delay_days=1.0,
+                 snapshot_dir=None, site=None, max_workers=None):
         """
         Initialize scheduler with product-task instance model.
 
         Args:
-            csv_file_path: Path to the CSV file with scheduling data
+            csv_file_path: Path to the CSV file with scheduling data, or a dict of
+                           site name -> path to load several sites into one model
             debug: Enable verbose debug output
             late_part_delay_days: Days after on-dock date before late part task can start
+            snapshot_dir: Directory for compiled model snapshots (None disables snapshots)
+            site: Site name prefixed to the product lines of this input ("Site/Product A")
+            max_workers: Worker processes used to load several sites (default: one per site, up to the CPU count)
         """
         self.csv_path = csv_file_path
         self.debug = debug
         self.late_part_delay_days = late_part_delay_days
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.site = site
+        self.max_workers = max_workers
+
+        # Multi-site input: site -> path, with per-site load timings
+        self.sources = dict(csv_file_path) if isinstance(csv_file_path, dict) else None
+        self.site_load_timings = {}
+
+        # Content hash of the loaded input plus LOADER_VERSION, and per-section hashes
+        self.data_fingerprint = None
+        self.section_fingerprints = {}
 
         # Template tasks (original task definitions)
         self.task_templates = {}  # task_id -> task definition
@@ -60,7 +260,7 @@ class ProductionScheduler:
         self.tasks = {}  # product_task_id -> task info
 
         # Product-specific incomplete tasks
-        self.product_incomplete_tasks = defaultdict(list)  # product -> list of task numbers
+        self.product_incomplete_tasks = {}  # product -> range of task numbers
 
         # Constraints and relationships
         self.precedence_constraints = []
@@ -89,21 +289,112 @@ class ProductionScheduler:
         self.task_schedule = {}
         self.global_priority_list = []
 
+        # Integer ids of products, templates, teams and instances (built at load)
+        self.id_registry = None
+
         # Caches
         self._dynamic_constraints_cache = None
-        self._critical_path_cache = {}
+        self._critical_path_cache = {}  # instance id -> critical path length
+        self._successor_cache = None  # instance id -> successor instance ids
+        self._holiday_dates_cache = {}  # product -> set of holiday dates
 
         # Store originals for reset
         self._original_team_capacity = {}
         self._original_quality_capacity = {}
 
+        # Control of long runs: an Event-like object whose is_set() cancels the run, and a
+        # callback(stage, progress, message, event=..., data=...) for progress reports,
+        # called at most every progress_interval seconds (see _report_progress)
+        self.cancel_event = None
+        self.progress_callback = None
+        self.progress_interval = 0.25
+        self._progress_stage = None
+        self._progress_value = None
+        self._progress_reported_at = 0.0
+
+        # Scenario methods export their results to CSV files unless this is False
+        self.auto_export = True
+
+        # Product -> multiplier applied to its tasks' priority scores (see PRIORITY_LEVELS)
+        self.priority_bias = {}
+
     def debug_print(self, message, force=False):
         """Print debug message if debug mode is enabled or forced"""
         if self.debug or force:
             print(message)
 
+    def _check_cancelled(self):
+        """Raise SchedulingCancelled if the run was cancelled"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SchedulingCancelled()
+
+    def _report_progress(self, stage=None, progress=None, message=None, event='progress', data=None, force=False):
+        """
+        Report progress of a long run and honour cancellation.
+
+        Reports are rate-limited to one per progress_interval seconds so they can be
+        made from hot loops; a new stage, an incumbent or a forced report always goes out.
+
+        Args:
+            stage: Short name of the current phase (None keeps the current one)
+            progress: Fraction of the run completed (0-1), if known (None keeps the current one)
+            message: Optional human-readable detail
+            event: 'progress', or 'incumbent' for a new best solution of an optimizer
+            data: Optional structured detail (tasks scheduled, incumbent configuration, ...)
+            force: Report even if the previous report was less than progress_interval ago
+        """
+        self._check_cancelled()
+        if self.progress_callback is None:
+            return
+
+        if stage is None:
+            stage = self._progress_stage
+        elif stage != self._progress_stage:
+            force = True
+        if progress is None:
+            progress = self._progress_value
+        self._progress_stage = stage
+        self._progress_value = progress
+
+        now = time.monotonic()
+        if not force and event == 'progress' and now - self._progress_reported_at < self.progress_interval:
+            return
+        self._progress_reported_at = now
+        self.progress_callback(stage, progress, message, event=event, data=data)
+
+    def _report_incumbent(self, config, **metrics):
+        """Report a new best configuration found by an optimizer"""
+        if self.progress_callback is None:
+            return
+        workforce = sum(config['mechanic'].values()) + sum(config['quality'].values())
+        self._report_progress(message=f"New best: {workforce} workers", event='incumbent',
+                              data={'config': config, 'total_workforce': workforce, **metrics})
+
+    def clone(self):
+        """
+        Independent scheduler sharing this one's compiled model.
+
+        Tasks, constraints and the dependency graph are shared read-only; capacities
+        and all scheduling state are copied, so the clone can be scheduled and
+        optimized (from another thread) without affecting this scheduler.
+        """
+        twin = copy.copy(self)
+        twin.team_capacity = dict(self.team_capacity)
+        twin.quality_team_capacity = dict(self.quality_team_capacity)
+        twin.task_schedule = {}
+        twin.global_priority_list = []
+        twin._critical_path_cache = {}
+        twin._holiday_dates_cache = dict(self._holiday_dates_cache)
+        twin.cancel_event = None
+        twin.progress_callback = None
+        twin._progress_stage = None
+        twin._progress_value = None
+        twin._progress_reported_at = 0.0
+        twin.priority_bias = dict(self.priority_bias)
+        return twin
+
     def create_product_task_id(self, product, task_num):
-        """Create unique ID for product-task instance"""
+        """Create unique ID for product-task instance ("Product A" -> "A_12", "Site/Product A" -> "Site/A_12")"""
         # Use product initial for compact IDs
         product_initial = product.replace("Product ", "")
         return f"{product_initial}_{task_num}"
@@ -112,9 +403,15 @@ class ProductionScheduler:
         """Parse product-task ID back to components"""
         if not isinstance(product_task_id, str):
             return None, None
-        parts = product_task_id.split('_')
-        if len(parts) == 2:
-            product = f"Product {parts[0]}"
+        if self.id_registry is not None:
+            parsed = self.id_registry.parse(product_task_id)
+            if parsed is not None:
+                return parsed
+        parts = product_task_id.rsplit('_', 1)
+        if len(parts) == 2 and parts[0]:
+            # Only the last path segment is the product initial; a leading "Site/" is kept
+            site, separator, initial = parts[0].rpartition('/')
+            product = f"{site}{separator}Product {initial}"
             try:
                 task_num = int(parts[1])
                 return product, task_num
@@ -122,64 +419,224 @@ class ProductionScheduler:
                 return None, None
         return None, None
 
-    def parse_csv_sections(self, file_content):
-        """Parse CSV file content into separate sections based on ==== markers"""
+    def parse_csv_sections(self, lines):
+        """
+        Stream scheduling data into typed section tables.
+
+        Reads the input one line at a time, detects ==== SECTION ==== markers on the fly
+        and hands each section's rows straight to _section_frame. Only the rows of the
+        section currently being read are held as strings.
+
+        Args:
+            lines: Open file object (or any iterable of lines, or a string)
+
+        Returns:
+            Dictionary of section name -> DataFrame
+        """
+        import csv
+
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+
         sections = {}
         current_section = None
-        current_data = []
+        header = None
+        rows = []
+
+        for row in csv.reader(lines):
+            if not any(field.strip() for field in row):
+                continue
 
-        for line in file_content.strip().split('\n'):
-            if '====' in line and line.strip().startswith('===='):
-                if current_section and current_data:
-                    sections[current_section] = '\n'.join(current_data)
+            if len(row) == 1 and row[0].strip().startswith('===='):
+                if current_section and header:
+                    sections[current_section] = self._section_frame(header, rows)
                     if self.debug:
-                        print(f"[DEBUG] Saved section '{current_section}' with {len(current_data)} lines")
-                current_section = line.replace('=', '').strip()
-                current_data = []
-            else:
-                if line.strip():
-                    current_data.append(line)
+                        print(f"[DEBUG] Saved section '{current_section}' with {len(rows) + 1} lines")
+                current_section = row[0].replace('=', '').strip()
+                header = None
+                rows = []
+            elif current_section is not None:
+                if header is None:
+                    header = row
+                else:
+                    rows.append(row)
 
-        if current_section and current_data:
-            sections[current_section] = '\n'.join(current_data)
+        if current_section and header:
+            sections[current_section] = self._section_frame(header, rows)
             if self.debug:
-                print(f"[DEBUG] Saved section '{current_section}' with {len(current_data)} lines")
+                print(f"[DEBUG] Saved section '{current_section}' with {len(rows) + 1} lines")
 
         if self.debug:
             print("\n[DEBUG] Section contents preview:")
-            for name, content in sections.items():
-                print(f"  '{name}': {repr(content[:100])}...")
+            for name, frame in sections.items():
+                print(f"  '{name}': {list(frame.columns)} ({len(frame)} rows)")
 
         return sections
 
-    def load_data_from_csv(self):
-        """Load and instantiate product-specific tasks"""
-        print(f"\n[DEBUG] Starting to load data with product-task instance model...")
+    @staticmethod
+    def _section_frame(header, rows):
+        """
+        Typed parser for one section: build a DataFrame from raw CSV rows.
 
-        # Clear any cached data
-        self._dynamic_constraints_cache = None
-        self._critical_path_cache = {}
+        Column names are stripped, empty fields become NaN and columns that are
+        entirely numeric are converted, matching what pd.read_csv would infer.
+        """
+        columns = [name.strip() for name in header]
+        width = len(columns)
+        frame = pd.DataFrame([row[:width] for row in rows], columns=columns, dtype=object)
+
+        for column in frame.columns:
+            values = frame[column].replace('', np.nan)
+            try:
+                frame[column] = pd.to_numeric(values)
+            except (ValueError, TypeError):
+                frame[column] = values
 
-        # Read the CSV file
+        return frame
+
+    def read_csv_sections(self):
+        """Stream the input file through parse_csv_sections"""
+        # utf-8-sig drops a BOM if present
         try:
-            with open(self.csv_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(self.csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+                return self.parse_csv_sections(f)
         except UnicodeDecodeError:
             print("[WARNING] UTF-8 decoding failed, trying latin-1...")
-            with open(self.csv_path, 'r', encoding='latin-1') as f:
-                content = f.read()
+            with open(self.csv_path, 'r', encoding='latin-1', newline='') as f:
+                return self.parse_csv_sections(f)
 
-        # Remove BOM if present
-        if content.startswith('\ufeff'):
-            print("[WARNING] Removing BOM from file")
-            content = content[1:]
+    def read_sections(self):
+        """
+        Read all input sections as DataFrames.
 
-        print(f"[DEBUG] Read {len(content)} characters from CSV file")
+        csv_path may be the multi-section CSV file or a directory holding one columnar
+        file per section (see read_columnar_sections).
+        """
+        if os.path.isdir(self.csv_path):
+            sections = self.read_columnar_sections()
+        else:
+            sections = self.read_csv_sections()
+
+        if self.site:
+            self._namespace_sections(sections, self.site)
+        return sections
+
+    @staticmethod
+    def _namespace_sections(sections, site):
+        """Prefix every product line with the site name, which namespaces all task ids derived from it"""
+        for name, frame in sections.items():
+            if 'Product Line' in frame.columns:
+                frame = frame.copy()
+                products = frame['Product Line']
+                frame['Product Line'] = products.where(
+                    products.isna(), site + '/' + products.astype(str).str.strip())
+                sections[name] = frame
+
+    # ========== Columnar (Parquet/Arrow) input ==========
+    @staticmethod
+    def section_file_stem(section_name):
+        """File stem for a section, e.g. 'TASK RELATIONSHIPS TABLE' -> 'task_relationships_table'"""
+        return re.sub(r'[^a-z0-9]+', '_', section_name.lower()).strip('_')
+
+    @staticmethod
+    def _columnar_files(directory):
+        """Columnar section files in a directory, sorted by name"""
+        return sorted(path for path in Path(directory).iterdir()
+                      if path.is_file() and path.suffix.lower() in COLUMNAR_FORMATS)
+
+    @staticmethod
+    def _require_pyarrow():
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Columnar scheduling data requires pyarrow (pip install pyarrow)")
+
+    def read_columnar_sections(self):
+        """
+        Read a directory with one Parquet or Arrow (Feather) file per section.
+
+        Files are named after their section, e.g. task_relationships_table.parquet or
+        mechanic_team_capacity.feather. Column types are kept as stored, so dates
+        arrive as datetimes and are not re-parsed from strings.
+        """
+        self._require_pyarrow()
+
+        sections = {}
+        for path in self._columnar_files(self.csv_path):
+            section_name = path.stem.replace('_', ' ').upper()
+            if COLUMNAR_FORMATS[path.suffix.lower()] == 'parquet':
+                frame = pd.read_parquet(path)
+            else:
+                frame = pd.read_feather(path)
+            frame.columns = [str(column).strip() for column in frame.columns]
+            sections[section_name] = frame
+
+            if self.debug:
+                print(f"[DEBUG] Read section '{section_name}' from {path.name} ({len(frame)} rows)")
+
+        return sections
+
+    def write_columnar_sections(self, directory, format='parquet'):
+        """
+        Convert the current input into a directory of per-section columnar files.
+
+        Columns whose name ends in 'Date' are stored as datetimes so that later loads
+        read typed values.
+        """
+        self._require_pyarrow()
+        suffix = {'parquet': '.parquet', 'feather': '.feather'}[format]
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        written = []
+        for section_name, frame in self.read_sections().items():
+            frame = frame.copy()
+            for column in frame.columns:
+                if column.endswith('Date') and not pd.api.types.is_datetime64_any_dtype(frame[column]):
+                    frame[column] = pd.to_datetime(frame[column], format='mixed')
+
+            path = directory / f"{self.section_file_stem(section_name)}{suffix}"
+            if format == 'parquet':
+                frame.to_parquet(path, index=False)
+            else:
+                frame.reset_index(drop=True).to_feather(path)
+            written.append(path)
 
-        sections = self.parse_csv_sections(content)
+        print(f"[DEBUG] Wrote {len(written)} section files to {directory}")
+        return written
+
+    def load_data_from_csv(self):
+        """Load and instantiate product-specific tasks, replacing any previously loaded model"""
+        print(f"\n[DEBUG] Starting to load data with product-task instance model...")
+
+        # Clear any cached data
+        self._clear_caches()
+
+        if self.sources:
+            self._load_sites()
+            return
+
+        # Reuse a compiled snapshot of identical input when one exists
+        self.data_fingerprint = self.compute_data_fingerprint()
+        if self.snapshot_dir and self.load_snapshot():
+            return
+
+        sections = self.read_sections()
         print(f"[DEBUG] Found {len(sections)} sections in CSV file")
         print(f"[DEBUG] Section names found: {list(sections.keys())}")
 
+        self._compile_sections(sections)
+
+        if self.snapshot_dir:
+            # Compile the dependency graph too so it is part of the snapshot
+            self.build_dynamic_dependencies()
+            self.save_snapshot()
+
+    def _compile_sections(self, sections):
+        """Build the whole model from parsed sections"""
+        self._reset_model()
+
         # 1. Load task templates first
         self._load_task_templates(sections)
 
@@ -195,15 +652,346 @@ class ProductionScheduler:
         # 5. Load resources and other data
         self._load_resources(sections)
 
+        self.section_fingerprints = self._section_fingerprints(sections)
+        self._build_id_registry()
+
         # Summary
         self._print_loading_summary()
 
+    def _reset_model(self):
+        """Empty every compiled-model structure so a load replaces rather than appends"""
+        for name in self.MODEL_ATTRIBUTES:
+            value = getattr(self, name)
+            if isinstance(value, defaultdict):
+                setattr(self, name, defaultdict(value.default_factory))
+            elif isinstance(value, (dict, list)):
+                setattr(self, name, type(value)())
+            else:
+                setattr(self, name, None)
+        self._clear_caches()
+
+    def _clear_caches(self):
+        """Drop every cache derived from the model"""
+        self._dynamic_constraints_cache = None
+        self._critical_path_cache = {}
+        self._successor_cache = None
+        self._holiday_dates_cache = {}
+
+    @staticmethod
+    def _section_fingerprints(sections):
+        """Content hash per parsed section, used to detect which sections changed"""
+        fingerprints = {}
+        for name, frame in sections.items():
+            digest = hashlib.sha256('\x1f'.join(map(str, frame.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+            fingerprints[name] = digest.hexdigest()
+        return fingerprints
+
+    # ========== Hot reload ==========
+    def reload_from_csv(self):
+        """
+        Re-read the input file and build an updated model next to this one.
+
+        Only the parts of the model fed by changed sections are rebuilt:
+        - changes confined to RESOURCE_SECTIONS reload calendars, capacities and
+          delivery dates, and reuse the task instances, constraints and compiled
+          dependency graph of this scheduler
+        - any other change rebuilds task instances, constraints and the graph
+
+        This scheduler is never modified, so callers can swap the returned
+        scheduler in atomically while requests keep using the old one.
+
+        Returns:
+            Tuple of (scheduler, changed section names). The scheduler is self
+            when the input is unchanged.
+        """
+        fingerprint = self.compute_data_fingerprint()
+        if fingerprint == self.data_fingerprint:
+            return self, set()
+
+        reloaded = ProductionScheduler(self.csv_path, debug=self.debug,
+                                       late_part_delay_days=self.late_part_delay_days,
+                                       snapshot_dir=self.snapshot_dir, site=self.site,
+                                       max_workers=self.max_workers)
+
+        if self.sources:
+            # Sites whose input is unchanged load from their own snapshots
+            reloaded.load_data_from_csv()
+            return reloaded, self._changed_sections(reloaded.section_fingerprints)
+
+        reloaded.data_fingerprint = fingerprint
+
+        # Another process may already have compiled this version
+        if self.snapshot_dir and reloaded.load_snapshot():
+            return reloaded, self._changed_sections(reloaded.section_fingerprints)
+
+        sections = reloaded.read_sections()
+        section_fingerprints = self._section_fingerprints(sections)
+        changed = self._changed_sections(section_fingerprints)
+
+        if changed <= RESOURCE_SECTIONS and self.tasks:
+            print(f"[DEBUG] Reloading resource sections only: {sorted(changed)}")
+            for name in self.MODEL_ATTRIBUTES:
+                if name not in self.RESOURCE_ATTRIBUTES:
+                    setattr(reloaded, name, getattr(self, name))
+            # The dependency graph doesn't depend on resources: reused when this
+            # scheduler has built it, otherwise built on the reloaded model only
+            reloaded.build_dynamic_dependencies()
+            # New teams are interned into a copy; readers keep using this registry
+            reloaded.id_registry = self.id_registry.copy()
+            reloaded._load_resources(sections)
+            reloaded.section_fingerprints = section_fingerprints
+            for team in list(reloaded.team_capacity) + list(reloaded.quality_team_capacity):
+                reloaded.id_registry.intern('team', team)
+        else:
+            print(f"[DEBUG] Rebuilding model for changed sections: {sorted(changed)}")
+            reloaded._compile_sections(sections)
+            if not changed & RESOURCE_SECTIONS:
+                # Calendars are unchanged
+                reloaded._holiday_dates_cache = dict(self._holiday_dates_cache)
+
+        if self.snapshot_dir:
+            reloaded.build_dynamic_dependencies()
+            reloaded.save_snapshot()
+
+        return reloaded, changed
+
+    def _changed_sections(self, section_fingerprints):
+        """Names of sections added, removed or modified relative to the loaded model"""
+        names = set(section_fingerprints) | set(self.section_fingerprints)
+        return {name for name in names
+                if section_fingerprints.get(name) != self.section_fingerprints.get(name)}
+
+    # ========== Compiled model snapshots ==========
+    def _site_sources(self):
+        """(site, path) of every input; site is None for a plain single-site load"""
+        if self.sources:
+            return list(self.sources.items())
+        return [(self.site, self.csv_path)]
+
+    def source_files(self):
+        """Every file the model is compiled from"""
+        paths = []
+        for _, source in self._site_sources():
+            if os.path.isdir(source):
+                paths.extend(self._columnar_files(source))
+            else:
+                paths.append(Path(source))
+        return paths
+
+    def compute_data_fingerprint(self):
+        """Hash the input contents (file, every columnar file of a directory, or every site) with LOADER_VERSION"""
+        digest = hashlib.sha256(f"loader-v{LOADER_VERSION}:".encode())
+
+        for site, source in self._site_sources():
+            if site:
+                digest.update(f"site:{site}:".encode())
+            paths = self._columnar_files(source) if os.path.isdir(source) else [Path(source)]
+            for path in paths:
+                digest.update(f"{path.name}:".encode())
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(chunk)
+        return digest.hexdigest()
+
+    def _snapshot_stem(self):
+        """Snapshot file name prefix: the input name, qualified by the site if there is one"""
+        stem = Path(self.csv_path).stem
+        if self.site:
+            stem = f"{self.section_file_stem(self.site)}-{stem}"
+        return stem
+
+    def snapshot_path(self, fingerprint=None):
+        """Snapshot file for the given (default: current) data fingerprint"""
+        fingerprint = fingerprint or self.data_fingerprint
+        return self.snapshot_dir / f"{self._snapshot_stem()}-{fingerprint[:16]}-v{LOADER_VERSION}.pkl"
+
+    def save_snapshot(self):
+        """
+        Write the compiled model to a versioned binary snapshot.
+
+        The file is written to a temporary name and renamed into place, so other
+        processes either see a complete snapshot or none at all.
+        """
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        path = self.snapshot_path()
+        payload = {
+            'loader_version': LOADER_VERSION,
+            'fingerprint': self.data_fingerprint,
+            'model': {name: getattr(self, name) for name in self.MODEL_ATTRIBUTES}
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.snapshot_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Could not write model snapshot {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+        # Drop snapshots of older versions of the same input file
+        for stale in self.snapshot_dir.glob(f"{self._snapshot_stem()}-*.pkl"):
+            if stale != path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+        print(f"[DEBUG] Wrote model snapshot {path}")
+        return path
+
+    def load_snapshot(self):
+        """Load the compiled model from a snapshot matching the current fingerprint"""
+        path = self.snapshot_path()
+        if not path.exists():
+            return False
+
+        try:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                payload = pickle.loads(mapped)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError) as e:
+            print(f"[WARNING] Ignoring unreadable model snapshot {path}: {e}")
+            return False
+
+        if (payload.get('loader_version') != LOADER_VERSION or
+                payload.get('fingerprint') != self.data_fingerprint):
+            return False
+
+        for name, value in payload['model'].items():
+            setattr(self, name, value)
+
+        print(f"[DEBUG] Loaded compiled model snapshot {path} ({len(self.tasks)} task instances)")
+        return True
+
+    # ========== Multi-site loading ==========
+    def _load_sites(self):
+        """
+        Compile every site in its own worker process and merge the results into this model.
+
+        Each site is loaded with its product lines namespaced by the site name, so task
+        ids never collide across sites. Teams and shifts are shared: a team that appears
+        at several sites is scheduled as one resource pool.
+        """
+        self.data_fingerprint = self.compute_data_fingerprint()
+        workers = self.max_workers or min(len(self.sources), os.cpu_count() or 1)
+        print(f"[DEBUG] Loading {len(self.sources)} sites with {workers} worker process(es)")
+
+        started = time.perf_counter()
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=worker_pool_context()) as pool:
+                futures = [pool.submit(_compile_site, site, path, self.late_part_delay_days, self.snapshot_dir)
+                           for site, path in self.sources.items()]
+                results = [future.result() for future in futures]
+        else:
+            results = [_compile_site(site, path, self.late_part_delay_days, self.snapshot_dir)
+                       for site, path in self.sources.items()]
+
+        self._reset_model()
+        self.site_load_timings = {}
+        self._dynamic_constraints_cache = []
+        for site, model, timing in results:
+            self._merge_site(site, model)
+            self.site_load_timings[site] = timing
+        self._build_id_registry()
+
+        print(f"\n[DEBUG] MULTI-SITE LOAD: {len(self.tasks)} task instances in "
+              f"{time.perf_counter() - started:.2f}s")
+        for site, timing in self.site_load_timings.items():
+            print(f"  {site}: {timing['task_count']} task instances, {timing['seconds']:.2f}s "
+                  f"({timing['source']})")
+
+    def _merge_site(self, site, model):
+        """Merge the compiled model of one site into this one"""
+        for name in self.MODEL_ATTRIBUTES:
+            value = model[name]
+            if name == 'section_fingerprints':
+                self.section_fingerprints.update(
+                    {f"{site}/{section}": digest for section, digest in value.items()})
+            elif name == 'id_registry':
+                # Rebuilt for the merged model
+                continue
+            elif name == '_dynamic_constraints_cache':
+                # Sites share no task ids, so their dependency graphs are disjoint
+                self._dynamic_constraints_cache.extend(value or [])
+            elif name == 'task_templates':
+                # Templates are only used while compiling; keep the first definition of each task
+                for task_num, template in value.items():
+                    self.task_templates.setdefault(task_num, template)
+            elif name in self.SHARED_ATTRIBUTES:
+                merged = getattr(self, name)
+                for key, item in value.items():
+                    if key in merged and merged[key] != item:
+                        print(f"[WARNING] {site}: {name} for '{key}' is {item}, keeping {merged[key]} "
+                              f"from an earlier site")
+                        continue
+                    merged.setdefault(key, item)
+            elif isinstance(value, list):
+                getattr(self, name).extend(value)
+            else:
+                getattr(self, name).update(value)
+
+    # ========== Integer ids ==========
+    def _build_id_registry(self):
+        """
+        Intern every product, template, team and instance id of the compiled model,
+        including constraint endpoints that are not task instances themselves.
+        """
+        registry = IdRegistry()
+        for product in self.product_tasks:
+            registry.intern('product', product)
+        for task_num in self.task_templates:
+            registry.intern('template', task_num)
+        for team in list(self.team_capacity) + list(self.quality_team_capacity):
+            registry.intern('team', team)
+
+        instance_ids = list(self.tasks)
+        for constraints in (self.precedence_constraints, self.late_part_constraints, self.rework_constraints):
+            for constraint in constraints:
+                instance_ids.append(constraint['First'])
+                instance_ids.append(constraint['Second'])
+
+        # Parse with the registry detached so the string format stays the single source of truth
+        self.id_registry = None
+        for product_task_id in instance_ids:
+            if registry.lookup('instance', product_task_id) is None:
+                product, task_num = self.parse_product_task_id(product_task_id)
+                registry.intern_instance(product_task_id, product, task_num)
+        for task_info in self.tasks.values():
+            if task_info.get('team'):
+                registry.intern('team', task_info['team'])
+
+        self.id_registry = registry
+        return registry
+
+    def _successor_index(self):
+        """Successor lists of the dependency graph, indexed by instance id"""
+        if self._successor_cache is not None:
+            return self._successor_cache
+
+        registry = self.id_registry
+        if registry is None:
+            registry = self._build_id_registry()
+
+        def instance_id(product_task_id):
+            ident = registry.lookup('instance', product_task_id)
+            if ident is None:
+                ident = registry.intern_instance(product_task_id, *self.parse_product_task_id(product_task_id))
+            return ident
+
+        successors = defaultdict(list)
+        for constraint in self.build_dynamic_dependencies():
+            successors[instance_id(constraint['First'])].append(instance_id(constraint['Second']))
+
+        self._successor_cache = successors
+        return successors
+
     def _load_task_templates(self, sections):
         """Load task templates from TASK DURATION AND RESOURCE TABLE"""
         if "TASK DURATION AND RESOURCE TABLE" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["TASK DURATION AND RESOURCE TABLE"]))
-            df.columns = df.columns.str.strip()
+            df = sections["TASK DURATION AND RESOURCE TABLE"]
 
             task_count = 0
             for _, row in df.iterrows():
@@ -230,17 +1018,16 @@ class ProductionScheduler:
     def _load_product_incomplete_tasks(self, sections):
         """Load which tasks are incomplete for each product"""
         if "PRODUCT LINE JOBS" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["PRODUCT LINE JOBS"]))
-            df.columns = df.columns.str.strip()
+            df = sections["PRODUCT LINE JOBS"]
 
             for _, row in df.iterrows():
                 product = row['Product Line'].strip()
                 start_task = int(row['Task Start'])
                 end_task = int(row['Task End'])
 
-                # Tasks from start to end are incomplete for this product
-                incomplete_tasks = list(range(start_task, end_task + 1))
+                # Tasks from start to end are incomplete for this product.
+                # Kept as a range so membership tests are O(1).
+                incomplete_tasks = range(start_task, end_task + 1)
                 self.product_incomplete_tasks[product] = incomplete_tasks
 
                 print(f"[DEBUG] {product}: {len(incomplete_tasks)} incomplete tasks ({start_task}-{end_task})")
@@ -272,104 +1059,143 @@ class ProductionScheduler:
         for product in sorted(self.product_tasks.keys()):
             print(f"  {product}: {len(self.product_tasks[product])} task instances")
 
+    # ========== Relational expansion of product-specific tables ==========
+    def _product_task_ranges(self):
+        """Product/task-range table: one row per product with its incomplete task range"""
+        return pd.DataFrame(
+            [(product, tasks.start, tasks.stop - 1, order)
+             for order, (product, tasks) in enumerate(self.product_incomplete_tasks.items())],
+            columns=['Product', 'Task Start', 'Task End', '_product_order'])
+
+    def _join_products(self, df, product_column=None):
+        """
+        Pair every row of a relationship table with the products it applies to.
+
+        Rows that name a product line are joined to that product only; rows without
+        one are expanded to every product. Each pair carries the product's incomplete
+        task range, so membership filters become column comparisons instead of
+        per-product list scans. Pairs keep the original row order.
+        """
+        ranges = self._product_task_ranges()
+        df = df.reset_index(drop=True)
+        df['_row'] = df.index
+
+        if product_column and product_column in df.columns:
+            has_product = df[product_column].notna()
+            explicit = df[has_product].assign(Product=df.loc[has_product, product_column].astype(str).str.strip())
+            implicit = df[~has_product].drop(columns=[product_column])
+            paired = pd.concat([explicit.merge(ranges, on='Product'),
+                                implicit.merge(ranges, how='cross')],
+                               ignore_index=True)
+        else:
+            paired = df.merge(ranges, how='cross')
+
+        return paired.sort_values(['_row', '_product_order'], kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def _in_task_range(paired, column):
+        """Boolean mask: task number in `column` lies in the pair's incomplete range"""
+        return (paired[column] >= paired['Task Start']) & (paired[column] <= paired['Task End'])
+
+    def _product_task_ids(self, products, task_nums):
+        """Vectorized create_product_task_id over aligned product/task columns"""
+        return (products.str.replace("Product ", "", regex=False) + '_' +
+                task_nums.astype('int64').astype(str))
+
+    @staticmethod
+    def _numeric_columns(df, columns, table_name):
+        """Coerce task-number columns to integers, dropping rows that don't parse"""
+        df = df.copy()
+        for column in columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+        invalid = df[columns].isna().any(axis=1)
+        if invalid.any():
+            print(f"[WARNING] Skipping {int(invalid.sum())} rows with invalid task numbers in {table_name}")
+            df = df[~invalid]
+        return df.astype({column: 'int64' for column in columns})
+
     def _load_constraints(self, sections):
         """Load constraints and apply to product-task instances"""
 
         # Load precedence constraints (baseline tasks)
         if "TASK RELATIONSHIPS TABLE" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["TASK RELATIONSHIPS TABLE"]))
-            df.columns = df.columns.str.strip()
+            df = sections["TASK RELATIONSHIPS TABLE"]
+            df = self._numeric_columns(df, ['First', 'Second'], "TASK RELATIONSHIPS TABLE")
 
-            # For each constraint, create product-specific versions
-            for _, row in df.iterrows():
-                first_task = int(row['First'])
-                second_task = int(row['Second'])
-                relationship = row.get('Relationship Type', row.get('Relationship', 'Finish <= Start'))
-
-                # Apply to each product that has BOTH tasks incomplete
-                for product, incomplete in self.product_incomplete_tasks.items():
-                    if first_task in incomplete and second_task in incomplete:
-                        first_id = self.create_product_task_id(product, first_task)
-                        second_id = self.create_product_task_id(product, second_task)
-
-                        # Verify both tasks actually exist before creating constraint
-                        if first_id in self.tasks and second_id in self.tasks:
-                            self.precedence_constraints.append({
-                                'First': first_id,
-                                'Second': second_id,
-                                'Relationship': relationship,
-                                'Product': product
-                            })
+            if 'Relationship Type' in df.columns:
+                df['_relationship'] = df['Relationship Type']
+            elif 'Relationship' in df.columns:
+                df['_relationship'] = df['Relationship']
+            else:
+                df['_relationship'] = 'Finish <= Start'
+
+            # Join every constraint with every product that has BOTH tasks incomplete
+            paired = self._join_products(df)
+            paired = paired[self._in_task_range(paired, 'First') & self._in_task_range(paired, 'Second')]
+            paired = paired.assign(
+                first_id=self._product_task_ids(paired['Product'], paired['First']),
+                second_id=self._product_task_ids(paired['Product'], paired['Second']))
+
+            # Verify both tasks actually exist before creating constraint
+            paired = paired[paired['first_id'].isin(self.tasks) & paired['second_id'].isin(self.tasks)]
+
+            self.precedence_constraints.extend(
+                {'First': first_id, 'Second': second_id, 'Relationship': relationship, 'Product': product}
+                for first_id, second_id, relationship, product in zip(
+                    paired['first_id'], paired['second_id'], paired['_relationship'], paired['Product']))
 
             print(f"[DEBUG] Created {len(self.precedence_constraints)} product-specific precedence constraints")
 
         # Load late parts (product-specific)
+        late_part_pairs = None
         if "LATE PARTS RELATIONSHIPS TABLE" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["LATE PARTS RELATIONSHIPS TABLE"]))
-            df.columns = df.columns.str.strip()
+            df = sections["LATE PARTS RELATIONSHIPS TABLE"]
 
-            lp_count = 0
             has_product_column = 'Product Line' in df.columns
 
             if not has_product_column:
                 print(f"[WARNING] No 'Product Line' column in LATE PARTS RELATIONSHIPS TABLE")
                 print(f"[WARNING] Late parts will be associated with products based on dependent tasks")
 
-            for _, row in df.iterrows():
-                try:
-                    first_task = int(row['First'])  # Late part task
-                    second_task = int(row['Second'])  # Dependent task
-                    on_dock_date = pd.to_datetime(row['Estimated On Dock Date'])
-                    product_line = row['Product Line'].strip() if has_product_column and pd.notna(
-                        row.get('Product Line')) else None
-
-                    if product_line:
-                        # Check if the dependent task exists for this product
-                        incomplete_tasks = self.product_incomplete_tasks.get(product_line, [])
-                        if second_task in incomplete_tasks:
-                            first_id = self.create_product_task_id(product_line, first_task)
-                            second_id = self.create_product_task_id(product_line, second_task)
-
-                            # Verify the dependent task exists
-                            if second_id in self.tasks:
-                                self.late_part_constraints.append({
-                                    'First': first_id,
-                                    'Second': second_id,
-                                    'On_Dock_Date': on_dock_date,
-                                    'Product_Line': product_line,
-                                    'Relationship': 'Finish <= Start'
-                                })
-
-                                self.on_dock_dates[first_id] = on_dock_date
-                                self.late_part_tasks[first_id] = True
-                                self.task_to_product[first_id] = product_line
-                                lp_count += 1
-                    else:
-                        # No explicit product - infer from dependent task
-                        for product, incomplete in self.product_incomplete_tasks.items():
-                            if second_task in incomplete:
-                                first_id = self.create_product_task_id(product, first_task)
-                                second_id = self.create_product_task_id(product, second_task)
-
-                                # Verify the dependent task exists
-                                if second_id in self.tasks:
-                                    self.late_part_constraints.append({
-                                        'First': first_id,
-                                        'Second': second_id,
-                                        'On_Dock_Date': on_dock_date,
-                                        'Product_Line': product,
-                                        'Relationship': 'Finish <= Start'
-                                    })
-
-                                    self.on_dock_dates[first_id] = on_dock_date
-                                    self.late_part_tasks[first_id] = True
-                                    self.task_to_product[first_id] = product
-                                    lp_count += 1
+            try:
+                df = self._numeric_columns(df, ['First', 'Second'], "LATE PARTS RELATIONSHIPS TABLE")
+                df['_on_dock'] = pd.to_datetime(df['Estimated On Dock Date'], format='mixed', errors='coerce')
+                invalid = df['_on_dock'].isna()
+                if invalid.any():
+                    print(f"[WARNING] Skipping {int(invalid.sum())} rows with invalid on-dock dates "
+                          f"in LATE PARTS RELATIONSHIPS TABLE")
+                    df = df[~invalid]
+
+                # Late part (First) attaches to a product whose dependent task (Second) is incomplete;
+                # rows without a product line are inferred from the dependent task
+                paired = self._join_products(df, 'Product Line')
+                paired = paired[self._in_task_range(paired, 'Second')]
+                paired = paired.assign(
+                    first_id=self._product_task_ids(paired['Product'], paired['First']),
+                    second_id=self._product_task_ids(paired['Product'], paired['Second']))
+
+                # Verify the dependent task exists
+                late_part_pairs = paired[paired['second_id'].isin(self.tasks)]
+            except (ValueError, KeyError) as e:
+                print(f"[WARNING] Error processing late part relationships: {e}")
 
-                except (ValueError, KeyError) as e:
-                    print(f"[WARNING] Error processing late part relationship: {e}")
+            lp_count = 0
+            if late_part_pairs is not None:
+                for first_id, second_id, on_dock_date, product in zip(
+                        late_part_pairs['first_id'], late_part_pairs['second_id'],
+                        late_part_pairs['_on_dock'], late_part_pairs['Product']):
+                    self.late_part_constraints.append({
+                        'First': first_id,
+                        'Second': second_id,
+                        'On_Dock_Date': on_dock_date,
+                        'Product_Line': product,
+                        'Relationship': 'Finish <= Start'
+                    })
+
+                    self.on_dock_dates[first_id] = on_dock_date
+                    self.late_part_tasks[first_id] = True
+                    self.task_to_product[first_id] = product
+                    lp_count += 1
 
             print(f"[DEBUG] Loaded {lp_count} late part constraints")
 
@@ -386,37 +1212,13 @@ class ProductionScheduler:
 
         # Load late part task details
         if "LATE PARTS TASK DETAILS" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["LATE PARTS TASK DETAILS"]))
-            df.columns = df.columns.str.strip()
+            df = sections["LATE PARTS TASK DETAILS"]
 
             lp_task_count = 0
-            for _, row in df.iterrows():
+            if late_part_pairs is not None:
                 try:
-                    task_num = int(row['Task'])
-
-                    # Create instances for each product that has this late part
-                    for lp_constraint in self.late_part_constraints:
-                        product, lp_task_num = self.parse_product_task_id(lp_constraint['First'])
-                        if lp_task_num == task_num and product:
-                            product_task_id = self.create_product_task_id(product, task_num)
-
-                            # Only create if not already exists
-                            if product_task_id not in self.tasks:
-                                self.tasks[product_task_id] = {
-                                    'duration': int(row['Duration (minutes)']),
-                                    'team': row['Resource Type'].strip(),
-                                    'mechanics_required': int(row['Mechanics Required']),
-                                    'is_quality': False,
-                                    'task_type': 'Late Part',
-                                    'product_line': product,
-                                    'original_task_num': task_num
-                                }
-                                lp_task_count += 1
-
-                                if product_task_id not in self.product_tasks[product]:
-                                    self.product_tasks[product].append(product_task_id)
-
+                    df = self._numeric_columns(df, ['Task'], "LATE PARTS TASK DETAILS")
+                    lp_task_count = len(self._add_task_details(df, late_part_pairs, 'Late Part'))
                 except (ValueError, KeyError) as e:
                     print(f"[WARNING] Error processing late part task details: {e}")
 
@@ -428,71 +1230,93 @@ class ProductionScheduler:
         # Create quality inspections
         self._create_quality_inspections(sections)
 
+    def _add_task_details(self, details, pairs, task_type):
+        """
+        Create late part / rework task instances by joining a TASK DETAILS table with the
+        (product, task) pairs produced by its relationship table.
+
+        Returns:
+            List of (product, task_num, product_task_id) for the instances created
+        """
+        instances = pairs[['Product', 'First', 'first_id']].drop_duplicates('first_id')
+        joined = details.merge(instances, left_on='Task', right_on='First')
+
+        created = []
+        for task_num, product, product_task_id, duration, team, mechanics in zip(
+                joined['Task'], joined['Product'], joined['first_id'], joined['Duration (minutes)'],
+                joined['Resource Type'], joined['Mechanics Required']):
+            # Only create if not already exists
+            if product_task_id in self.tasks:
+                continue
+
+            self.tasks[product_task_id] = {
+                'duration': int(duration),
+                'team': team.strip(),
+                'mechanics_required': int(mechanics),
+                'is_quality': False,
+                'task_type': task_type,
+                'product_line': product,
+                'original_task_num': int(task_num)
+            }
+            created.append((product, int(task_num), product_task_id))
+
+            if product_task_id not in self.product_tasks[product]:
+                self.product_tasks[product].append(product_task_id)
+
+        return created
+
     def _load_rework_constraints(self, sections):
         """Load rework relationships and tasks"""
+        rework_pairs = None
         if "REWORK RELATIONSHIPS TABLE" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["REWORK RELATIONSHIPS TABLE"]))
-            df.columns = df.columns.str.strip()
+            df = sections["REWORK RELATIONSHIPS TABLE"]
 
-            rw_count = 0
             has_product_column = 'Product Line' in df.columns
 
             if not has_product_column:
                 print(f"[WARNING] No 'Product Line' column in REWORK RELATIONSHIPS TABLE")
 
-            for _, row in df.iterrows():
-                try:
-                    first_task = int(row['First'])  # Rework task
-                    second_task = int(row['Second'])  # Dependent task
-                    relationship = row.get('Relationship Type', 'Finish <= Start').strip() if pd.notna(
-                        row.get('Relationship Type')) else 'Finish <= Start'
-                    product_line = row['Product Line'].strip() if has_product_column and pd.notna(
-                        row.get('Product Line')) else None
-
-                    if product_line:
-                        # Check if the dependent task exists for this product
-                        incomplete_tasks = self.product_incomplete_tasks.get(product_line, [])
-
-                        # The dependent task might be another rework task, so check both incomplete and rework
-                        second_id = self.create_product_task_id(product_line, second_task)
-
-                        # Only create constraint if the second task will exist (either as regular or rework)
-                        if second_task in incomplete_tasks or second_id in self.rework_tasks:
-                            first_id = self.create_product_task_id(product_line, first_task)
-
-                            self.rework_constraints.append({
-                                'First': first_id,
-                                'Second': second_id,
-                                'Relationship': relationship,
-                                'Product_Line': product_line
-                            })
-
-                            self.rework_tasks[first_id] = True
-                            self.task_to_product[first_id] = product_line
-                            rw_count += 1
-                    else:
-                        # Infer from dependent task
-                        for product, incomplete in self.product_incomplete_tasks.items():
-                            second_id = self.create_product_task_id(product, second_task)
-
-                            # Check if dependent task exists or will exist
-                            if second_task in incomplete or second_id in self.rework_tasks:
-                                first_id = self.create_product_task_id(product, first_task)
-
-                                self.rework_constraints.append({
-                                    'First': first_id,
-                                    'Second': second_id,
-                                    'Relationship': relationship,
-                                    'Product_Line': product
-                                })
+            try:
+                df = self._numeric_columns(df, ['First', 'Second'], "REWORK RELATIONSHIPS TABLE")
+                if 'Relationship Type' in df.columns:
+                    df['_relationship'] = df['Relationship Type'].fillna('Finish <= Start').astype(str).str.strip()
+                else:
+                    df['_relationship'] = 'Finish <= Start'
+
+                paired = self._join_products(df, 'Product Line')
+                paired = paired.assign(
+                    first_id=self._product_task_ids(paired['Product'], paired['First']),
+                    second_id=self._product_task_ids(paired['Product'], paired['Second']))
+
+                # The dependent task might be another rework task, so a pair is kept when its
+                # dependent task is incomplete for the product or is itself a kept rework task.
+                # Chains of rework are resolved to a fixed point rather than relying on row order.
+                keep = self._in_task_range(paired, 'Second')
+                while True:
+                    chained = paired['second_id'].isin(paired.loc[keep, 'first_id'])
+                    expanded = keep | chained
+                    if expanded.equals(keep):
+                        break
+                    keep = expanded
+                rework_pairs = paired[keep]
+            except (ValueError, KeyError) as e:
+                print(f"[WARNING] Error processing rework relationships: {e}")
 
-                                self.rework_tasks[first_id] = True
-                                self.task_to_product[first_id] = product
-                                rw_count += 1
+            rw_count = 0
+            if rework_pairs is not None:
+                for first_id, second_id, relationship, product in zip(
+                        rework_pairs['first_id'], rework_pairs['second_id'],
+                        rework_pairs['_relationship'], rework_pairs['Product']):
+                    self.rework_constraints.append({
+                        'First': first_id,
+                        'Second': second_id,
+                        'Relationship': relationship,
+                        'Product_Line': product
+                    })
 
-                except (ValueError, KeyError) as e:
-                    print(f"[WARNING] Error processing rework relationship: {e}")
+                    self.rework_tasks[first_id] = True
+                    self.task_to_product[first_id] = product
+                    rw_count += 1
 
             print(f"[DEBUG] Loaded {rw_count} rework relationships")
 
@@ -509,64 +1333,55 @@ class ProductionScheduler:
 
         # Load rework task details
         if "REWORK TASK DETAILS" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["REWORK TASK DETAILS"]))
-            df.columns = df.columns.str.strip()
+            df = sections["REWORK TASK DETAILS"]
 
-            rw_task_count = 0
-            for _, row in df.iterrows():
+            created = []
+            if rework_pairs is not None:
                 try:
-                    task_num = int(row['Task'])
-
-                    # Create instances for products that need this rework
-                    for rw_constraint in self.rework_constraints:
-                        product, rw_task_num = self.parse_product_task_id(rw_constraint['First'])
-                        if rw_task_num == task_num and product:
-                            product_task_id = self.create_product_task_id(product, task_num)
-
-                            # Only create if not already exists
-                            if product_task_id not in self.tasks:
-                                self.tasks[product_task_id] = {
-                                    'duration': int(row['Duration (minutes)']),
-                                    'team': row['Resource Type'].strip(),
-                                    'mechanics_required': int(row['Mechanics Required']),
-                                    'is_quality': False,
-                                    'task_type': 'Rework',
-                                    'product_line': product,
-                                    'original_task_num': task_num
-                                }
-                                rw_task_count += 1
-
-                                if product_task_id not in self.product_tasks[product]:
-                                    self.product_tasks[product].append(product_task_id)
-
-                                # Create quality inspection for rework
-                                qi_task_id = self.create_product_task_id(product, task_num + 10000)
-                                self.quality_requirements[product_task_id] = qi_task_id
-
-                                self.tasks[qi_task_id] = {
-                                    'duration': 30,
-                                    'team': None,
-                                    'mechanics_required': 1,
-                                    'is_quality': True,
-                                    'task_type': 'Quality Inspection',
-                                    'primary_task': product_task_id,
-                                    'product_line': product,
-                                    'original_task_num': task_num + 10000
-                                }
-
-                                self.quality_inspections[qi_task_id] = {
-                                    'primary_task': product_task_id,
-                                    'headcount': 1
-                                }
-
-                                if qi_task_id not in self.product_tasks[product]:
-                                    self.product_tasks[product].append(qi_task_id)
-                                    self.task_to_product[qi_task_id] = product
-
+                    df = self._numeric_columns(df, ['Task'], "REWORK TASK DETAILS")
+                    created = self._add_task_details(df, rework_pairs, 'Rework')
                 except (ValueError, KeyError) as e:
                     print(f"[WARNING] Error processing rework task details: {e}")
 
+            # Baseline inspections are created after this step, so their numbers are reserved up front
+            reserved = set()
+            if "QUALITY INSPECTION REQUIREMENTS" in sections:
+                reserved.update(pd.to_numeric(sections["QUALITY INSPECTION REQUIREMENTS"]['Quality Task'],
+                                              errors='coerce').dropna().astype('int64'))
+
+            # Create quality inspection for each rework instance
+            for product, task_num, product_task_id in created:
+                qi_task_num = task_num + REWORK_QI_OFFSET
+                while qi_task_num in reserved or self.create_product_task_id(product, qi_task_num) in self.tasks:
+                    qi_task_num += REWORK_QI_OFFSET
+                if qi_task_num != task_num + REWORK_QI_OFFSET:
+                    print(f"[WARNING] Task {task_num + REWORK_QI_OFFSET} is already used; "
+                          f"rework {product_task_id} gets QI task {qi_task_num}")
+
+                qi_task_id = self.create_product_task_id(product, qi_task_num)
+                self.quality_requirements[product_task_id] = qi_task_id
+
+                self.tasks[qi_task_id] = {
+                    'duration': 30,
+                    'team': None,
+                    'mechanics_required': 1,
+                    'is_quality': True,
+                    'task_type': 'Quality Inspection',
+                    'primary_task': product_task_id,
+                    'product_line': product,
+                    'original_task_num': qi_task_num
+                }
+
+                self.quality_inspections[qi_task_id] = {
+                    'primary_task': product_task_id,
+                    'headcount': 1
+                }
+
+                if qi_task_id not in self.product_tasks[product]:
+                    self.product_tasks[product].append(qi_task_id)
+                    self.task_to_product[qi_task_id] = product
+
+            rw_task_count = len(created)
             print(f"[DEBUG] Loaded {rw_task_count} rework task details")
             if rw_task_count > 0:
                 print(f"[DEBUG] Created {rw_task_count} quality inspections for rework tasks")
@@ -574,46 +1389,47 @@ class ProductionScheduler:
     def _create_quality_inspections(self, sections):
         """Create quality inspection tasks for production tasks"""
         if "QUALITY INSPECTION REQUIREMENTS" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["QUALITY INSPECTION REQUIREMENTS"]))
-            df.columns = df.columns.str.strip()
+            df = sections["QUALITY INSPECTION REQUIREMENTS"]
+            df = self._numeric_columns(df, ['Primary Task', 'Quality Task'], "QUALITY INSPECTION REQUIREMENTS")
+
+            # Create QI for each product that has the primary task incomplete
+            paired = self._join_products(df)
+            paired = paired[self._in_task_range(paired, 'Primary Task')]
+            paired = paired.assign(
+                primary_id=self._product_task_ids(paired['Product'], paired['Primary Task']),
+                qi_id=self._product_task_ids(paired['Product'], paired['Quality Task']))
+
+            # Only create QI if the primary task exists
+            paired = paired[paired['primary_id'].isin(self.tasks)]
 
             qi_count = 0
-            for _, row in df.iterrows():
-                primary_task_num = int(row['Primary Task'])
-                qi_task_num = int(row['Quality Task'])
-                duration = int(row['Quality Duration (minutes)'])
-                headcount = int(row['Quality Headcount Required'])
-
-                # Create QI for each product that has this task incomplete
-                for product, incomplete in self.product_incomplete_tasks.items():
-                    if primary_task_num in incomplete:
-                        primary_id = self.create_product_task_id(product, primary_task_num)
-                        qi_id = self.create_product_task_id(product, qi_task_num)
-
-                        # Only create QI if the primary task exists
-                        if primary_id in self.tasks:
-                            self.tasks[qi_id] = {
-                                'duration': duration,
-                                'team': None,  # Will be assigned during scheduling
-                                'mechanics_required': headcount,
-                                'is_quality': True,
-                                'task_type': 'Quality Inspection',
-                                'product_line': product,
-                                'original_task_num': qi_task_num,
-                                'primary_task': primary_id
-                            }
+            for product, primary_id, qi_id, qi_task_num, duration, headcount in zip(
+                    paired['Product'], paired['primary_id'], paired['qi_id'], paired['Quality Task'],
+                    paired['Quality Duration (minutes)'], paired['Quality Headcount Required']):
+                duration = int(duration)
+                headcount = int(headcount)
+
+                self.tasks[qi_id] = {
+                    'duration': duration,
+                    'team': None,  # Will be assigned during scheduling
+                    'mechanics_required': headcount,
+                    'is_quality': True,
+                    'task_type': 'Quality Inspection',
+                    'product_line': product,
+                    'original_task_num': int(qi_task_num),
+                    'primary_task': primary_id
+                }
 
-                            self.quality_requirements[primary_id] = qi_id
-                            self.quality_inspections[qi_id] = {
-                                'primary_task': primary_id,
-                                'headcount': headcount
-                            }
+                self.quality_requirements[primary_id] = qi_id
+                self.quality_inspections[qi_id] = {
+                    'primary_task': primary_id,
+                    'headcount': headcount
+                }
 
-                            if qi_id not in self.product_tasks[product]:
-                                self.product_tasks[product].append(qi_id)
+                if qi_id not in self.product_tasks[product]:
+                    self.product_tasks[product].append(qi_id)
 
-                            qi_count += 1
+                qi_count += 1
 
             print(f"[DEBUG] Created {qi_count} quality inspection instances for baseline tasks")
             print(f"[DEBUG] Total tasks now: {len(self.tasks)}")
@@ -622,9 +1438,7 @@ class ProductionScheduler:
         """Load team capacities, shifts, holidays, etc."""
         # Mechanic team calendars
         if "MECHANIC TEAM WORKING CALENDARS" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["MECHANIC TEAM WORKING CALENDARS"]))
-            df.columns = df.columns.str.strip()
+            df = sections["MECHANIC TEAM WORKING CALENDARS"]
             for _, row in df.iterrows():
                 team_name = row['Mechanic Team'].strip()
                 shifts = row['Working Shifts']
@@ -638,9 +1452,7 @@ class ProductionScheduler:
 
         # Quality team calendars
         if "QUALITY TEAM WORKING CALENDARS" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["QUALITY TEAM WORKING CALENDARS"]))
-            df.columns = df.columns.str.strip()
+            df = sections["QUALITY TEAM WORKING CALENDARS"]
             for _, row in df.iterrows():
                 team_name = row['Quality Team'].strip()
                 self.quality_team_shifts[team_name] = [row['Working Shifts'].strip()]
@@ -648,9 +1460,7 @@ class ProductionScheduler:
 
         # Shift working hours
         if "SHIFT WORKING HOURS" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["SHIFT WORKING HOURS"]))
-            df.columns = df.columns.str.strip()
+            df = sections["SHIFT WORKING HOURS"]
             for _, row in df.iterrows():
                 self.shift_hours[row['Shift'].strip()] = {
                     'start': row['Start Time'].strip(),
@@ -660,9 +1470,7 @@ class ProductionScheduler:
 
         # Mechanic team capacity
         if "MECHANIC TEAM CAPACITY" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["MECHANIC TEAM CAPACITY"]))
-            df.columns = df.columns.str.strip()
+            df = sections["MECHANIC TEAM CAPACITY"]
             for _, row in df.iterrows():
                 team_name = row['Mechanic Team'].strip()
                 capacity = int(row['Total Capacity (People)'])
@@ -672,9 +1480,7 @@ class ProductionScheduler:
 
         # Quality team capacity
         if "QUALITY TEAM CAPACITY" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["QUALITY TEAM CAPACITY"]))
-            df.columns = df.columns.str.strip()
+            df = sections["QUALITY TEAM CAPACITY"]
             for _, row in df.iterrows():
                 team_name = row['Quality Team'].strip()
                 capacity = int(row['Total Capacity (People)'])
@@ -684,9 +1490,7 @@ class ProductionScheduler:
 
         # Product delivery schedule
         if "PRODUCT LINE DELIVERY SCHEDULE" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["PRODUCT LINE DELIVERY SCHEDULE"]))
-            df.columns = df.columns.str.strip()
+            df = sections["PRODUCT LINE DELIVERY SCHEDULE"]
             for _, row in df.iterrows():
                 product = row['Product Line'].strip()
                 self.delivery_dates[product] = pd.to_datetime(row['Delivery Date'])
@@ -694,9 +1498,7 @@ class ProductionScheduler:
 
         # Holiday calendar
         if "PRODUCT LINE HOLIDAY CALENDAR" in sections:
-            from io import StringIO
-            df = pd.read_csv(StringIO(sections["PRODUCT LINE HOLIDAY CALENDAR"]))
-            df.columns = df.columns.str.strip()
+            df = sections["PRODUCT LINE HOLIDAY CALENDAR"]
             holiday_count = 0
             for _, row in df.iterrows():
                 product = row['Product Line'].strip()
@@ -1008,6 +1810,9 @@ class ProductionScheduler:
         while (
                 ready_tasks or scheduled_count < total_tasks) and retry_count < max_retries and iteration_count < max_iterations:
             iteration_count += 1
+            if iteration_count % 50 == 0 and (self.cancel_event is not None or self.progress_callback is not None):
+                self._report_progress(message=f"{scheduled_count}/{total_tasks} tasks scheduled",
+                                      data={'scheduled': scheduled_count, 'total': total_tasks})
 
             if not ready_tasks and scheduled_count + len(failed_tasks) < total_tasks:
                 if not silent_mode:
@@ -1229,7 +2034,7 @@ class ProductionScheduler:
             # Add newly ready tasks
             newly_ready = []
             for dependent in dependents.get(task_id, set()):
-                if dependent in self.task_schedule or dependent in failed_tasks:
+                if dependent not in all_tasks or dependent in self.task_schedule or dependent in failed_tasks:
                     continue
 
                 deps = dependencies.get(dependent, set())
@@ -1247,6 +2052,11 @@ class ProductionScheduler:
                     heapq.heappush(ready_tasks, (priority, dependent))
                     newly_ready.append(dependent)
 
+        if self.progress_callback is not None:
+            # The loop only reports every 50 iterations; send the final count
+            self._report_progress(message=f"{scheduled_count}/{total_tasks} tasks scheduled",
+                                  data={'scheduled': scheduled_count, 'total': total_tasks}, force=True)
+
         if not silent_mode:
             print(f"\n[DEBUG] Scheduling complete! Scheduled {scheduled_count}/{total_tasks} task instances.")
 
@@ -1408,7 +2218,12 @@ class ProductionScheduler:
         if date.weekday() >= 5:  # Saturday = 5, Sunday = 6
             return False
 
-        if date.date() in [h.date() for h in self.holidays[product_line]]:
+        holiday_dates = self._holiday_dates_cache.get(product_line)
+        if holiday_dates is None:
+            holiday_dates = {h.date() for h in self.holidays.get(product_line, ())}
+            self._holiday_dates_cache[product_line] = holiday_dates
+
+        if date.date() in holiday_dates:
             return False
 
         return True
@@ -1539,30 +2354,27 @@ class ProductionScheduler:
 
     def calculate_critical_path_length(self, task_id):
         """Calculate the length of the critical path from this task to end"""
-        if task_id in self._critical_path_cache:
-            return self._critical_path_cache[task_id]
-
-        dynamic_constraints = self.build_dynamic_dependencies()
+        successors = self._successor_index()
+        registry = self.id_registry
+        cache = self._critical_path_cache
 
         def get_path_length(task):
-            if task in self._critical_path_cache:
-                return self._critical_path_cache[task]
+            if task in cache:
+                return cache[task]
 
             max_successor_path = 0
-            task_duration = self.tasks[task]['duration']
+            task_duration = self.tasks[registry.value('instance', task)]['duration']
 
-            # Find all successors
-            for constraint in dynamic_constraints:
-                if constraint['First'] == task:
-                    successor = constraint['Second']
-                    if successor in self.tasks:  # Ensure successor exists
-                        successor_path = get_path_length(successor)
-                        max_successor_path = max(max_successor_path, successor_path)
+            # Walk the successors
+            for successor in successors.get(task, ()):
+                if registry.value('instance', successor) in self.tasks:  # Ensure successor exists
+                    successor_path = get_path_length(successor)
+                    max_successor_path = max(max_successor_path, successor_path)
 
-            self._critical_path_cache[task] = task_duration + max_successor_path
-            return self._critical_path_cache[task]
+            cache[task] = task_duration + max_successor_path
+            return cache[task]
 
-        return get_path_length(task_id)
+        return get_path_length(registry.lookup('instance', task_id))
 
     def calculate_task_priority(self, task_id):
         """Enhanced priority calculation with task type and product-specific considerations"""
@@ -1619,7 +2431,7 @@ class ProductionScheduler:
             (100 - duration / 10) * 2                 # Duration factor
         )
 
-        return priority
+        return priority * self.priority_bias.get(product_line, 1.0)
 
     def check_resource_conflicts(self):
         """Enhanced resource conflict detection that tracks usage over time"""
@@ -1696,26 +2508,26 @@ class ProductionScheduler:
         # Calculate latest start time working backwards from delivery
         latest_finish = delivery_date
 
-        # Get cached dynamic constraints
-        dynamic_constraints = self.build_dynamic_dependencies()
+        # Cached successor lists of the dependency graph
+        successors = self._successor_index()
+        registry = self.id_registry
 
         # Get all tasks that must follow this one
         all_successors = set()
-        stack = [task_id]
+        stack = [registry.lookup('instance', task_id)]
 
         while stack:
             current = stack.pop()
 
-            for constraint in dynamic_constraints:
-                if constraint['First'] == current:
-                    successor = constraint['Second']
-                    if successor not in all_successors:
-                        all_successors.add(successor)
-                        stack.append(successor)
+            for successor in successors.get(current, ()):
+                if successor not in all_successors:
+                    all_successors.add(successor)
+                    stack.append(successor)
 
         # Calculate total duration of successor chain
+        successor_ids = (registry.value('instance', succ) for succ in all_successors)
         total_successor_duration = sum(int(self.tasks[succ]['duration'])
-                                      for succ in all_successors if succ in self.tasks)
+                                      for succ in successor_ids if succ in self.tasks)
 
         # Add buffer for working hours and days
         buffer_days = total_successor_duration / (8 * 60)  # Assuming 8 hour work days
@@ -1816,33 +2628,31 @@ class ProductionScheduler:
         scheduled_count = len(self.task_schedule)
         total_tasks = len(self.tasks)
 
-        for product, delivery_date in self.delivery_dates.items():
-            product_tasks = [t for t in self.global_priority_list
-                           if t['product_line'] == product]
-
-            if product_tasks:
-                last_task_end = max(t['scheduled_end'] for t in product_tasks)
-                lateness_days = (last_task_end - delivery_date).days
-
-                # Count task types
-                task_type_counts = defaultdict(int)
-                for task in product_tasks:
-                    task_type_counts[task['task_type']] += 1
-
-                # Count unique task numbers
-                unique_tasks = set()
-                for task in product_tasks:
-                    if task.get('task_num'):
-                        unique_tasks.add(task['task_num'])
+        # One pass over the schedule accumulates every product's figures
+        last_end = {}
+        task_counts = defaultdict(int)
+        task_type_counts = defaultdict(lambda: defaultdict(int))
+        unique_tasks = defaultdict(set)
+        for task in self.global_priority_list:
+            product = task['product_line']
+            if product not in last_end or task['scheduled_end'] > last_end[product]:
+                last_end[product] = task['scheduled_end']
+            task_counts[product] += 1
+            task_type_counts[product][task['task_type']] += 1
+            if task.get('task_num'):
+                unique_tasks[product].add(task['task_num'])
 
+        for product, delivery_date in self.delivery_dates.items():
+            if product in last_end:
+                lateness_days = (last_end[product] - delivery_date).days
                 metrics[product] = {
                     'delivery_date': delivery_date,
-                    'projected_completion': last_task_end,
+                    'projected_completion': last_end[product],
                     'lateness_days': lateness_days,
                     'on_time': lateness_days <= 0,
-                    'total_tasks': len(product_tasks),
-                    'unique_tasks': len(unique_tasks),
-                    'task_breakdown': dict(task_type_counts)
+                    'total_tasks': task_counts[product],
+                    'unique_tasks': len(unique_tasks[product]),
+                    'task_breakdown': dict(task_type_counts[product])
                 }
             else:
                 # No tasks scheduled for this product
@@ -1897,8 +2707,21 @@ class ProductionScheduler:
 
         return working_days
 
-    def export_results(self, filename='scheduling_results.csv', scenario_name=''):
-        """Export the global priority list to CSV with enhanced product-task instance information"""
+    def export_results(self, filename='scheduling_results.csv', scenario_name='', format='csv'):
+        """
+        Export the global priority list with enhanced product-task instance information
+
+        Args:
+            filename: Output file for the schedule
+            scenario_name: Appended to the file names when given
+            format: 'csv', or 'parquet' / 'feather' to write columnar files that keep
+                    datetimes and numbers typed
+        """
+        if format not in ('csv', 'parquet', 'feather'):
+            raise ValueError(f"Unsupported export format: {format}")
+        if format != 'csv':
+            self._require_pyarrow()
+
         if scenario_name:
             base = 'scheduling_results'
             ext = 'csv'
@@ -1906,9 +2729,12 @@ class ProductionScheduler:
                 base, ext = filename.rsplit('.', 1)
             filename = f"{base}_{scenario_name}.{ext}"
 
+        if format != 'csv':
+            filename = f"{filename.rsplit('.', 1)[0]}.{format}"
+
         if self.global_priority_list:
             df = pd.DataFrame(self.global_priority_list)
-            df.to_csv(filename, index=False)
+            self._write_frame(df, filename, format)
             print(f"Results exported to {filename}")
         else:
             print(f"[WARNING] No tasks to export to {filename}")
@@ -1937,15 +2763,26 @@ class ProductionScheduler:
             metrics_df.set_index('Product Line', inplace=True)
 
             if scenario_name:
-                metrics_filename = f'lateness_metrics_{scenario_name}.csv'
+                metrics_filename = f'lateness_metrics_{scenario_name}.{format}'
             else:
-                metrics_filename = 'lateness_metrics.csv'
+                metrics_filename = f'lateness_metrics.{format}'
 
-            metrics_df.to_csv(metrics_filename)
+            self._write_frame(metrics_df, metrics_filename, format, index=True)
             print(f"Lateness metrics exported to {metrics_filename}")
         else:
             print("[WARNING] No lateness metrics to export")
 
+    @staticmethod
+    def _write_frame(df, filename, format, index=False):
+        """Write a DataFrame as CSV, Parquet or Feather"""
+        if format == 'parquet':
+            df.to_parquet(filename, index=index)
+        elif format == 'feather':
+            # Feather stores columns only, so keep a meaningful index as a column
+            (df.reset_index() if index else df.reset_index(drop=True)).to_feather(filename)
+        else:
+            df.to_csv(filename, index=index)
+
     # ========== SCENARIO 1: Use CSV Headcount ==========
     def scenario_1_csv_headcount(self):
         """
@@ -1976,7 +2813,9 @@ class ProductionScheduler:
         print(f"Total Workforce: {total_mechanics + total_quality}")
 
         # Generate schedule with allow_late_delivery=True
+        self._report_progress('scheduling', 0.0)
         priority_list = self.generate_global_priority_list(allow_late_delivery=True)
+        self._report_progress('scheduling', 1.0, force=True)
 
         # Calculate metrics
         makespan = self.calculate_makespan()
@@ -2003,7 +2842,8 @@ class ProductionScheduler:
         print(f"\nTotal lateness across all products: {total_late_days} days")
 
         # Export results
-        self.export_results(scenario_name='scenario1_csv_capacity')
+        if self.auto_export:
+            self.export_results(scenario_name='scenario1_csv_capacity')
 
         return {
             'makespan': makespan,
@@ -2063,6 +2903,9 @@ class ProductionScheduler:
         uniform_level = min_mechanics
 
         while uniform_level <= max_mechanics and not phase1_complete:
+            self._report_progress('phase 1', 0.3 * (uniform_level - min_mechanics) / max(1, max_mechanics - min_mechanics),
+                                  f"Uniform capacity {uniform_level}")
+
             # Set uniform capacity
             for team in current_config['mechanic']:
                 current_config['mechanic'][team] = uniform_level
@@ -2078,6 +2921,7 @@ class ProductionScheduler:
                     'mechanic': current_config['mechanic'].copy(),
                     'quality': current_config['quality'].copy()
                 }
+                self._report_incumbent(best_config)
             else:
                 uniform_level += 1
 
@@ -2101,6 +2945,7 @@ class ProductionScheduler:
         while iteration < max_iterations and no_improvement_count < max_no_improvement:
             iteration += 1
             improved = False
+            self._report_progress('phase 2', 0.3 + 0.6 * iteration / max_iterations, f"Iteration {iteration}")
 
             # Apply current configuration and check metrics
             for team, capacity in current_config['mechanic'].items():
@@ -2175,6 +3020,7 @@ class ProductionScheduler:
                         best_deviation = max_deviation
                         best_metrics = metrics
                         improved = True
+                        self._report_incumbent(best_config, max_deviation=max_deviation)
 
                         print(f"  ✓ New best: {total_workforce} workers, max deviation {max_deviation:.1f} days")
 
@@ -2296,6 +3142,7 @@ class ProductionScheduler:
 
         # Phase 3: Final verification and results
         print("\nPhase 3: Final verification...")
+        self._report_progress('phase 3', 0.9)
 
         # Apply best configuration
         for team, capacity in best_config['mechanic'].items():
@@ -2377,7 +3224,8 @@ class ProductionScheduler:
         print(f"  Maximum deviation from target: {best_deviation:.1f} days")
 
         # Export results
-        self.export_results(scenario_name='scenario2_just_in_time_optimized')
+        if self.auto_export:
+            self.export_results(scenario_name='scenario2_just_in_time_optimized')
 
         # Restore original capacities
         for team, capacity in original_team.items():
@@ -2486,6 +3334,7 @@ class ProductionScheduler:
 
         while iteration < max_iterations and not phase1_complete:
             iteration += 1
+            self._report_progress('phase 1', 0.6 * iteration / max_iterations, f"Iteration {iteration}")
 
             # Apply current configuration
             for team, capacity in current_mech_config.items():
@@ -2569,6 +3418,7 @@ class ProductionScheduler:
                     best_total_workforce = total_workforce
                     best_metrics = metrics
                     iterations_without_improvement = 0
+                    self._report_incumbent(best_config, max_lateness=max_lateness, total_lateness=total_lateness)
 
                     if max_lateness == 0:
                         print(f"\n✓ Achieved zero lateness at iteration {iteration}!")
@@ -2661,6 +3511,8 @@ class ProductionScheduler:
         while improved and optimization_iterations < 50:
             improved = False
             optimization_iterations += 1
+            self._report_progress('phase 2', 0.6 + 0.3 * optimization_iterations / 50,
+                                  f"Optimization iteration {optimization_iterations}")
 
             # Calculate team utilization with current configuration
             for team, capacity in best_config['mechanic'].items():
@@ -2692,6 +3544,7 @@ class ProductionScheduler:
                         best_config = test_config
                         best_total_workforce -= 1
                         improved = True
+                        self._report_incumbent(best_config, max_lateness=target_max_lateness)
                         print(f"  Reduced {team} to {test_config['mechanic'][team]} "
                              f"(utilization was {util_data['utilization']:.1%})")
                         break  # One change at a time
@@ -2716,12 +3569,14 @@ class ProductionScheduler:
                                 best_config = test_config
                                 best_total_workforce -= 1
                                 improved = True
+                                self._report_incumbent(best_config, max_lateness=target_max_lateness)
                                 print(f"  Reduced {team} to {test_config['quality'][team]} "
                                      f"(utilization was {util_data['utilization']:.1%})")
                                 break
 
         # Phase 3: Final verification and results
         print("\nPhase 3: Final verification...")
+        self._report_progress('phase 3', 0.9)
 
         # Apply best configuration
         for team, capacity in best_config['mechanic'].items():
@@ -2809,7 +3664,8 @@ class ProductionScheduler:
                 print(f"  {product}: ✗ UNSCHEDULED")
 
         # Export results
-        self.export_results(scenario_name='scenario3_minimum_lateness_optimized')
+        if self.auto_export:
+            self.export_results(scenario_name='scenario3_minimum_lateness_optimized')
 
         # Restore original capacities
         for team, capacity in original_team.items():
@@ -2978,55 +3834,92 @@ class ProductionScheduler:
         except:
             return False
 
-    def simulate_priority_change(self, priority_product, priority_level='high', simulation_days=30):
+    def simulate_priority_change(self, priority_product, priority_level='high', simulation_days=30,
+                                 committed=None):
         """
-        Simulate the impact of prioritizing a specific product
+        Simulate the impact of prioritizing a specific product over a rolling horizon
+
+        Runs on copies of this scheduler, which is left untouched. Only the tasks
+        starting within simulation_days of the schedule start, and the tasks they
+        depend on, are rescheduled: once as they are and once with the product's
+        priority scores scaled by its PRIORITY_LEVELS multiplier.
 
         Args:
             priority_product: Product to prioritize
             priority_level: 'high', 'critical', or 'exclusive'
             simulation_days: Days to simulate
+            committed: Task id -> (start, end) of the schedule to start from
+                (default: the current task_schedule)
 
         Returns:
-            Dictionary with simulation results
+            Dictionary with the horizon and the task schedules before and after
         """
-        # Save current state
-        original_schedule = self.task_schedule.copy()
-        original_priorities = self.global_priority_list.copy()
-
-        # Adjust priorities for the selected product
-        priority_multipliers = {
-            'high': 0.5,      # Reduce priority score by 50% (lower is higher priority)
-            'critical': 0.25,  # Reduce by 75%
-            'exclusive': 0.1   # Reduce by 90%
-        }
-
-        multiplier = priority_multipliers.get(priority_level, 0.5)
-
-        # Re-calculate priorities with bias
-        for task in self.global_priority_list:
-            if task['product_line'] == priority_product:
-                task['priority_score'] *= multiplier
+        if priority_level not in PRIORITY_LEVELS:
+            raise ValueError(f"priority_level must be one of {', '.join(PRIORITY_LEVELS)}")
+        if committed is None:
+            committed = {task_id: (schedule['start_time'], schedule['end_time'])
+                         for task_id, schedule in self.task_schedule.items()}
+        if not committed:
+            raise ValueError("No schedule to simulate from")
+
+        horizon_start = min(start for start, _ in committed.values())
+        horizon_end = horizon_start + timedelta(days=simulation_days)
+        horizon = {task_id for task_id, (start, _) in committed.items()
+                   if start < horizon_end and task_id in self.tasks}
+
+        # Keep everything the horizon's tasks depend on
+        predecessors = defaultdict(list)
+        for constraint in self.build_dynamic_dependencies():
+            predecessors[constraint['Second']].append(constraint['First'])
+        stack = list(horizon)
+        while stack:
+            for predecessor in predecessors.get(stack.pop(), ()):
+                if predecessor in self.tasks and predecessor not in horizon:
+                    horizon.add(predecessor)
+                    stack.append(predecessor)
+
+        def reschedule(bias):
+            worker = self.clone()
+            worker.auto_export = False
+            worker.tasks = {task_id: self.tasks[task_id] for task_id in horizon}
+            worker.priority_bias = bias
+            worker.schedule_tasks(allow_late_delivery=True, silent_mode=True)
+            return worker.task_schedule
 
-        # Re-sort by new priorities
-        self.global_priority_list.sort(key=lambda x: x['priority_score'])
+        return {
+            'prioritized_product': priority_product,
+            'priority_level': priority_level,
+            'horizon_start': horizon_start,
+            'horizon_end': horizon_end,
+            'task_count': len(horizon),
+            'before': reschedule({}),
+            'after': reschedule({priority_product: PRIORITY_LEVELS[priority_level]})
+        }
 
-        # Re-schedule with new priorities
-        self.schedule_tasks(allow_late_delivery=True, silent_mode=True)
 
-        # Calculate impacts
-        new_metrics = self.calculate_lateness_metrics()
+def _compile_site(site, path, late_part_delay_days, snapshot_dir):
+    """
+    Worker for multi-site loading: compile one site's input and return its model.
 
-        # Restore original state
-        self.task_schedule = original_schedule
-        self.global_priority_list = original_priorities
+    Runs in a separate process, so it only takes and returns picklable values.
 
-        # Return comparison
-        return {
-            'prioritized_product': priority_product,
-            'new_metrics': new_metrics,
-            'priority_level': priority_level
-        }
+    Returns:
+        Tuple of (site, model attributes, timing)
+    """
+    started = time.perf_counter()
+    scheduler = ProductionScheduler(path, late_part_delay_days=late_part_delay_days,
+                                    snapshot_dir=snapshot_dir, site=site)
+    scheduler.load_data_from_csv()
+    # The graph is per-site, so build it here in parallel with the other sites
+    scheduler.build_dynamic_dependencies()
+
+    model = {name: getattr(scheduler, name) for name in ProductionScheduler.MODEL_ATTRIBUTES}
+    timing = {
+        'source': str(path),
+        'seconds': time.perf_counter() - started,
+        'task_count': len(scheduler.tasks),
+    }
+    return site, model, timing
 
 
 # Update the main execution section in scheduler.py (around line 2680)
@@ -3146,4 +4039,4 @@ if __name__ == "__main__":
         print("!" * 80)
         import traceback
 
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
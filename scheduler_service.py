@@ -1,9 +1,16 @@
 """
 Scheduler Service - Real version using scheduler.py
 """
+import bisect
+import json
 import logging
-from typing import Dict, List
-from datetime import datetime
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta
 from pathlib import Path
 import sys
 
@@ -11,10 +18,181 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 # Import the real scheduler
-from scheduler import ProductionScheduler
+from scheduler import PRIORITY_LEVELS, ProductionScheduler, SchedulingCancelled, worker_pool_context
+import config
+import numpy as np
+from backend.services.schedule_store import ScheduleStore
+from backend.services.scenario_cache import PublishedSchedule, ScenarioCache
+from backend.services.scenario_results import ScenarioResultStore
+from backend.services.payloads import EncodedPayload
+from backend.services.schedule_index import (INDEXED_FIELDS, TASK_STATUSES, decode_cursor, diff_tasks,
+                                              encode_cursor)
+from backend.services.assignment_store import AssignmentStore
+from backend.services.schedule_export import EXPORT_FORMATS, stream_columnar, stream_csv
+from backend.services.late_part_impact import (ALL_RELAXED_RUN, CONTROL_RUN, InputChanged,
+                                               run_counterfactuals_parallel, screen_late_parts)
+from backend.services.assignment_engine import (CRITICAL_SLACK_HOURS, DEFAULT_SHIFT_HOURS, generate_assignments,
+                                                shift_window)
+from backend.services.job_manager import Job, JobManager
+from backend.services.progress_broker import ProgressBroker
 
 logger = logging.getLogger(__name__)
 
+SCENARIOS = ('baseline', 'scenario1', 'scenario2', 'scenario3')
+
+# Parameters accepted by each scenario engine
+SCENARIO_PARAMETERS = {
+    'baseline': {},
+    'scenario1': {},
+    'scenario2': {'min_mechanics': int, 'max_mechanics': int, 'min_quality': int, 'max_quality': int,
+                  'target_lateness': float, 'tolerance': float, 'max_iterations': int},
+    'scenario3': {'min_mechanics': int, 'max_mechanics': int, 'min_quality': int, 'max_quality': int,
+                  'max_iterations': int},
+}
+
+
+def validate_scenario_parameters(scenario_id: str, parameters: Optional[Dict]) -> Dict:
+    """Check a scenario id and coerce its parameters; raises ValueError on bad input"""
+    if scenario_id not in SCENARIO_PARAMETERS:
+        raise ValueError(f"Unknown scenario: {scenario_id}")
+    allowed = SCENARIO_PARAMETERS[scenario_id]
+    parameters = parameters or {}
+
+    unknown = sorted(set(parameters) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown parameters for {scenario_id}: {', '.join(unknown)}")
+
+    coerced = {}
+    for name, value in parameters.items():
+        try:
+            coerced[name] = allowed[name](value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Parameter {name} must be a number")
+    return coerced
+
+
+class ScenarioInfeasible(RuntimeError):
+    """Raised when an optimizer finds no configuration meeting its targets"""
+
+
+class UnknownTeamError(LookupError):
+    """Raised when a request names a team that isn't part of the model"""
+
+
+class UnknownProductError(LookupError):
+    """Raised when a request names a product line that isn't part of the model"""
+
+
+class ScenarioPending(Exception):
+    """Raised when a scenario has no schedule yet and is being generated by a background job"""
+
+    def __init__(self, scenario_id: str, job):
+        super().__init__(f"{scenario_id} is being generated in the background")
+        self.scenario_id = scenario_id
+        self.job = job
+
+
+def run_scenario_engine(scheduler, scenario_id: str, parameters: Optional[Dict] = None) -> Dict:
+    """
+    Run the engine of a scenario on a scheduler.
+
+    The optimizers change capacities and scheduling state, so pass a clone of any
+    shared scheduler (see run_scenario).
+
+    Returns:
+        The engine's result dict, always including 'priority_list'
+    """
+    parameters = parameters or {}
+    if scenario_id == 'scenario1':
+        result = scheduler.scenario_1_csv_headcount()
+    elif scenario_id == 'scenario2':
+        result = scheduler.scenario_2_just_in_time_optimization(**parameters)
+    elif scenario_id == 'scenario3':
+        result = scheduler.scenario_3_multidimensional_optimization(**parameters)
+    elif scenario_id == 'baseline':
+        scheduler.task_schedule = {}
+        scheduler._critical_path_cache = {}
+        priority_list = scheduler.generate_global_priority_list(allow_late_delivery=True, silent_mode=True)
+        result = {
+            'makespan': scheduler.calculate_makespan(),
+            'metrics': scheduler.calculate_lateness_metrics(),
+            'priority_list': priority_list
+        }
+    else:
+        raise ValueError(f"Unknown scenario: {scenario_id}")
+
+    if result is None:
+        raise ScenarioInfeasible(f"{scenario_id} found no feasible configuration")
+    return result
+
+
+def json_safe(value: Any) -> Any:
+    """Convert engine results (datetimes, numpy numbers, infinities) to JSON-serializable values"""
+    if isinstance(value, dict):
+        return {str(key): json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    return value
+
+
+def run_scenario(scheduler, scenario_id: str, parameters: Optional[Dict] = None,
+                 progress_callback=None, cancel_event: Optional[threading.Event] = None) -> Dict:
+    """
+    Run a scenario's engine on a private copy of a loaded scheduler.
+
+    An optimizer that finds no feasible configuration gives an empty schedule
+    flagged 'infeasible', so the outcome can be stored like any other result.
+    """
+    worker = scheduler.clone()
+    worker.auto_export = False
+    worker.progress_callback = progress_callback
+    worker.cancel_event = cancel_event
+    worker.progress_interval = config.PROGRESS_CONFIG.get('interval', worker.progress_interval)
+    try:
+        return run_scenario_engine(worker, scenario_id, parameters)
+    except ScenarioInfeasible as e:
+        logger.warning(str(e))
+        return {'infeasible': True, 'error': str(e), 'priority_list': []}
+
+
+def scenario_parameters(scenario_id: str) -> Dict:
+    """Engine parameters configured for a scenario (SCHEDULER_CONFIG['scenario_parameters'])"""
+    configured = config.SCHEDULER_CONFIG.get('scenario_parameters') or {}
+    return validate_scenario_parameters(scenario_id, configured.get(scenario_id))
+
+
+def _warm_scenario(source, late_part_delay_days: float, snapshot_dir, result_dir, key: tuple):
+    """
+    Warm-up worker: load the model (normally from its snapshot) and produce one scenario result.
+
+    Runs in a separate process. A result already stored for the key is returned
+    as is; otherwise the engine runs and its result is stored. Returns None if the
+    input no longer matches the fingerprint of the model being served.
+    """
+    started = time.perf_counter()
+    scenario_id, fingerprint, parameters = key[0], key[2], dict(key[3])
+    scheduler = ProductionScheduler(source, debug=False, late_part_delay_days=late_part_delay_days,
+                                    snapshot_dir=snapshot_dir, max_workers=1)
+    scheduler.load_data_from_csv()
+    if scheduler.data_fingerprint != fingerprint:
+        return None
+
+    results = ScenarioResultStore(result_dir) if result_dir else None
+    stem = scheduler._snapshot_stem()
+    result = results.load(stem, key) if results else None
+    if result is None:
+        result = run_scenario(scheduler, scenario_id, parameters)
+        if results:
+            results.save(stem, key, result)
+    return result, time.perf_counter() - started
+
+
 class SchedulerService:
     """Real scheduler service using ProductionScheduler"""
 
@@ -24,6 +202,62 @@ class SchedulerService:
         self.scheduler = None
         self.initialized = False
 
+        # Hot reload of the input file
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._watcher_stop = threading.Event()
+        self._source_signature = None
+
+        # Optional SQLite persistence (STORE_CONFIG)
+        self.store = None
+
+        # Task -> mechanic assignments (opened on first use)
+        self._assignments = None
+        self._assignments_lock = threading.Lock()
+
+        # Engine results per data version, kept across restarts
+        result_dir = config.SCHEDULER_CONFIG.get('result_dir')
+        self.results = ScenarioResultStore(result_dir) if result_dir else None
+
+        # Generated scenarios by (scenario, capacity configuration, data fingerprint)
+        self.cache = ScenarioCache(ttl=config.API_CONFIG.get('cache_ttl'))
+
+        # Latest published schedule per scenario. Readers take it without locking; a
+        # publisher replaces the whole dict (never modifies it) under _writer_lock.
+        # Engines run on clones of the shared ProductionScheduler, outside the lock.
+        self._published: Dict[str, PublishedSchedule] = {}
+        self._writer_lock = threading.Lock()
+        self._version = 0
+
+        # Recent versions per scenario (replaced like _published) and the deltas between them
+        self._history: Dict[str, tuple] = {}
+        self.deltas = ScenarioCache(max_entries=config.API_CONFIG.get('delta_cache_size', 64))
+
+        # Late part impact analyses per published version
+        self.late_part_impacts = ScenarioCache(max_entries=config.LATE_PART_CONFIG.get('cache_size', 16))
+
+        # Priority simulations per published version, product, level and horizon
+        self.simulations = ScenarioCache(max_entries=config.SIMULATION_CONFIG.get('cache_size', 128))
+
+        # Progress events of scenario runs and jobs, streamed to browsers
+        self.progress = ProgressBroker(max_queued=config.PROGRESS_CONFIG.get('max_queued', 256),
+                                       heartbeat=config.PROGRESS_CONFIG.get('heartbeat', 15))
+
+        # Background scenario runs (optimizers) submitted through the job API, and the
+        # job generating each cache key that requests are waiting for
+        self.jobs = JobManager(**config.JOB_CONFIG, broker=self.progress)
+        self._generating: Dict[tuple, Job] = {}
+        self._generating_lock = threading.Lock()
+
+        # Background precompute of the scenarios at startup and after each reload.
+        # _warmup_next holds a run requested while another one was going.
+        self._warmup_thread = None
+        self._warmup_lock = threading.Lock()
+        self._warmup = {'state': 'idle', 'scenarios': {}, 'started_at': None, 'finished_at': None}
+        self._warmup_fingerprint = None
+        self._warmup_next = None
+        self._warmed_up = False
+
     @classmethod
     def get_instance(cls):
         """Get singleton instance"""
@@ -38,36 +272,1098 @@ class SchedulerService:
         if not instance.initialized:
             logger.info("Initializing scheduler service...")
             try:
-                instance.scheduler = ProductionScheduler('scheduling_data.csv', debug=False)
+                instance.scheduler = ProductionScheduler(
+                    config.SCHEDULER_CONFIG['csv_file'],
+                    debug=False,
+                    late_part_delay_days=config.SCHEDULER_CONFIG['late_part_delay_days'],
+                    snapshot_dir=config.SCHEDULER_CONFIG.get('snapshot_dir'),
+                    max_workers=config.SCHEDULER_CONFIG.get('load_workers')
+                )
                 instance.scheduler.load_data_from_csv()
+                instance._source_signature = instance._read_source_signature()
                 instance.initialized = True
                 logger.info("Scheduler service initialized with real data")
+
+                if config.STORE_CONFIG.get('enabled'):
+                    instance.store = ScheduleStore(config.STORE_CONFIG['db_path'])
+                    instance._persist_model(instance.scheduler)
             except Exception as e:
                 logger.error(f"Failed to initialize scheduler: {e}")
                 instance.initialized = False
 
-    def get_scenario_data(self, scenario_id: str) -> List[Dict]:
-        """Get fresh scheduling data for a scenario"""
-        if not self.initialized or not self.scheduler:
+    def _read_source_signature(self):
+        """Cheap change detector for the input (modification time and size of each file)"""
+        try:
+            return tuple((str(path), stat.st_mtime_ns, stat.st_size)
+                         for path, stat in ((path, os.stat(path)) for path in self.scheduler.source_files()))
+        except OSError:
+            return None
+
+    def reload_data(self) -> Set[str]:
+        """
+        Reload the input file if it changed and swap the new model in.
+
+        Only the sections that changed are rebuilt (see ProductionScheduler.reload_from_csv).
+        The new scheduler replaces the old one with a single reference assignment, so
+        requests already running keep a consistent model. The published scenarios are
+        then regenerated for it (see _refresh_after_reload).
+
+        Returns:
+            Names of the sections that changed
+        """
+        if not self.initialized:
+            return set()
+
+        with self._reload_lock:
+            current = self.scheduler
+            signature = self._read_source_signature()
+            try:
+                reloaded, changed = current.reload_from_csv()
+            except Exception as e:
+                logger.error(f"Failed to reload scheduling data, keeping current model: {e}")
+                return set()
+
+            self._source_signature = signature
+            if reloaded is not current:
+                self.scheduler = reloaded
+                logger.info(f"Reloaded scheduling data; changed sections: {sorted(changed)}")
+                self._persist_model(reloaded)
+                self._refresh_after_reload(reloaded)
+            return changed
+
+    def _refresh_after_reload(self, scheduler):
+        """
+        Regenerate the scenarios for a reloaded model, off the request path.
+
+        Every schedule depends on all input sections (through the data fingerprint in
+        its cache key), so any changed section affects every scenario. Generations of
+        the old model are dropped from the result cache. Caches per published version
+        (deltas, late part impacts, simulations) stay valid and are kept, and so are
+        the published versions, which are served as stale until they are replaced.
+
+        The inline scenarios are republished here. The optimizers that were published
+        or are to be warmed up go to the warm-up's worker processes, or else to
+        background jobs.
+        """
+        self.cache.invalidate()
+        inline = config.SCHEDULER_CONFIG.get('inline_scenarios', ('baseline', 'scenario1'))
+        warmup = config.SCHEDULER_CONFIG.get('warmup_scenarios') or []
+        optimizers = [scenario_id for scenario_id in warmup if scenario_id not in inline]
+        if optimizers:
+            self.start_warmup(optimizers)
+
+        for scenario_id in SCENARIOS:
+            if scenario_id not in self._published and scenario_id not in warmup:
+                continue
+            try:
+                key = self._cache_key(scenario_id, scheduler)
+                if scenario_id in inline:
+                    self._generate(scenario_id, scheduler, key)
+                elif scenario_id not in optimizers:
+                    self.generate_in_background(scenario_id, scheduler, key)
+            except Exception as e:
+                logger.warning(f"Could not regenerate {scenario_id} after the reload: {e}")
+
+    def _persist_model(self, scheduler):
+        """Write the compiled model to the store, if one is configured"""
+        if not self.store:
+            return
+        try:
+            self.store.save_model(scheduler)
+        except Exception as e:
+            logger.warning(f"Could not store model: {e}")
+
+    def _persist_schedule(self, scenario_id: str, scheduler, priority_list: List[Dict],
+                          parameters: Optional[Dict] = None, summary: Optional[Dict] = None):
+        """Write a generated schedule to the store as a new version, if one is configured"""
+        if not self.store:
+            return None
+        try:
+            return self.store.save_schedule(scenario_id, scheduler.data_fingerprint, priority_list, parameters,
+                                            summary)
+        except Exception as e:
+            logger.warning(f"Could not store schedule for {scenario_id}: {e}")
+            return None
+
+    def _stored_version(self, scenario_id: str, scheduler, key: tuple) -> Optional[Dict]:
+        """Latest version in the store generated from this data version and these engine parameters"""
+        if not self.store:
+            return None
+        try:
+            version = self.store.latest_version(scenario_id, scheduler.data_fingerprint, dict(key[3]))
+        except Exception as e:
+            logger.warning(f"Could not read stored versions of {scenario_id}: {e}")
+            return None
+        # Versions stored without their summary can't be published again
+        return version if version and version.get('summary') is not None else None
+
+    def _stored_schedule(self, scenario_id: str, scheduler, key: tuple) -> Optional[Dict]:
+        """Engine result rebuilt from the store's latest version for a key, or None"""
+        version = self._stored_version(scenario_id, scheduler, key)
+        if version is None:
+            return None
+        try:
+            priority_list = self.store.load_priority_list(version['version_id'])
+        except Exception as e:
+            logger.warning(f"Could not read stored schedule {version['version_id']}: {e}")
+            return None
+        return {**json.loads(version['summary']), 'priority_list': priority_list,
+                'stored_version': version['version_id']}
+
+    def list_versions(self, scenario_id: str, limit: int = 50) -> Optional[List[Dict]]:
+        """
+        Schedule versions of a scenario in the store, newest first (None without a store).
+
+        Raises:
+            ValueError: unknown scenario
+        """
+        validate_scenario_parameters(scenario_id, None)
+        if not self.store:
+            return None
+        versions = self.store.list_versions(scenario_id, limit)
+        for version in versions:
+            version['parameters'] = json.loads(version['parameters'] or '{}')
+            version['summary'] = json.loads(version['summary']) if version['summary'] else None
+        return versions
+
+    def start_file_watcher(self, interval: Optional[float] = None):
+        """Poll the input file in a background thread and hot-reload it when it changes"""
+        if self._watcher and self._watcher.is_alive():
+            return
+
+        if interval is None:
+            interval = config.SCHEDULER_CONFIG.get('reload_interval', 0.5)
+
+        def watch():
+            while not self._watcher_stop.wait(interval):
+                if self.initialized and self._read_source_signature() != self._source_signature:
+                    self.reload_data()
+
+        self._watcher_stop.clear()
+        self._watcher = threading.Thread(target=watch, name='scheduling-data-watcher', daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching {self.scheduler.csv_path} for changes every {interval}s")
+
+    def stop_file_watcher(self):
+        """Stop the background file watcher"""
+        self._watcher_stop.set()
+
+    @staticmethod
+    def _cache_key(scenario_id: str, scheduler) -> tuple:
+        """Cache key: scenario, configured team capacities, the input data version and engine parameters"""
+        # The configured capacities, not team_capacity, which the engines change while they run
+        capacities = tuple(sorted(scheduler._original_team_capacity.items())) + \
+            tuple(sorted(scheduler._original_quality_capacity.items()))
+        parameters = tuple(sorted(scenario_parameters(scenario_id).items()))
+        return scenario_id, capacities, scheduler.data_fingerprint, parameters
+
+    def get_published(self, scenario_id: str) -> Optional[PublishedSchedule]:
+        """
+        Current published schedule of a scenario, generating it if needed.
+
+        The latest version is read without any lock. Otherwise the result cache
+        (per scenario, capacity configuration and data version, API_CONFIG['cache_ttl']
+        seconds) is consulted, and concurrent requests share one generation.
+
+        Only SCHEDULER_CONFIG['inline_scenarios'], and scenarios with an engine result
+        stored for this data version, are generated on the request path. The
+        optimizers take minutes: they are generated by a background job while the
+        previous version is served (see is_stale).
+
+        Raises:
+            ScenarioPending: an optimizer with no version to serve yet
+        """
+        # Take one reference so a hot reload mid-request can't mix two models
+        scheduler = self.scheduler
+        if not self.initialized or not scheduler:
             print(f"[WARNING] Scheduler not initialized")
-            return []
+            return None
+
+        key = self._cache_key(scenario_id, scheduler)
+        published = self._published.get(scenario_id)
+        if published is not None and published.key == key and not self.cache.expired(published.published_at):
+            return published
+
+        if self._generates_inline(scenario_id, scheduler, key):
+            return self._generate(scenario_id, scheduler, key)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        job = self.generate_in_background(scenario_id, scheduler, key)
+        if published is None:
+            raise ScenarioPending(scenario_id, job)
+        return published
+
+    def _generates_inline(self, scenario_id: str, scheduler, key: tuple) -> bool:
+        """Whether a request may generate a scenario itself: a quick engine, or a stored engine result"""
+        if scenario_id in config.SCHEDULER_CONFIG.get('inline_scenarios', ('baseline', 'scenario1')):
+            return True
+        if self.results and self.results.path(scheduler._snapshot_stem(), key).exists():
+            return True
+        return self._stored_version(scenario_id, scheduler, key) is not None
+
+    def _generate(self, scenario_id: str, scheduler, key: tuple) -> PublishedSchedule:
+        """Generate and publish a scenario in this thread, sharing the work with concurrent callers"""
+        return self.cache.get_or_compute(key, lambda: self._publish(scenario_id, scheduler, key))
+
+    def generate_in_background(self, scenario_id: str, scheduler, key: tuple) -> Job:
+        """
+        Generate and publish a scenario as a background job; one job per cache key at a time.
+
+        A warm-up that is still to publish the scenario is waited for rather than
+        running the engine a second time.
+
+        Raises:
+            JobQueueFull: too many jobs are waiting
+        """
+        def target(job: Job):
+            while self._warming(scenario_id):
+                if job.cancel_event.wait(1):
+                    raise SchedulingCancelled(f"{scenario_id} generation cancelled")
+            published = self.cache.get(key)
+            if published is None:
+                result = self._scenario_result(scenario_id, scheduler, key, job)
+                published = self.cache.get_or_compute(
+                    key, lambda: self._publish(scenario_id, scheduler, key, result))
+            return {'scenario_id': scenario_id, 'version': published.version, 'task_count': len(published.tasks)}
+
+        with self._generating_lock:
+            job = self._generating.get(key)
+            if job is not None and not job.finished:
+                return job
+            job = self.jobs.submit(scenario_id, target, dict(key[3]))
+            self._generating = {other: running for other, running in self._generating.items()
+                                if not running.finished}
+            self._generating[key] = job
+            return job
+
+    def _warming(self, scenario_id: str) -> bool:
+        """Whether the running warm-up is still to publish a scenario"""
+        with self._warmup_lock:
+            item = self._warmup['scenarios'].get(scenario_id)
+            return self._warmup_thread is not None and item is not None and item['state'] in ('pending', 'running')
+
+    def is_stale(self, published: PublishedSchedule) -> bool:
+        """Whether a published schedule is a previous version, served while the current one is generated"""
+        scheduler = self.scheduler
+        return scheduler is not None and published.key != self._cache_key(published.key[0], scheduler)
+
+    def get_cached(self, scenario_id: str) -> Optional[PublishedSchedule]:
+        """Published schedule of a scenario if one is current, without generating it"""
+        scheduler = self.scheduler
+        if not self.initialized or not scheduler:
+            return None
+        key = self._cache_key(scenario_id, scheduler)
+        published = self._published.get(scenario_id)
+        if published is not None and published.key == key and not self.cache.expired(published.published_at):
+            return published
+        return self.cache.get(key)
+
+    def get_scenario_data(self, scenario_id: str) -> List[Dict]:
+        """Get scheduling data for a scenario in Gantt format"""
+        published = self.get_published(scenario_id)
+        return list(published.tasks) if published else []
+
+    def query_scenario(self, scenario_id: str, filters: Optional[Dict[str, List[str]]] = None,
+                       start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                       cursor: Optional[str] = None) -> Optional[Dict]:
+        """
+        Filtered, paginated view of a scenario's Gantt tasks.
+
+        Args:
+            filters: team / product / task_type / shift -> accepted values
+            start/end: Only tasks overlapping the [start, end) window
+            fields: Task fields to return (default: all)
+            limit: Page size (API_CONFIG['page_size'], at most API_CONFIG['max_page_size'])
+            cursor: next_cursor of the previous page
+
+        Raises:
+            ValueError: unknown filter or field, bad cursor, or a cursor of an older version
+        """
+        filters = {name: values for name, values in (filters or {}).items() if values}
+        unknown = sorted(set(filters) - set(INDEXED_FIELDS))
+        if unknown:
+            raise ValueError(f"Unknown filters: {', '.join(unknown)}")
+
+        max_page_size = config.API_CONFIG.get('max_page_size', 5000)
+        if limit is None:
+            limit = config.API_CONFIG.get('page_size', 500)
+        limit = min(limit, max_page_size)
+        if limit < 1:
+            raise ValueError("limit must be positive")
+
+        published = self.get_published(scenario_id)
+        if published is None:
+            return None
+
+        after = -1
+        if cursor:
+            version, after = decode_cursor(cursor)
+            if version != published.version:
+                raise ValueError(f"Cursor belongs to schedule version {version}; "
+                                 f"the current version is {published.version}")
+
+        positions = published.index.select(filters, start, end)
+        page_start = bisect.bisect_right(positions, after)
+        page = positions[page_start:page_start + limit]
+        more = page_start + limit < len(positions)
+
+        tasks = [published.tasks[position] for position in page]
+        if fields:
+            available = set(published.tasks[0]) if published.tasks else set(fields)
+            unknown = sorted(set(fields) - available)
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+            tasks = [{field: task[field] for field in fields} for task in tasks]
+
+        return {
+            'version': published.version,
+            'total': len(positions),
+            'count': len(tasks),
+            'data': tasks,
+            'next_cursor': encode_cursor(published.version, page[-1]) if more else None
+        }
+
+    def get_team_tasks(self, scenario_id: str, team: str, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None, shifts: Optional[List[str]] = None,
+                       status: Optional[str] = None, as_of: Optional[datetime] = None,
+                       limit: Optional[int] = None) -> Optional[Dict]:
+        """
+        A team's tasks in a scenario, in start order, from the published team index.
+
+        Args:
+            start/end: Only tasks overlapping the [start, end) window
+            shifts: Only tasks of these shifts
+            status: upcoming / in_progress / completed at as_of (default: now)
+            limit: At most this many tasks
+
+        Raises:
+            ValueError: unknown status
+            UnknownTeamError: the team isn't part of the model
+        """
+        if status is not None and status not in TASK_STATUSES:
+            raise ValueError(f"status must be one of {', '.join(TASK_STATUSES)}")
+
+        published = self.get_published(scenario_id)
+        if published is None:
+            return None
+        scheduler = self.scheduler
+        if team not in scheduler._original_team_capacity and team not in scheduler._original_quality_capacity:
+            raise UnknownTeamError(team)
+
+        as_of = as_of or datetime.now()
+        index = published.index
+        positions = index.team_tasks(team, start, end, shifts, status, as_of)
+        total = len(positions)
+        if limit is not None:
+            positions = positions[:max(limit, 0)]
+
+        tasks = [{**published.tasks[position], 'status': index.status(position, as_of)} for position in positions]
+        return {
+            'team': team,
+            'scenario': scenario_id,
+            'version': published.version,
+            'as_of': as_of.isoformat(),
+            'total': total,
+            'count': len(tasks),
+            'data': tasks
+        }
+
+    def get_product_tasks(self, scenario_id: str, product: str, start: Optional[datetime] = None,
+                          end: Optional[datetime] = None, limit: Optional[int] = None) -> Optional[Dict]:
+        """
+        A product's view of a scenario from the published product index: completion,
+        lateness, task type breakdown, critical chain and its tasks in start order.
+
+        Args:
+            start/end: Only tasks overlapping the [start, end) window
+            limit: At most this many tasks
+
+        Raises:
+            UnknownProductError: the product isn't part of the model
+        """
+        published = self.get_published(scenario_id)
+        if published is None:
+            return None
+        scheduler = self.scheduler
+        index = published.index
+        if product not in scheduler.delivery_dates and product not in index.product_runs:
+            raise UnknownProductError(product)
 
-        print(f"[DEBUG] Generating fresh schedule for {scenario_id}")
+        delivery = scheduler.delivery_dates.get(product)
+        completion = index.completion.get(product)
+        lateness = (completion - delivery).days if completion and delivery else None
+        chain = index.critical_chains.get(product, ())
+        critical = set(chain)
 
-        # Generate fresh schedule each time
-        self.scheduler.task_schedule = {}
-        self.scheduler._critical_path_cache = {}
+        positions = index.product_tasks(product, start, end)
+        total = len(positions)
+        if limit is not None:
+            positions = positions[:max(limit, 0)]
 
-        # Generate schedule based on scenario
-        if scenario_id == 'baseline':
-            priority_list = self.scheduler.generate_global_priority_list(allow_late_delivery=True, silent_mode=True)
+        tasks = [{**published.tasks[position], 'critical': position in critical} for position in positions]
+        return {
+            'product': product,
+            'scenario': scenario_id,
+            'version': published.version,
+            'deliveryDate': delivery.isoformat() if delivery else None,
+            'completionDate': completion.isoformat() if completion else None,
+            'latenessDays': lateness,
+            'onTime': lateness is not None and lateness <= 0,
+            'totalTasks': len(index.by_field['product'].get(product, ())),
+            'taskBreakdown': index.breakdown.get(product, {}),
+            'criticalTasks': len(chain),
+            'criticalChain': [published.tasks[position]['taskId'] for position in chain],
+            'total': total,
+            'count': len(tasks),
+            'data': tasks
+        }
+
+    def export_schedule(self, scenario_id: str, format: str = 'csv') -> Optional[Tuple[str, str, Any]]:
+        """
+        Stream a scenario's published priority list as a file.
+
+        Rows are encoded chunk by chunk from the published (immutable) list, so a
+        download starts at once and the file is never held in memory.
+
+        Returns:
+            (file name, media type, iterator of byte chunks)
+
+        Raises:
+            ValueError: unknown format
+            ImportError: a columnar format without pyarrow installed
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+        if format != 'csv':
+            ProductionScheduler._require_pyarrow()
+
+        published = self.get_published(scenario_id)
+        if published is None:
+            return None
+
+        suffix, media_type = EXPORT_FORMATS[format]
+        filename = f"scheduling_results_{scenario_id}_v{published.version}.{suffix}"
+        if format == 'csv':
+            chunks = stream_csv(published.priority_list)
+        else:
+            chunks = stream_columnar(published.priority_list, format)
+        return filename, media_type, chunks
+
+    def generate_team_assignments(self, scenario_id: str, team: str, mechanics: List[str], day: date,
+                                  mechanic_shifts: Optional[Dict[str, str]] = None) -> Optional[Dict]:
+        """
+        Assign the mechanics present to a team's tasks starting in its shifts on a day.
+
+        Tasks come from the published team index and their headcount and slack from
+        the aligned priority list, so a rerun (e.g. when attendance changes) costs a
+        few index lookups and one sweep of the assignment engine.
+
+        Args:
+            mechanics: Names of the mechanics present
+            mechanic_shifts: Optional mechanic -> shift; the others are split across
+                the team's shifts by demand
+
+        Raises:
+            ValueError: no mechanics given
+            UnknownTeamError: the team isn't part of the model
+        """
+        mechanics = list(dict.fromkeys(name for name in mechanics if name))
+        if not mechanics:
+            raise ValueError("presentMechanics must list at least one mechanic")
+
+        published = self.get_published(scenario_id)
+        if published is None:
+            return None
+        scheduler = self.scheduler
+        if team not in scheduler._original_team_capacity and team not in scheduler._original_quality_capacity:
+            raise UnknownTeamError(team)
+
+        index = published.index
+        # Tasks go to the shift they start in. The engines' shift labels aren't reliable
+        # for quality teams, so a team can have work outside its configured shifts.
+        team_shifts = scheduler.team_shifts.get(team) or scheduler.quality_team_shifts.get(team) or []
+        hours = {**DEFAULT_SHIFT_HOURS, **scheduler.shift_hours}
+        windows = {}
+        tasks_by_shift = {}
+        for shift in list(team_shifts) + [shift for shift in hours if shift not in team_shifts]:
+            start, end = shift_window(day, hours[shift])
+            tasks = []
+            for position in index.team_tasks(team, start, end):
+                # Tasks carried over from the previous shift belong to that shift's crew
+                if index.starts[position] < start:
+                    continue
+                entry = published.priority_list[position]
+                slack = entry.get('slack_hours')
+                tasks.append({
+                    'taskId': entry['task_id'],
+                    'displayName': entry['display_name'],
+                    'product': entry['product_line'],
+                    'taskType': entry['task_type'],
+                    'start': index.starts[position],
+                    'end': index.ends[position],
+                    'duration': entry['duration_minutes'],
+                    'mechanics_required': entry['mechanics_required'],
+                    'shift': shift,
+                    'isCritical': slack is not None and slack < CRITICAL_SLACK_HOURS,
+                    'isLatePartTask': entry['task_type'] == 'Late Part'
+                })
+            if shift in team_shifts or tasks:
+                windows[shift] = (start, end)
+                tasks_by_shift[shift] = tasks
+
+        result = generate_assignments(tasks_by_shift, windows, mechanics, mechanic_shifts)
+
+        def describe(task: Dict) -> Dict:
+            described = {name: value for name, value in task.items()
+                         if name not in ('start', 'end', 'mechanics_required')}
+            described['mechanicsRequired'] = task['mechanics_required']
+            described['startTime'] = task['start'].isoformat()
+            described['endTime'] = task['end'].isoformat()
+            return described
+
+        for record in result['mechanicAssignments'].values():
+            record['tasks'] = [describe(task) for task in record['tasks']]
+        result['unassignedTasks'] = [describe(task) for task in result['unassignedTasks']]
+
+        warnings = []
+        stats = result['teamStats']
+        unassigned = result['unassignedTasks']
+        if unassigned:
+            critical = sum(1 for task in unassigned if task['isCritical'])
+            warnings.append({'level': 'critical' if critical else 'warning',
+                             'message': f"{len(unassigned)} task(s) could not be staffed"
+                                        + (f", {critical} of them critical" if critical else '')})
+        if stats['totalOvertimeMinutes']:
+            warnings.append({'level': 'warning',
+                             'message': f"{stats['totalOvertimeMinutes']} overtime minutes past shift end"})
+        outside = sum(len(tasks) for shift, tasks in tasks_by_shift.items() if shift not in team_shifts)
+        if outside:
+            warnings.append({'level': 'warning',
+                             'message': f"{outside} task(s) start outside {team}'s shifts "
+                                        f"({', '.join(team_shifts) or 'none configured'})"})
+        idle = [name for name, record in result['mechanicAssignments'].items() if not record['tasks']]
+        if idle and stats['totalTasks']:
+            warnings.append({'level': 'info', 'message': f"{len(idle)} mechanic(s) without assigned tasks"})
+
+        next_work_date = None
+        if not stats['totalTasks']:
+            # Point the caller at the team's next day with work
+            run = index.team_runs.get((team, None))
+            day_end = datetime.combine(day + timedelta(days=1), datetime.min.time())
+            if run is not None:
+                following = bisect.bisect_left(run.starts, day_end)
+                if following < len(run.starts):
+                    next_work_date = run.starts[following].date().isoformat()
+            warnings.append({'level': 'info', 'message': f"No {team} tasks start on {day.isoformat()}"})
+
+        return {
+            'team': team,
+            'scenario': scenario_id,
+            'version': published.version,
+            'date': day.isoformat(),
+            'shifts': {shift: {'start': start.isoformat(), 'end': end.isoformat(),
+                               'mechanics': result['crews'][shift]}
+                       for shift, (start, end) in windows.items()},
+            'teamStats': stats,
+            'mechanicAssignments': result['mechanicAssignments'],
+            'unassignedTasks': unassigned,
+            'warnings': warnings,
+            'nextWorkDate': next_work_date
+        }
+
+    @property
+    def assignments(self) -> AssignmentStore:
+        if self._assignments is None:
+            self._assignments = AssignmentStore(config.ASSIGNMENT_CONFIG['db_path'])
+        return self._assignments
+
+    def get_assignments(self, scenario_id: str, mechanic_id: Optional[str] = None) -> Dict[str, List[str]]:
+        """Task id -> mechanics assigned in a scenario, optionally only a mechanic's tasks"""
+        return self.assignments.load(scenario_id, mechanic_id)
+
+    def assign_tasks(self, scenario_id: str, items: List[Dict], atomic: bool = True) -> Optional[Dict]:
+        """
+        Validate and store a batch of task -> mechanic assignments.
+
+        Each item is {taskId, mechanicId} or {taskId, mechanics: [...]}, and sets the
+        task's mechanics (an empty list unassigns it). Items are checked in one pass
+        against the published schedule: the task must exist, it can't get more
+        mechanics than it requires, and no mechanic may work two overlapping tasks,
+        counting both stored assignments and earlier items of the batch.
+
+        With atomic, any invalid item rejects the whole batch; otherwise the valid
+        items are stored. Either way the batch is written in one transaction.
+
+        Returns:
+            {'applied', 'results'}: results has one entry per item, in order
+        """
+        published = self.get_published(scenario_id)
+        if published is None:
+            return None
+        index = published.index
+        priority_list = published.priority_list
+
+        with self._assignments_lock:
+            stored = self.assignments.load(scenario_id)
+            batch_tasks = {str(item.get('taskId')) for item in items if isinstance(item, dict)}
+
+            # Busy intervals per mechanic, sorted by start, from assignments the batch keeps
+            timelines: Dict[str, List] = {}
+            for task_id, mechanics in stored.items():
+                position = index.positions.get(task_id)
+                if position is None or task_id in batch_tasks:
+                    continue
+                for mechanic in mechanics:
+                    timelines.setdefault(mechanic, []).append((index.starts[position], index.ends[position], task_id))
+            for timeline in timelines.values():
+                timeline.sort()
+
+            results = []
+            accepted = {}
+            seen = set()
+            for item in items:
+                item = item if isinstance(item, dict) else {}
+                task_id = str(item.get('taskId')) if item.get('taskId') is not None else None
+                if 'mechanics' in item:
+                    mechanics = item['mechanics'] or []
+                else:
+                    mechanics = [item['mechanicId']] if item.get('mechanicId') else []
+                mechanics = list(dict.fromkeys(str(mechanic) for mechanic in mechanics)) \
+                    if isinstance(mechanics, list) else None
+
+                error = None
+                position = index.positions.get(task_id)
+                if task_id is None:
+                    error = "taskId is required"
+                elif mechanics is None:
+                    error = "mechanics must be a list"
+                elif position is None:
+                    error = f"Task {task_id} is not in the {scenario_id} schedule"
+                elif task_id in seen:
+                    error = f"Task {task_id} appears more than once"
+                elif len(mechanics) > priority_list[position]['mechanics_required']:
+                    error = f"Task {task_id} needs only {priority_list[position]['mechanics_required']} mechanic(s)"
+                else:
+                    start, end = index.starts[position], index.ends[position]
+                    for mechanic in mechanics:
+                        timeline = timelines.get(mechanic, [])
+                        # Stored assignments made against an earlier version can overlap each
+                        # other, so every interval starting before this task ends is checked
+                        before_end = bisect.bisect_left(timeline, (end,))
+                        clash = next((busy for busy in timeline[:before_end] if busy[1] > start), None)
+                        if clash is not None:
+                            error = (f"{mechanic} is busy with {clash[2]} "
+                                     f"({clash[0].isoformat()} - {clash[1].isoformat()})")
+                            break
+
+                seen.add(task_id)
+                if error is None:
+                    accepted[task_id] = mechanics
+                    for mechanic in mechanics:
+                        bisect.insort(timelines.setdefault(mechanic, []),
+                                      (index.starts[position], index.ends[position], task_id))
+                results.append({'taskId': task_id, 'mechanics': mechanics,
+                                'status': 'error' if error else ('assigned' if mechanics else 'unassigned'),
+                                'error': error})
+
+            failed = any(result['error'] for result in results)
+            applied = bool(accepted) and not (atomic and failed)
+            if applied:
+                self.assignments.replace(scenario_id, accepted, published.version)
+            elif accepted:
+                for result in results:
+                    if not result['error']:
+                        result['status'] = 'not_applied'
+
+        return {'applied': applied, 'results': results}
+
+    def get_delta(self, scenario_id: str, since: Optional[int]) -> Optional[EncodedPayload]:
+        """
+        Tasks of a scenario that changed since a version the client already has.
+
+        Each (since, current) pair is diffed once and cached as an encoded payload.
+        If the client's version is no longer kept (API_CONFIG['history_versions']),
+        the delta is the full schedule, flagged 'full'.
+        """
+        published = self.get_published(scenario_id)
+        if published is None:
+            return None
+
+        base = None
+        if since is not None:
+            base = next((previous for previous in self._history.get(scenario_id, ())
+                         if previous.version == since), None)
+
+        def compute():
+            changed, removed = diff_tasks(base.tasks if base else None, published.tasks)
+            return EncodedPayload({
+                'success': True,
+                'scenario_id': scenario_id,
+                'since': base.version if base else None,
+                'version': published.version,
+                'full': base is None,
+                'changed': changed,
+                'removed': removed,
+                'count': len(changed) + len(removed),
+                'summary': published.summary
+            })
+
+        key = (scenario_id, base.version if base else None, published.version)
+        return self.deltas.get_or_compute(key, compute)
+
+    def get_late_parts_impact(self, scenario_id: str) -> Optional[Dict]:
+        """
+        Each late part's effect on its product's completion in a scenario.
+
+        The committed schedule is compared with counterfactual reschedules at the
+        scenario's capacities, with one late part's on-dock date removed at a time.
+        A first round relaxes all late parts at once; only late parts of products it
+        moves, and on or near the critical chain (see screen_late_parts), then get a
+        reschedule of their own. The others are reported with no impact. Each round
+        is spread over worker processes, and each published version is analyzed once.
+
+        If the input file changes while the workers load it, the analysis is repeated
+        once against the reloaded model.
+        """
+        for attempt in range(2):
+            published = self.get_published(scenario_id)
+            if published is None:
+                return None
+            scheduler = self.scheduler
+            try:
+                return self.late_part_impacts.get_or_compute(
+                    (scenario_id, published.version),
+                    lambda: self._analyze_late_parts(scenario_id, scheduler, published))
+            except InputChanged:
+                if attempt:
+                    raise
+                logger.info(f"Input changed during the late part analysis of {scenario_id}, retrying")
+                if self.scheduler is scheduler:
+                    # The file watcher hasn't picked the change up yet
+                    self.reload_data()
+
+    @staticmethod
+    def _scenario_capacities(scheduler, summary: Dict) -> Tuple[Dict, Dict]:
+        """(mechanic team, quality team) capacities a scenario's schedule was generated with"""
+        if summary.get('config'):
+            return summary['config']['mechanic'], summary['config']['quality']
+        if summary.get('team_capacities'):
+            return summary['team_capacities'], summary['quality_capacities']
+        return dict(scheduler._original_team_capacity), dict(scheduler._original_quality_capacity)
+
+    def _analyze_late_parts(self, scenario_id: str, scheduler, published: PublishedSchedule) -> Dict:
+        started = time.perf_counter()
+        settings = config.LATE_PART_CONFIG
+        times = {}
+        products = {}
+        completion = {}
+        rework = {}
+        for entry in published.priority_list:
+            product = entry['product_line']
+            times[entry['task_id']] = (entry['scheduled_start'], entry['scheduled_end'])
+            products[entry['task_id']] = product
+            completion[product] = max(completion.get(product, entry['scheduled_end']), entry['scheduled_end'])
+            if entry['task_type'] == 'Rework':
+                rework[product] = rework.get(product, 0) + 1
+
+        late_parts = screen_late_parts(scheduler, times, products, settings['near_critical_hours'],
+                                       settings['binding_hours'])
+        runs = []
+        completions = {}
+
+        def impact_days(product: str, label: str) -> float:
+            control = completions[CONTROL_RUN].get(product)
+            relaxed = completions[label].get(product)
+            if control is None or relaxed is None:
+                return 0.0
+            return round((control - relaxed).total_seconds() / 86400, 2)
+
+        if any(late_part['candidate'] for late_part in late_parts):
+            # The control run is the committed schedule regenerated the same way as the counterfactuals
+            capacities = self._scenario_capacities(scheduler, published.summary)
+            runs = [(CONTROL_RUN, ()), (ALL_RELAXED_RUN, tuple(late_part['task_id'] for late_part in late_parts))]
+            completions = run_counterfactuals_parallel(scheduler, capacities, runs, settings.get('workers'))
+
+            for late_part in late_parts:
+                if late_part['candidate'] and impact_days(late_part['product'], ALL_RELAXED_RUN) <= 0:
+                    late_part['candidate'] = False
+                    late_part['screened'] = 'no_product_impact'
+            single = [(late_part['task_id'], (late_part['task_id'],))
+                      for late_part in late_parts if late_part['candidate']]
+            if single:
+                completions.update(run_counterfactuals_parallel(scheduler, capacities, single,
+                                                                settings.get('workers')))
+                runs += single
+        candidates = [late_part['task_id'] for late_part in late_parts if late_part['candidate']]
+
+        product_impacts = {}
+        for late_part in late_parts:
+            product = late_part['product']
+            late_part['impact_days'] = impact_days(product, late_part['task_id']) if late_part['candidate'] else 0.0
+            if product not in product_impacts:
+                delivery = scheduler.delivery_dates.get(product)
+                lateness = (completion[product] - delivery).days if delivery is not None else None
+                product_impacts[product] = {
+                    'latePartCount': 0,
+                    'reworkCount': rework.get(product, 0),
+                    'totalMakespanImpact': impact_days(product, ALL_RELAXED_RUN) if completions else 0.0,
+                    'projectedCompletion': completion[product],
+                    'productLatenessDays': lateness,
+                    'onTime': lateness is not None and lateness <= 0,
+                    'lateParts': []
+                }
+            product_impacts[product]['latePartCount'] += 1
+            product_impacts[product]['lateParts'].append(late_part)
+
+        total_impact = sum(max(impact['totalMakespanImpact'], 0.0) for impact in product_impacts.values())
+        seconds = time.perf_counter() - started
+        logger.info(f"Late part analysis of {scenario_id}: {len(late_parts)} late parts, "
+                    f"{len(candidates)} rescheduled in {seconds:.2f}s")
+        return json_safe({
+            'scenario': scenario_id,
+            'version': published.version,
+            'productImpacts': product_impacts,
+            'overallStatistics': {
+                'totalLatePartsCount': len(late_parts),
+                'evaluatedLatePartsCount': len(candidates),
+                'screenedLatePartsCount': len(late_parts) - len(candidates),
+                'rescheduleRuns': len(runs),
+                'totalMakespanImpactDays': round(total_impact, 2),
+                'averageImpactPerPart': round(total_impact / len(late_parts), 2) if late_parts else 0.0,
+                'productsWithLateParts': len(product_impacts),
+                'totalProducts': len(scheduler.delivery_dates),
+                'seconds': round(seconds, 3)
+            }
+        })
+
+    def simulate_priority(self, scenario_id: str, product: str, level: str = 'high',
+                          days: int = 30) -> Optional[Dict]:
+        """
+        What prioritizing a product for the next `days` days does to every product's lateness.
+
+        The scenario's schedule is rescheduled over the rolling horizon on a copy of
+        the model (see ProductionScheduler.simulate_priority_change), and each
+        product's lateness is projected by how much its work in the horizon moves.
+        Results are cached per (scenario version, product, level, days).
+
+        Raises:
+            ValueError: unknown level or days out of range
+            UnknownProductError: unknown product
+        """
+        if level not in PRIORITY_LEVELS:
+            raise ValueError(f"level must be one of {', '.join(PRIORITY_LEVELS)}")
+        max_days = config.SIMULATION_CONFIG.get('max_days', 365)
+        if not 1 <= days <= max_days:
+            raise ValueError(f"days must be between 1 and {max_days}")
+
+        published = self.get_published(scenario_id)
+        if published is None:
+            return None
+        scheduler = self.scheduler
+        if product not in scheduler.delivery_dates:
+            raise UnknownProductError(product)
+
+        return self.simulations.get_or_compute(
+            (scenario_id, published.version, product, level, days),
+            lambda: self._simulate_priority(scenario_id, scheduler, published, product, level, days))
+
+    def _simulate_priority(self, scenario_id: str, scheduler, published: PublishedSchedule, product: str,
+                           level: str, days: int) -> Dict:
+        started = time.perf_counter()
+        committed = {entry['task_id']: (entry['scheduled_start'], entry['scheduled_end'])
+                     for entry in published.priority_list}
+        completion = {}
+        for entry in published.priority_list:
+            name = entry['product_line']
+            completion[name] = max(completion.get(name, entry['scheduled_end']), entry['scheduled_end'])
+
+        worker = scheduler.clone()
+        mechanic, quality = self._scenario_capacities(scheduler, published.summary)
+        worker.team_capacity, worker.quality_team_capacity = dict(mechanic), dict(quality)
+        simulation = worker.simulate_priority_change(product, level, days, committed=committed)
+        horizon_end = simulation['horizon_end']
+
+        def progress(schedule: Dict) -> Dict[str, Dict]:
+            """Per product: latest end in the horizon, and tasks and minutes done by its end"""
+            totals = {}
+            for task in schedule.values():
+                total = totals.setdefault(task['product_line'],
+                                          {'frontier': task['end_time'], 'tasks': 0, 'minutes': 0})
+                total['frontier'] = max(total['frontier'], task['end_time'])
+                if task['end_time'] <= horizon_end:
+                    total['tasks'] += 1
+                    total['minutes'] += int(task['duration'])
+            return totals
+
+        before_progress = progress(simulation['before'])
+        after_progress = progress(simulation['after'])
+        before, after = [], []
+        gain, cost = 0.0, 0.0
+        for name, delivery in sorted(scheduler.delivery_dates.items()):
+            if name not in completion:
+                continue
+            lateness = (completion[name] - delivery).total_seconds() / 86400
+            old = before_progress.get(name)
+            new = after_progress.get(name)
+            # Later work of the product is assumed to move with its work in the horizon
+            shift = (new['frontier'] - old['frontier']).total_seconds() / 86400 if old and new else 0.0
+            if name == product:
+                gain = -shift
+            else:
+                cost += max(shift, 0.0)
+
+            before.append({'name': name, 'latenessDays': round(lateness, 1), 'onTime': lateness <= 0,
+                           'tasksCompleted': old['tasks'] if old else 0, 'workMinutes': old['minutes'] if old else 0})
+            after.append({'name': name, 'latenessDays': round(lateness + shift, 1), 'onTime': lateness + shift <= 0,
+                          'tasksCompleted': new['tasks'] if new else 0, 'workMinutes': new['minutes'] if new else 0,
+                          'changeDays': round(shift, 1)})
+
+        if gain <= 0:
+            recommendation = f"Prioritizing {product} does not bring it forward within {days} days"
+        elif cost == 0:
+            recommendation = f"{product} gains {gain:.1f} days with no delay to other products"
         else:
-            # For other scenarios, you can add different logic
-            priority_list = self.scheduler.generate_global_priority_list(allow_late_delivery=True, silent_mode=True)
+            recommendation = f"{product} gains {gain:.1f} days; other products lose {cost:.1f} days in total"
+
+        seconds = time.perf_counter() - started
+        logger.info(f"Simulated {level} priority for {product} in {scenario_id} over {days} days "
+                    f"({simulation['task_count']} tasks) in {seconds:.2f}s")
+        return json_safe({
+            'scenario': scenario_id,
+            'version': published.version,
+            'product': product,
+            'level': level,
+            'days': days,
+            'horizon': {'start': simulation['horizon_start'], 'end': horizon_end,
+                        'taskCount': simulation['task_count']},
+            'before': before,
+            'after': after,
+            'impactScore': min(100, round(10 * (abs(gain) + cost))),
+            'recommendation': recommendation,
+            'seconds': round(seconds, 3)
+        })
+
+    def get_scenario_summary(self, scenario_id: str) -> Optional[Dict]:
+        """Engine outcome of a scenario (makespan, lateness metrics, chosen workforce)"""
+        published = self.get_published(scenario_id)
+        return published.summary if published else None
+
+    def _scenario_result(self, scenario_id: str, scheduler, key: tuple, job: Optional[Job] = None) -> Dict:
+        """
+        Engine result of a key: stored for this data version (in the result store, or
+        as a schedule version in the schedule store), or computed once and stored.
+
+        Progress goes to the scenario's channel, and to the job running it if any.
+        """
+        stem = scheduler._snapshot_stem()
+        result = self.results.load(stem, key) if self.results else None
+        if result is not None:
+            print(f"[DEBUG] Loaded stored {scenario_id} result for this data version")
+            return result
+        result = self._stored_schedule(scenario_id, scheduler, key)
+        if result is not None:
+            print(f"[DEBUG] Loaded {scenario_id} from stored schedule version {result['stored_version']}")
+            return result
+
+        print(f"[DEBUG] Running {scenario_id} engine")
+        channel = f"scenario:{scenario_id}"
+
+        def report(stage, progress, message, event='progress', data=None):
+            self.progress.publish(channel, event, {'scenario_id': scenario_id, 'stage': stage,
+                                                   'progress': progress, 'message': message, 'detail': data})
+            if job is not None:
+                job.report(stage, progress, message, event=event, data=data)
 
-        # Convert to Gantt format
+        try:
+            result = run_scenario(scheduler, scenario_id, dict(key[3]), progress_callback=report,
+                                  cancel_event=job.cancel_event if job else None)
+        except Exception as e:
+            self.progress.publish(channel, 'complete', {'scenario_id': scenario_id, 'state': 'failed',
+                                                        'error': str(e)})
+            raise
+        if self.results:
+            self.results.save(stem, key, result)
+        return result
+
+    def _publish(self, scenario_id: str, scheduler, key: tuple,
+                 result: Optional[Dict] = None) -> PublishedSchedule:
+        """
+        Writer: publish a scenario as a new version.
+
+        The engine result comes from the result store, from a warm-up worker, or
+        from running the engine on a copy of the shared scheduler. The engine and
+        the encoding of the new version run without any lock; _writer_lock is held
+        only to number the version and to swap it in. A result identical to the
+        scenario's latest version (e.g. reloaded from the result store when the TTL
+        expires) republishes that version, so cursors and delta bases stay valid.
+        """
+        if result is None:
+            result = self._scenario_result(scenario_id, scheduler, key)
+        priority_list = result['priority_list']
+        tasks = self._to_gantt(priority_list)
+        summary = json_safe({name: value for name, value in result.items()
+                             if name not in ('priority_list', 'stored_version')})
+        print(f"[DEBUG] Generated {len(tasks)} tasks for {scenario_id}")
+
+        with self._writer_lock:
+            latest = self._history.get(scenario_id, (None,))[-1]
+            unchanged = (latest is not None and latest.key == key and latest.summary == summary and
+                         latest.tasks == tuple(tasks))
+            if unchanged:
+                current = self._published.get(scenario_id)
+                if current is None or current.version <= latest.version:
+                    self._published = {**self._published, scenario_id: latest}
+            else:
+                self._version += 1
+                version = self._version
+
+        if unchanged:
+            print(f"[DEBUG] {scenario_id} is unchanged; keeping version {latest.version}")
+            self.progress.publish(f"scenario:{scenario_id}", 'complete', {
+                'scenario_id': scenario_id, 'state': 'succeeded', 'version': latest.version,
+                'task_count': len(priority_list), 'infeasible': bool(result.get('infeasible'))
+            })
+            return latest
+
+        published = PublishedSchedule(scenario_id, version, key, scheduler.data_fingerprint,
+                                      priority_list, tasks, summary, scheduler.build_dynamic_dependencies())
+        with self._writer_lock:
+            # A slower publish of an older version must not replace a newer one
+            current = self._published.get(scenario_id)
+            if current is None or current.version < version:
+                self._published = {**self._published, scenario_id: published}
+            history = tuple(sorted(self._history.get(scenario_id, ()) + (published,),
+                                   key=lambda item: item.version))
+            self._history = {**self._history,
+                             scenario_id: history[-config.API_CONFIG.get('history_versions', 8):]}
+
+        self.progress.publish(f"scenario:{scenario_id}", 'complete', {
+            'scenario_id': scenario_id, 'state': 'succeeded', 'version': published.version,
+            'task_count': len(priority_list), 'infeasible': bool(result.get('infeasible'))
+        })
+        if 'stored_version' not in result:
+            self._persist_schedule(scenario_id, scheduler, priority_list, dict(key[3]), summary)
+        return published
+
+    def invalidate(self, scenario_id: Optional[str] = None):
+        """Drop the published and cached results of one scenario, or of all of them"""
+        self.cache.invalidate(scenario_id)
+        self.late_part_impacts.invalidate(scenario_id)
+        self.simulations.invalidate(scenario_id)
+        if scenario_id is None:
+            self._published = {}
+        else:
+            self._published = {sid: published for sid, published in self._published.items()
+                               if sid != scenario_id}
+
+    @staticmethod
+    def _to_gantt(priority_list: List[Dict]) -> List[Dict]:
+        """Convert a global priority list to Gantt format"""
         tasks = []
-        for task in priority_list[:50]:  # Limit to first 50 for performance
+        for task in priority_list:
             tasks.append({
                 'taskId': task['task_id'],
                 'task_type': task['task_type'],
@@ -76,18 +1372,223 @@ class SchedulerService:
                 'endTime': task['scheduled_end'].isoformat(),
                 'duration': task['duration_minutes'],
                 'team': task['team'],
+                'shift': task.get('shift'),
                 'product_line': task['product_line']
             })
-
-        print(f"[DEBUG] Generated {len(tasks)} tasks for {scenario_id}")
         return tasks
 
+    # ========== Background jobs ==========
+    def submit_scenario_job(self, scenario_id: str, parameters: Optional[Dict] = None) -> Job:
+        """
+        Run a scenario engine as a background job on a clone of the current model.
+
+        Raises:
+            ValueError: unknown scenario or parameters
+            RuntimeError: the scheduler isn't initialized
+            JobQueueFull: too many jobs are waiting
+        """
+        parameters = validate_scenario_parameters(scenario_id, parameters)
+        scheduler = self.scheduler
+        if not self.initialized or not scheduler:
+            raise RuntimeError("Scheduler not initialized")
+
+        def target(job: Job):
+            worker = scheduler.clone()
+            worker.auto_export = False
+            worker.cancel_event = job.cancel_event
+            worker.progress_callback = job.report
+            worker.progress_interval = config.PROGRESS_CONFIG.get('interval', worker.progress_interval)
+            result = run_scenario_engine(worker, scenario_id, parameters)
+            return self._job_result(scenario_id, parameters, scheduler, result)
+
+        return self.jobs.submit(scenario_id, target, parameters)
+
+    def _job_result(self, scenario_id: str, parameters: Dict, scheduler, result: Dict) -> Dict:
+        """JSON-ready summary of a scenario engine result"""
+        priority_list = result['priority_list']
+        summary = json_safe({key: value for key, value in result.items() if key != 'priority_list'})
+        summary.update({
+            'scenario_id': scenario_id,
+            'parameters': parameters,
+            'fingerprint': scheduler.data_fingerprint,
+            'task_count': len(priority_list),
+            'tasks': self._to_gantt(priority_list)
+        })
+        return summary
+
+    # ========== Startup warm-up ==========
+    def start_warmup(self, scenarios=None, workers: Optional[int] = None):
+        """
+        Precompute scenarios in a background thread so the first requests are served warm.
+
+        Each scenario runs in its own worker process that loads the model from its
+        snapshot; results are published into the cache like any other generation.
+        A call while a warm-up of an older model is running (a reload) runs again for
+        the current model once that one finishes.
+        """
+        if scenarios is None:
+            scenarios = config.SCHEDULER_CONFIG.get('warmup_scenarios', SCENARIOS)
+        if workers is None:
+            workers = config.SCHEDULER_CONFIG.get('warmup_workers')
+        scheduler = self.scheduler
+        fingerprint = scheduler.data_fingerprint if scheduler else None
+
+        with self._warmup_lock:
+            if self._warmup_thread is not None:
+                if fingerprint != self._warmup_fingerprint:
+                    self._warmup_next = (list(scenarios), workers)
+                return
+            self._begin_warmup(scenarios, fingerprint)
+            self._warmup_thread = threading.Thread(target=self._warmup_runs, args=(list(scenarios), workers),
+                                                   name='scenario-warmup', daemon=True)
+            self._warmup_thread.start()
+
+    def _begin_warmup(self, scenarios: List[str], fingerprint: Optional[str]):
+        """Reset the warm-up status for a new run (caller holds _warmup_lock)"""
+        self._warmup_fingerprint = fingerprint
+        self._warmup = {
+            'state': 'warming',
+            'scenarios': {scenario_id: {'state': 'pending'} for scenario_id in scenarios},
+            'started_at': datetime.now().isoformat(),
+            'finished_at': None
+        }
+
+    def _warmup_runs(self, scenarios: List[str], workers: Optional[int]):
+        """Warm-up thread: run the warm-up, then any run requested meanwhile"""
+        while True:
+            try:
+                self._run_warmup(scenarios, workers)
+            except Exception as e:
+                logger.error(f"Warm-up failed: {e}")
+                self._set_warmup_state(state='failed', error=str(e), finished_at=datetime.now().isoformat())
+            with self._warmup_lock:
+                self._warmed_up = self._warmed_up or self._warmup['state'] == 'ready'
+                if self._warmup_next is None:
+                    self._warmup_thread = None
+                    return
+                (scenarios, workers), self._warmup_next = self._warmup_next, None
+                scheduler = self.scheduler
+                self._begin_warmup(scenarios, scheduler.data_fingerprint if scheduler else None)
+
+    def _set_warmup_state(self, scenario_id: Optional[str] = None, **values):
+        with self._warmup_lock:
+            target = self._warmup['scenarios'][scenario_id] if scenario_id else self._warmup
+            target.update(values)
+
+    def _run_warmup(self, scenarios: List[str], workers: Optional[int]):
+        scheduler = self.scheduler
+        if not self.initialized or not scheduler:
+            self._set_warmup_state(state='failed', error='Scheduler not initialized',
+                                   finished_at=datetime.now().isoformat())
+            return
+
+        started = time.perf_counter()
+        pending = set(scenarios)
+        for scenario_id in scenarios:
+            key = self._cache_key(scenario_id, scheduler)
+            if self._stored_version(scenario_id, scheduler, key) is None:
+                continue
+            # Published again from the schedule store, without an engine run
+            scenario_started = time.perf_counter()
+            try:
+                self._generate(scenario_id, scheduler, key)
+            except Exception as e:
+                logger.warning(f"Could not publish stored {scenario_id}: {e}")
+                continue
+            self._set_warmup_state(scenario_id, state='done',
+                                   seconds=round(time.perf_counter() - scenario_started, 3))
+            pending.discard(scenario_id)
+
+        workers = workers or min(len(scenarios), os.cpu_count() or 1)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=worker_pool_context()) as pool:
+                futures = {}
+                result_dir = self.results.result_dir if self.results else None
+                for scenario_id in scenarios:
+                    if scenario_id not in pending:
+                        continue
+                    futures[pool.submit(_warm_scenario, scheduler.csv_path, scheduler.late_part_delay_days,
+                                        scheduler.snapshot_dir, result_dir,
+                                        self._cache_key(scenario_id, scheduler))] = scenario_id
+                    self._set_warmup_state(scenario_id, state='running')
+
+                for future in as_completed(futures):
+                    scenario_id = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning(f"Warm-up of {scenario_id} failed in worker: {e}")
+                        continue
+                    if result is None:
+                        # The input changed under the worker; leave it to the next request
+                        self._set_warmup_state(scenario_id, state='skipped')
+                        pending.discard(scenario_id)
+                        continue
+
+                    result, seconds = result
+                    key = self._cache_key(scenario_id, scheduler)
+                    self.cache.get_or_compute(
+                        key, lambda: self._publish(scenario_id, scheduler, key, result))
+                    self._set_warmup_state(scenario_id, state='done', seconds=round(seconds, 3))
+                    pending.discard(scenario_id)
+        except Exception as e:
+            logger.warning(f"Warm-up worker pool unavailable, warming in-process: {e}")
+
+        # Anything the pool couldn't do is generated here
+        for scenario_id in scenarios:
+            if scenario_id not in pending:
+                continue
+            try:
+                scenario_started = time.perf_counter()
+                self._generate(scenario_id, scheduler, self._cache_key(scenario_id, scheduler))
+                self._set_warmup_state(scenario_id, state='done',
+                                       seconds=round(time.perf_counter() - scenario_started, 3))
+            except Exception as e:
+                logger.error(f"Warm-up of {scenario_id} failed: {e}")
+                self._set_warmup_state(scenario_id, state='failed', error=str(e))
+
+        self._set_warmup_state(state='ready', seconds=round(time.perf_counter() - started, 3),
+                               finished_at=datetime.now().isoformat())
+        logger.info(f"Warm-up finished in {time.perf_counter() - started:.2f}s")
+
+    def warmup_status(self) -> Dict:
+        """Progress of the startup warm-up"""
+        with self._warmup_lock:
+            status = {**self._warmup, 'scenarios': {scenario_id: dict(item) for scenario_id, item
+                                                    in self._warmup['scenarios'].items()}}
+        completed = sum(1 for item in status['scenarios'].values()
+                        if item['state'] in ('done', 'failed', 'skipped'))
+        total = len(status['scenarios'])
+        status['completed'] = completed
+        status['total'] = total
+        status['progress'] = completed / total if total else 1.0
+        warmup_disabled = status['state'] == 'idle' and not config.SCHEDULER_CONFIG.get('warmup_scenarios')
+        # Warm-ups after a reload don't take a warmed instance out of service
+        status['ready'] = self.initialized and (status['state'] == 'ready' or warmup_disabled or self._warmed_up)
+        return status
+
     def clear_all_scenarios(self):
         """Clear all cached scenarios"""
-        if self.scheduler:
-            self.scheduler.task_schedule = {}
-            self.scheduler._critical_path_cache = {}
+        self.invalidate()
+        with self._writer_lock:
+            if self.scheduler:
+                self.scheduler.task_schedule = {}
+                self.scheduler._critical_path_cache = {}
 
     def regenerate_scenario(self, scenario_id: str, force: bool = True) -> List[Dict]:
-        """Force regenerate scenario"""
+        """
+        Force regenerate scenario.
+
+        Raises:
+            ScenarioPending: an optimizer, regenerated by a background job while its
+                current version stays published
+        """
+        scheduler = self.scheduler
+        if force and scheduler is not None and \
+                scenario_id not in config.SCHEDULER_CONFIG.get('inline_scenarios', ('baseline', 'scenario1')):
+            key = self._cache_key(scenario_id, scheduler)
+            self.cache.invalidate(scenario_id)
+            raise ScenarioPending(scenario_id, self.generate_in_background(scenario_id, scheduler, key))
+        if force:
+            self.invalidate(scenario_id)
         return self.get_scenario_data(scenario_id)
\ No newline at end of file
@@ -2,6 +2,8 @@
 Tasks API Blueprint
 """
 from flask import Blueprint, jsonify, request
+from backend.services.scheduler_service import ScenarioPending, SchedulerService, UnknownProductError
+from backend.api.scenarios import datetime_arg, pending_response
 
 tasks_bp = Blueprint('tasks', __name__, url_prefix='/api')
 
@@ -10,4 +12,36 @@ def test():
     """Test endpoint for tasks"""
     return jsonify({'message': 'tasks API is working'})
 
-# TODO: Implement actual endpoints
+
+@tasks_bp.route('/product/<product_name>/tasks')
+def get_product_tasks(product_name):
+    """
+    A product's tasks in start order, with its completion, lateness, task type
+    breakdown and critical chain.
+
+    Query arguments: scenario (default baseline), start/end (ISO; tasks overlapping
+    the window), limit
+    """
+    try:
+        service = SchedulerService.get_instance()
+        result = service.get_product_tasks(
+            request.args.get('scenario', 'baseline'),
+            product_name,
+            start=datetime_arg('start'),
+            end=datetime_arg('end'),
+            limit=request.args.get('limit', type=int)
+        )
+        if result is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+        return jsonify({'success': True, **result})
+    except UnknownProductError:
+        return jsonify({'success': False, 'error': f'Unknown product: {product_name}'}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except ScenarioPending as e:
+        return pending_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
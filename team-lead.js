@@ -171,16 +171,18 @@ class TeamLeadModule extends DashboardModule {
             const scenariosResponse = await fetch('/api/scenarios');
             const scenariosInfo = await scenariosResponse.json();
 
-            // Load each scenario
+            // Load each scenario (only the changes if it was loaded before)
             for (const scenario of scenariosInfo) {
-                const response = await fetch(`/api/scenario/${scenario}`);
-                const data = await response.json();
-
-                if (response.ok && data.success) {
-                    this.allScenarios[scenario] = data;
-                    console.log(`✓ Loaded ${scenario}: ${data.count} tasks`);
-                } else {
-                    console.error(`✗ Failed to load ${scenario}:`, data.error);
+                try {
+                    const data = await this.api.loadScenario(scenario, this.allScenarios[scenario]);
+                    if (data.success) {
+                        this.allScenarios[scenario] = data;
+                        console.log(`✓ Loaded ${scenario}: ${data.count} tasks`);
+                    } else {
+                        console.error(`✗ Failed to load ${scenario}:`, data.error);
+                    }
+                } catch (error) {
+                    console.error(`✗ Failed to load ${scenario}:`, error);
                 }
             }
 
@@ -465,7 +467,7 @@ class TeamLeadModule extends DashboardModule {
         const roleLabel = isQualityTeam ? 'Quality Inspector' : 'Mechanic';
 
         modalContent.innerHTML = `
-            <h2 style="margin-top: 0;">Daily Assignment - ${teamName}</h2>
+            <h2 style="margin-top: 0;">Daily Assignment - ${this.escapeHtml(teamName)}</h2>
             <button onclick="this.closest('.assignment-modal').remove()"
                     style="position: absolute; top: 20px; right: 20px;
                            background: none; border: none; font-size: 24px; cursor: pointer; color: #6B7280;">×</button>
@@ -483,7 +485,7 @@ class TeamLeadModule extends DashboardModule {
             <div style="margin-bottom: 20px;">
                 <h3>Mark Attendance - Who's Here Today?</h3>
                 <p style="color: #6B7280; margin-bottom: 15px;">
-                    ${this.currentScenario} requires ${requiredCapacity} ${roleLabel.toLowerCase()}s for ${teamName}.
+                    ${this.currentScenario} requires ${requiredCapacity} ${roleLabel.toLowerCase()}s for ${this.escapeHtml(teamName)}.
                     Uncheck anyone who is absent.
                 </p>
 
@@ -492,8 +494,7 @@ class TeamLeadModule extends DashboardModule {
                 </div>
             </div>
 
-            <button onclick="window.teamLeadModule.generateAssignments('${teamName}')"
-                    class="btn btn-primary"
+            <button class="btn btn-primary generate-assignments-btn"
                     style="width: 100%; padding: 14px; font-size: 16px; background: #3B82F6; color: white; border: none; border-radius: 6px; cursor: pointer; font-weight: 600;">
                 Generate Individual Assignments
             </button>
@@ -505,6 +506,16 @@ class TeamLeadModule extends DashboardModule {
 
         modal.appendChild(modalContent);
         document.body.appendChild(modal);
+        modalContent.querySelector('.generate-assignments-btn')
+            .addEventListener('click', () => this.generateAssignments(teamName));
+
+        // Once assignments are shown, rerun them as attendance changes
+        this.assignmentDate = null;
+        modalContent.querySelector('#attendanceList').addEventListener('change', () => {
+            if (!this.assignmentDate) return;
+            clearTimeout(this.assignmentTimer);
+            this.assignmentTimer = setTimeout(() => this.generateAssignments(teamName, this.assignmentDate), 250);
+        });
     }
 
     generateMechanicCheckboxes(teamName, capacity, roleLabel) {
@@ -513,12 +524,12 @@ class TeamLeadModule extends DashboardModule {
             html += `
                 <label style="display: flex; align-items: center; padding: 12px; background: white; border: 2px solid #E5E7EB; border-radius: 6px; cursor: pointer;">
                     <input type="checkbox"
-                           value="${teamName} ${roleLabel} #${i}"
+                           value="${this.escapeHtml(`${teamName} ${roleLabel} #${i}`)}"
                            checked
                            style="margin-right: 10px; width: 18px; height: 18px; cursor: pointer;">
                     <div>
                         <div style="font-weight: 500; color: #1F2937; font-size: 14px;">${roleLabel} #${i}</div>
-                        <div style="font-size: 11px; color: #6B7280;">${teamName}</div>
+                        <div style="font-size: 11px; color: #6B7280;">${this.escapeHtml(teamName)}</div>
                     </div>
                 </label>
             `;
@@ -526,7 +537,7 @@ class TeamLeadModule extends DashboardModule {
         return html;
     }
 
-    async generateAssignments(teamName) {
+    async generateAssignments(teamName, date = null) {
         // Get checked mechanics (present ones)
         const checkboxes = document.querySelectorAll('#attendanceList input[type="checkbox"]:checked');
         const presentMechanics = Array.from(checkboxes).map(cb => cb.value);
@@ -537,7 +548,12 @@ class TeamLeadModule extends DashboardModule {
         }
 
         const resultsDiv = document.getElementById('assignmentResults');
-        resultsDiv.innerHTML = '<div class="loading">Generating optimal assignments...</div>';
+        if (!this.assignmentDate) {
+            resultsDiv.innerHTML = '<div class="loading">Generating optimal assignments...</div>';
+        }
+        // Only the latest of overlapping requests is rendered
+        const requestId = (this.assignmentRequest || 0) + 1;
+        this.assignmentRequest = requestId;
 
         try {
             const response = await fetch(`/api/team/${teamName}/generate_assignments`, {
@@ -546,7 +562,7 @@ class TeamLeadModule extends DashboardModule {
                 body: JSON.stringify({
                     scenario: this.currentScenario,
                     presentMechanics: presentMechanics,
-                    date: new Date().toISOString()
+                    date: date || new Date().toISOString()
                 })
             });
 
@@ -555,59 +571,109 @@ class TeamLeadModule extends DashboardModule {
             if (!response.ok) {
                 throw new Error(data.error || 'Failed to generate assignments');
             }
+            if (requestId !== this.assignmentRequest) return;
 
-            // Display results (simplified version)
-            resultsDiv.innerHTML = `
-                <h3>Assignment Results</h3>
-                <p>Successfully generated assignments for ${presentMechanics.length} ${teamName} members.</p>
-                <button class="btn btn-secondary" onclick="alert('Export functionality would go here')">
-                    📥 Export Assignments
-                </button>
-            `;
+            this.assignmentDate = data.date;
+            resultsDiv.innerHTML = this.renderAssignmentResults(data, teamName);
+            const nextDayButton = resultsDiv.querySelector('.next-day-btn');
+            if (nextDayButton) {
+                nextDayButton.addEventListener('click', () => this.generateAssignments(teamName, data.nextWorkDate));
+            }
 
         } catch (error) {
             resultsDiv.innerHTML = `
                 <div style="background: #FEE2E2; border: 1px solid #EF4444; padding: 15px; border-radius: 8px;">
                     <strong>❌ Error generating assignments</strong><br>
-                    ${error.message}
+                    ${this.escapeHtml(error.message)}
                 </div>
             `;
         }
     }
 
+    renderAssignmentResults(data, teamName) {
+        const stats = data.teamStats;
+        const warningColors = { critical: '#EF4444', warning: '#F59E0B', info: '#3B82F6' };
+        const time = (value) => new Date(value).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
+        const escape = (value) => this.escapeHtml(value);
+
+        const warnings = data.warnings.map(warning => `
+            <div style="border-left: 4px solid ${warningColors[warning.level] || '#6B7280'}; padding: 8px 12px; margin-bottom: 6px; background: #F9FAFB;">
+                ${escape(warning.message)}
+            </div>
+        `).join('');
+
+        const nextDay = data.nextWorkDate ? `
+            <button class="btn btn-secondary next-day-btn">
+                Assign ${escape(data.nextWorkDate)} (next day with work)
+            </button>
+        ` : '';
+
+        const mechanics = Object.entries(data.mechanicAssignments).map(([name, assignment]) => `
+            <div style="border: 1px solid #E5E7EB; border-radius: 8px; padding: 12px; background: white;">
+                <div style="display: flex; justify-content: space-between; font-weight: 600;">
+                    <span>${escape(name)}</span>
+                    <span style="color: #6B7280; font-size: 12px;">${assignment.shift} shift · ${assignment.utilizationPercent}%${assignment.overtimeMinutes ? ` · ${assignment.overtimeMinutes} min OT` : ''}</span>
+                </div>
+                ${assignment.tasks.length ? assignment.tasks.map(task => `
+                    <div style="font-size: 13px; padding: 4px 0; border-top: 1px solid #F3F4F6;">
+                        ${time(task.startTime)}–${time(task.endTime)} ${escape(task.displayName)} (${escape(task.product)})
+                        ${task.isCritical ? '<span style="color: #EF4444;">● critical</span>' : ''}
+                        ${task.isLatePartTask ? '<span style="color: #F59E0B;">● late part</span>' : ''}
+                        ${task.assignedWith.length ? `<div style="color: #6B7280; font-size: 11px;">with ${escape(task.assignedWith.join(', '))}</div>` : ''}
+                    </div>
+                `).join('') : '<div style="color: #9CA3AF; font-size: 13px;">No tasks assigned</div>'}
+            </div>
+        `).join('');
+
+        const unassigned = data.unassignedTasks.length ? `
+            <h4>Unassigned Tasks (${data.unassignedTasks.length})</h4>
+            ${data.unassignedTasks.map(task => `
+                <div style="font-size: 13px; padding: 4px 0;">
+                    ${time(task.startTime)} ${escape(task.displayName)} (${escape(task.product)}) — ${escape(task.reason)}
+                </div>
+            `).join('')}
+        ` : '';
+
+        return `
+            <h3>Assignment Results - ${escape(data.date)}</h3>
+            <p>${stats.assignedTasks} of ${stats.totalTasks} tasks assigned to ${stats.presentMechanics} ${escape(teamName)} members ·
+               ${stats.teamUtilization}% utilization · ${stats.totalOvertimeMinutes} overtime minutes</p>
+            ${warnings}
+            ${nextDay}
+            <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 10px; margin-top: 15px;">
+                ${mechanics}
+            </div>
+            ${unassigned}
+        `;
+    }
+
     async autoAssign() {
         const selects = this.container.querySelectorAll('.assign-select');
         const mechanics = ['mech1', 'mech2', 'mech3', 'mech4'];
-        let mechanicIndex = 0;
-        let assignmentCount = 0;
-
-        for (const select of selects) {
-            const taskId = select.dataset.taskId;
-            const mechanicId = mechanics[mechanicIndex % mechanics.length];
-
-            try {
-                const response = await fetch('/api/assign_task', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({
-                        taskId: taskId,
-                        mechanicId: mechanicId,
-                        scenario: this.currentScenario
-                    })
-                });
-
-                if (response.ok) {
-                    select.value = mechanicId;
-                    assignmentCount++;
+        const assignments = Array.from(selects).map((select, i) => ({
+            taskId: select.dataset.taskId,
+            mechanicId: mechanics[i % mechanics.length]
+        }));
+        if (assignments.length === 0) return;
+
+        try {
+            // One round trip; items that clash with a mechanic's other tasks are reported, the rest stored
+            const data = await this.api.assignTasks(this.currentScenario, assignments, false);
+            const selectsByTask = new Map(Array.from(selects).map(select => [select.dataset.taskId, select]));
+            for (const result of data.results) {
+                if (result.status === 'assigned') {
+                    selectsByTask.get(result.taskId).value = result.mechanics[0];
                 }
-            } catch (error) {
-                console.error('Error assigning task:', error);
             }
 
-            mechanicIndex++;
+            const assigned = data.results.length - data.failed;
+            alert(data.failed
+                ? `Assigned ${assigned} tasks; ${data.failed} could not be assigned (${data.results.find(r => r.error).error})`
+                : `Successfully assigned ${assigned} tasks to mechanics!`);
+        } catch (error) {
+            console.error('Error assigning tasks:', error);
+            alert(`Error assigning tasks: ${error.message}`);
         }
-
-        alert(`Successfully assigned ${assignmentCount} tasks to mechanics!`);
     }
 
     exportTasks() {
@@ -624,6 +690,12 @@ class TeamLeadModule extends DashboardModule {
     }
 
     // Helper methods
+    escapeHtml(value) {
+        // Text from the API or the user, safe to interpolate into innerHTML (and attribute values)
+        const entities = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+        return String(value ?? '').replace(/[&<>"']/g, char => entities[char]);
+    }
+
     getTaskTypeClass(type) {
         const typeMap = {
             'Production': 'production',
@@ -2,6 +2,8 @@
 Teams API Blueprint
 """
 from flask import Blueprint, jsonify, request
+from backend.services.scheduler_service import ScenarioPending, SchedulerService, UnknownTeamError
+from backend.api.scenarios import datetime_arg, list_arg, pending_response
 
 teams_bp = Blueprint('teams', __name__, url_prefix='/api')
 
@@ -10,4 +12,39 @@ def test():
     """Test endpoint for teams"""
     return jsonify({'message': 'teams API is working'})
 
-# TODO: Implement actual endpoints
+
+@teams_bp.route('/team/<team_name>/tasks')
+def get_team_tasks(team_name):
+    """
+    Tasks of a team in start order.
+
+    Query arguments: scenario (default baseline), start/end (ISO; tasks overlapping
+    the window), shift (comma-separated or repeated), status (upcoming, in_progress,
+    completed), as_of (ISO time the status refers to; default now), limit
+    """
+    try:
+        service = SchedulerService.get_instance()
+        result = service.get_team_tasks(
+            request.args.get('scenario', 'baseline'),
+            team_name,
+            start=datetime_arg('start'),
+            end=datetime_arg('end'),
+            shifts=list_arg('shift'),
+            status=request.args.get('status') or None,
+            as_of=datetime_arg('as_of'),
+            limit=request.args.get('limit', type=int)
+        )
+        if result is None:
+            return jsonify({'success': False, 'error': 'Scheduler not initialized'}), 503
+        return jsonify({'success': True, **result})
+    except UnknownTeamError:
+        return jsonify({'success': False, 'error': f'Unknown team: {team_name}'}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except ScenarioPending as e:
+        return pending_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500